@@ -0,0 +1,140 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Remembers what security_scanner has already alerted on, so a long-lived
+# connection (like a sync client) is reported once instead of every scan. Also keeps a
+# persisted list of acknowledged/suppressed processes that survives restarts.
+
+import json
+import os
+import time
+from collections import OrderedDict
+
+DEFAULT_STORE = os.path.expanduser('~/.security_scanner_suppressions.json')
+
+# Fields of an alert that count as its "state" - a change in any of them re-alerts
+STATE_FIELDS = ('blocklist_hit', 'accessing_sensitive', 'bulk_upload')
+
+
+def flow_keys(alert):
+    """All (pid, create_time, remote_ip, remote_port) keys for an alert's external connections."""
+    endpoints = alert.get('connections') or [(alert['remote_ip'], alert['remote_port'])]
+    return [(alert['pid'], alert.get('create_time'), ip, port) for ip, port in endpoints]
+
+
+def alert_state(alert):
+    return tuple(bool(alert.get(field)) for field in STATE_FIELDS)
+
+
+def identity(alert):
+    """What a suppression is tied to: the executable path (or name if the path is unknown)."""
+    return (alert.get('exe') or alert['name']).lower()
+
+
+class AlertTracker:
+    """
+    Tracks flows across scan cycles and decides which alerts are worth showing.
+
+    An alert is emitted when it has a flow we haven't seen before, or when its state
+    (threat-list hit, sensitive files, bulk upload) changes. Flows that disappear
+    from a scan are forgotten, and at most `max_flows` are remembered at once.
+    Suppressions are keyed on the executable (optionally plus remote IP) rather
+    than the PID, so they still apply after the program or the scanner restarts.
+    """
+
+    def __init__(self, store_path=DEFAULT_STORE, max_flows=50000):
+        self.store_path = store_path
+        self.max_flows = max_flows
+        self.flows = OrderedDict()  # flow key -> state tuple
+        self.suppressions = {}      # (identity, remote_ip or None) -> {'until': ts, 'note': str}
+        self.load()
+
+    def load(self):
+        """Load suppressions from disk, dropping any that have already expired."""
+        if not self.store_path or not os.path.exists(self.store_path):
+            return
+        try:
+            with open(self.store_path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        now = time.time()
+        for entry in entries:
+            if entry.get('until', 0) > now:
+                key = (entry['identity'], entry.get('remote_ip'))
+                self.suppressions[key] = {'until': entry['until'], 'note': entry.get('note', '')}
+
+    def save(self):
+        """Write active suppressions to disk (atomically, so a crash can't corrupt the file)."""
+        if not self.store_path:
+            return
+        self._purge_expired()
+        entries = [
+            {'identity': ident, 'remote_ip': ip, 'until': info['until'], 'note': info['note']}
+            for (ident, ip), info in self.suppressions.items()
+        ]
+        tmp_path = self.store_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.store_path)
+        except OSError as e:
+            print(f"⚠️ Could not save suppressions: {e}")
+
+    def _purge_expired(self):
+        now = time.time()
+        for key in [k for k, info in self.suppressions.items() if info['until'] <= now]:
+            del self.suppressions[key]
+
+    def suppress(self, alert, hours, whole_process=True, note=''):
+        """Acknowledge an alert for `hours`. whole_process=False only covers its remote IP."""
+        remote_ip = None if whole_process else alert['remote_ip']
+        self.suppressions[(identity(alert), remote_ip)] = {
+            'until': time.time() + hours * 3600, 'note': note
+        }
+        self.save()
+
+    def unsuppress(self, alert):
+        """Remove any suppressions for an alert's executable."""
+        ident = identity(alert)
+        for key in [k for k in self.suppressions if k[0] == ident]:
+            del self.suppressions[key]
+        self.save()
+
+    def is_suppressed(self, alert):
+        now = time.time()
+        ident = identity(alert)
+        for key in ((ident, None), (ident, alert['remote_ip'])):
+            info = self.suppressions.get(key)
+            if info and info['until'] > now:
+                return True
+        return False
+
+    def filter(self, alerts):
+        """
+        Take one scan's alerts and return only the ones that should be shown.
+        Also forgets flows that weren't in this scan.
+        """
+        emit = []
+        seen = set()
+
+        for alert in alerts:
+            state = alert_state(alert)
+            is_new = False
+            for key in flow_keys(alert):
+                seen.add(key)
+                if self.flows.get(key) != state:
+                    is_new = True
+                self.flows[key] = state
+                self.flows.move_to_end(key)
+
+            # A threat-list hit is never silenced by an acknowledgement
+            if is_new and (alert.get('blocklist_hit') or not self.is_suppressed(alert)):
+                emit.append(alert)
+
+        for key in [k for k in self.flows if k not in seen]:
+            del self.flows[key]
+        while len(self.flows) > self.max_flows:
+            self.flows.popitem(last=False)
+
+        return emit
@@ -0,0 +1,381 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Finds which websites each browser profile lets use the camera. It covers
+# every profile of every Chromium-family browser (Chrome, Edge, Brave, Vivaldi, Opera,
+# Chromium) and Firefox. Only the media_stream_camera block of a Chromium Preferences file
+# is decoded, and Firefox's permissions.sqlite is queried directly. Results are cached per
+# file by (size, mtime), so profiles that haven't changed are not read again.
+
+import json
+import os
+import sqlite3
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+# One site's camera setting in one browser profile
+BrowserPermission = namedtuple('BrowserPermission', [
+    'site',           # Origin, e.g. 'https://meet.google.com:443'
+    'browser',        # 'Google Chrome', 'Mozilla Firefox', ...
+    'profile',        # Profile display name (or folder name)
+    'permission',     # 'Allowed', 'Blocked' or 'Ask'
+    'last_modified',  # Local datetime or None
+])
+
+# Chromium content setting values
+CHROMIUM_SETTINGS = {1: 'Allowed', 2: 'Blocked', 3: 'Ask'}
+# Firefox nsIPermissionManager values
+FIREFOX_SETTINGS = {1: 'Allowed', 2: 'Blocked', 0: 'Ask'}
+
+
+def _home(*parts):
+    return os.path.join(os.path.expanduser('~'), *parts)
+
+
+def chromium_user_data_dirs():
+    """(browser, User Data folder) for each Chromium-family browser this platform may have."""
+    if sys.platform == 'win32':
+        local = os.environ.get('LOCALAPPDATA', '')
+        roaming = os.environ.get('APPDATA', '')
+        candidates = [
+            ('Google Chrome', os.path.join(local, 'Google', 'Chrome', 'User Data')),
+            ('Google Chrome Beta', os.path.join(local, 'Google', 'Chrome Beta', 'User Data')),
+            ('Google Chrome Canary', os.path.join(local, 'Google', 'Chrome SxS', 'User Data')),
+            ('Microsoft Edge', os.path.join(local, 'Microsoft', 'Edge', 'User Data')),
+            ('Brave', os.path.join(local, 'BraveSoftware', 'Brave-Browser', 'User Data')),
+            ('Vivaldi', os.path.join(local, 'Vivaldi', 'User Data')),
+            ('Chromium', os.path.join(local, 'Chromium', 'User Data')),
+            ('Opera', os.path.join(roaming, 'Opera Software', 'Opera Stable')),
+            ('Opera GX', os.path.join(roaming, 'Opera Software', 'Opera GX Stable')),
+        ]
+    elif sys.platform == 'darwin':
+        support = _home('Library', 'Application Support')
+        candidates = [
+            ('Google Chrome', os.path.join(support, 'Google', 'Chrome')),
+            ('Microsoft Edge', os.path.join(support, 'Microsoft Edge')),
+            ('Brave', os.path.join(support, 'BraveSoftware', 'Brave-Browser')),
+            ('Vivaldi', os.path.join(support, 'Vivaldi')),
+            ('Chromium', os.path.join(support, 'Chromium')),
+            ('Opera', os.path.join(support, 'com.operasoftware.Opera')),
+        ]
+    else:
+        config = os.environ.get('XDG_CONFIG_HOME') or _home('.config')
+        candidates = [
+            ('Google Chrome', os.path.join(config, 'google-chrome')),
+            ('Microsoft Edge', os.path.join(config, 'microsoft-edge')),
+            ('Brave', os.path.join(config, 'BraveSoftware', 'Brave-Browser')),
+            ('Vivaldi', os.path.join(config, 'vivaldi')),
+            ('Chromium', os.path.join(config, 'chromium')),
+            ('Opera', os.path.join(config, 'opera')),
+        ]
+    return [(browser, path) for browser, path in candidates if os.path.isdir(path)]
+
+
+def firefox_profile_roots():
+    """Folders that hold Firefox profile folders on this platform."""
+    if sys.platform == 'win32':
+        candidates = [os.path.join(os.environ.get('APPDATA', ''), 'Mozilla', 'Firefox', 'Profiles')]
+    elif sys.platform == 'darwin':
+        candidates = [_home('Library', 'Application Support', 'Firefox', 'Profiles')]
+    else:
+        candidates = [_home('.mozilla', 'firefox'), _home('snap', 'firefox', 'common', '.mozilla', 'firefox')]
+    return [path for path in candidates if os.path.isdir(path)]
+
+
+def extract_json_key(text, key):
+    """
+    Decode the value of every `"key": ...` in a JSON document without parsing the rest of it.
+    Preferences files run to megabytes; the camera block is usually a few KB.
+    """
+    decoder = json.JSONDecoder()
+    needle = json.dumps(key)
+    values = []
+    pos = 0
+    while True:
+        index = text.find(needle, pos)
+        if index == -1:
+            return values
+        pos = index + len(needle)
+        while pos < len(text) and text[pos] in ' \t\r\n':
+            pos += 1
+        if pos >= len(text) or text[pos] != ':' or (index and text[index - 1] == '\\'):
+            continue  # The name showed up as a value or inside a string, not as a key
+        pos += 1
+        while pos < len(text) and text[pos] in ' \t\r\n':
+            pos += 1
+        try:
+            value, pos = decoder.raw_decode(text, pos)
+        except ValueError:
+            continue
+        values.append(value)
+
+
+def chromium_time(value):
+    """Chromium stores times as microseconds since 1601-01-01 UTC (as a string in Preferences)."""
+    try:
+        micros = int(value)
+    except (TypeError, ValueError):
+        return None
+    if micros <= 0:
+        return None
+    try:
+        utc = datetime(1601, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=micros)
+    except OverflowError:
+        return None
+    return utc.astimezone().replace(tzinfo=None)
+
+
+def chromium_profiles(user_data):
+    """(folder, display name) of every profile in a Chromium User Data folder."""
+    names = {}
+    try:
+        with open(os.path.join(user_data, 'Local State'), 'r', encoding='utf-8', errors='replace') as f:
+            for info_cache in extract_json_key(f.read(), 'info_cache'):
+                if isinstance(info_cache, dict):
+                    names.update({folder: info.get('name') for folder, info in info_cache.items()
+                                  if isinstance(info, dict)})
+    except OSError:
+        pass
+
+    profiles = []
+    if os.path.isfile(os.path.join(user_data, 'Preferences')):
+        profiles.append(('', 'Default'))  # Opera keeps its single profile in the root
+    try:
+        folders = sorted(os.listdir(user_data))
+    except OSError:
+        folders = []
+    for folder in folders:
+        if folder in ('System Profile', 'Guest Profile'):
+            continue
+        if os.path.isfile(os.path.join(user_data, folder, 'Preferences')):
+            profiles.append((folder, names.get(folder) or folder))
+    return profiles
+
+
+def read_chromium_preferences(path, browser, profile):
+    """Camera exceptions from one Preferences file."""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    permissions = []
+    for exceptions in extract_json_key(text, 'media_stream_camera'):
+        if not isinstance(exceptions, dict):
+            continue
+        for pattern, entry in exceptions.items():
+            if not isinstance(entry, dict):
+                continue
+            site = pattern.split(',', 1)[0]  # "https://site:443,*" -> primary pattern
+            permission = CHROMIUM_SETTINGS.get(entry.get('setting'), 'Ask')
+            permissions.append(BrowserPermission(site, browser, profile, permission,
+                                                 chromium_time(entry.get('last_modified'))))
+    return permissions
+
+
+def read_firefox_permissions(path, profile):
+    """Camera permissions from a Firefox permissions.sqlite, opened read-only."""
+    uri = 'file:' + path.replace('\\', '/').replace('%', '%25').replace('?', '%3f').replace('#', '%23')
+    query = "SELECT origin, permission, modificationTime FROM moz_perms WHERE type = 'camera'"
+    try:
+        conn = sqlite3.connect(uri + '?mode=ro', uri=True, timeout=1)
+        try:
+            rows = conn.execute(query).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        # Firefox holds a lock while running; an immutable open reads the file as it is on disk
+        conn = sqlite3.connect(uri + '?immutable=1', uri=True)
+        try:
+            rows = conn.execute(query).fetchall()
+        finally:
+            conn.close()
+    permissions = []
+    for origin, permission, modified in rows:
+        when = datetime.fromtimestamp(modified / 1000) if modified else None
+        permissions.append(BrowserPermission(origin, 'Mozilla Firefox', profile,
+                                             FIREFOX_SETTINGS.get(permission, 'Ask'), when))
+    return permissions
+
+
+def file_fingerprint(*paths):
+    """(size, mtime) of each file, None for missing ones. Changes whenever any of them does."""
+    fingerprint = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            fingerprint.append([st.st_size, st.st_mtime_ns])
+        except OSError:
+            fingerprint.append(None)
+    return fingerprint
+
+
+class PermissionCache:
+    """Persistent file path -> (fingerprint, permissions) cache."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.dirty = False
+        self.stats = {'hits': 0, 'read': 0}
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        """Write the cache to disk if anything changed."""
+        if not self.path or not self.dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save browser permission cache: {e}")
+
+    def get(self, path, fingerprint, read):
+        """The cached permissions for a file, or read() them if the fingerprint changed."""
+        entry = self.entries.get(path)
+        if entry and entry['fingerprint'] == fingerprint:
+            self.stats['hits'] += 1
+            return [_from_json(p) for p in entry['permissions']]
+        permissions = read()
+        self.entries[path] = {'fingerprint': fingerprint, 'permissions': [_to_json(p) for p in permissions]}
+        self.dirty = True
+        self.stats['read'] += 1
+        return permissions
+
+
+def _to_json(permission):
+    return permission._replace(last_modified=permission.last_modified.isoformat()
+                               if permission.last_modified else None)._asdict()
+
+
+def _from_json(entry):
+    permission = BrowserPermission(**entry)
+    return permission._replace(last_modified=datetime.fromisoformat(permission.last_modified)
+                               if permission.last_modified else None)
+
+
+def scan_browser_permissions(cache=None, chromium_dirs=None, firefox_roots=None):
+    """
+    Camera permissions from every browser profile found. Unreadable profiles are skipped.
+    chromium_dirs / firefox_roots override where to look (for fixtures).
+    """
+    cache = cache or PermissionCache()
+    found = []
+
+    for browser, user_data in (chromium_user_data_dirs() if chromium_dirs is None else chromium_dirs):
+        for folder, profile in chromium_profiles(user_data):
+            path = os.path.join(user_data, folder, 'Preferences')
+            try:
+                found.extend(cache.get(path, file_fingerprint(path),
+                                       lambda: read_chromium_preferences(path, browser, profile)))
+            except (OSError, ValueError):
+                continue
+
+    for root in (firefox_profile_roots() if firefox_roots is None else firefox_roots):
+        try:
+            folders = sorted(os.listdir(root))
+        except OSError:
+            continue
+        for folder in folders:
+            path = os.path.join(root, folder, 'permissions.sqlite')
+            if not os.path.isfile(path):
+                continue
+            profile = folder.split('.', 1)[-1]  # "abcd1234.default-release" -> "default-release"
+            try:
+                found.extend(cache.get(path, file_fingerprint(path, path + '-wal'),
+                                       lambda: read_firefox_permissions(path, profile)))
+            except sqlite3.Error:
+                continue
+
+    return found
+
+
+def build_fixture(folder, profiles=3, sites=40, padding_mb=4):
+    """
+    Lay out a Chrome User Data folder with `profiles` profiles (each Preferences padded to
+    about `padding_mb` MB like a real one) and a Firefox profile folder. Returns
+    (chromium_dirs, firefox_roots) for scan_browser_permissions().
+    """
+    user_data = os.path.join(folder, 'chrome')
+    os.makedirs(user_data, exist_ok=True)
+    folders = ['Default'] + [f'Profile {i}' for i in range(1, profiles)]
+    with open(os.path.join(user_data, 'Local State'), 'w') as f:
+        json.dump({'profile': {'info_cache': {name: {'name': f'Person {i + 1}'}
+                                              for i, name in enumerate(folders)}}}, f)
+
+    stamp = str(int((time.time() + 11644473600) * 1_000_000))  # Now, in Chromium's 1601-based time
+    for i, name in enumerate(folders):
+        os.makedirs(os.path.join(user_data, name), exist_ok=True)
+        camera = {f'https://site{i}-{n}.example:443,*': {'last_modified': stamp, 'setting': 1 if n % 4 else 2}
+                  for n in range(sites)}
+        prefs = {
+            'extensions': {'settings': {f'ext{n:05d}': {'manifest': {'description': 'x' * 200,
+                                                                     'permissions': ['tabs'] * 20}}
+                                        for n in range(padding_mb * 1024 * 1024 // 400)}},
+            'profile': {'content_settings': {'exceptions': {
+                'media_engagement': {f'https://site{i}-{n}.example:443,*': {'setting': {'visits': n}}
+                                     for n in range(sites)},
+                'media_stream_camera': camera,
+                'media_stream_mic': camera,
+            }}},
+        }
+        with open(os.path.join(user_data, name, 'Preferences'), 'w') as f:
+            json.dump(prefs, f)
+
+    firefox_root = os.path.join(folder, 'firefox')
+    profile_dir = os.path.join(firefox_root, 'abcd1234.default-release')
+    os.makedirs(profile_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(profile_dir, 'permissions.sqlite'))
+    conn.execute('CREATE TABLE IF NOT EXISTS moz_perms (id INTEGER PRIMARY KEY, origin TEXT, type TEXT, '
+                 'permission INTEGER, expireType INTEGER, expireTime INTEGER, modificationTime INTEGER)')
+    conn.executemany('INSERT INTO moz_perms (origin, type, permission, expireType, expireTime, modificationTime) '
+                     'VALUES (?, ?, ?, 0, 0, ?)',
+                     [(f'https://ff{n}.example', kind, 1, int(time.time() * 1000))
+                      for n in range(sites) for kind in ('camera', 'microphone', 'desktop-notification')])
+    conn.commit()
+    conn.close()
+    return [('Google Chrome', user_data)], [firefox_root]
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        chromium_dirs, firefox_roots = build_fixture(folder)
+        prefs = [os.path.join(chromium_dirs[0][1], name, 'Preferences')
+                 for name, _ in chromium_profiles(chromium_dirs[0][1])]
+        total_mb = sum(os.path.getsize(p) for p in prefs) / 1024 / 1024
+
+        start = time.perf_counter()
+        for path in prefs:
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)['profile']['content_settings']['exceptions']['media_stream_camera']
+        full_time = time.perf_counter() - start
+
+        cache = PermissionCache(os.path.join(folder, 'cache.json'))
+        start = time.perf_counter()
+        found = scan_browser_permissions(cache, chromium_dirs, firefox_roots)
+        cold_time = time.perf_counter() - start
+        cache.save()
+
+        cache = PermissionCache(os.path.join(folder, 'cache.json'))
+        start = time.perf_counter()
+        again = scan_browser_permissions(cache, chromium_dirs, firefox_roots)
+        warm_time = time.perf_counter() - start
+
+        print(f"{len(prefs)} Chrome profiles ({total_mb:.1f} MB of Preferences) + 1 Firefox profile")
+        print(f"  Full json.load of each Preferences: {full_time * 1000:.0f} ms")
+        print(f"  Scan, camera block only:            {cold_time * 1000:.0f} ms ({len(found)} permissions)")
+        print(f"  Scan again, nothing changed:        {warm_time * 1000:.1f} ms ({len(again)} permissions, {cache.stats})")
+        for permission in found[:3] + found[-2:]:
+            print(f"    {permission.browser} [{permission.profile}] {permission.site}: {permission.permission}")
@@ -3,163 +3,130 @@
 # Description: Checks if the camera is currently being used and shows what apps
 # have accessed the camera in the last 7 days.
 
-import subprocess
 import json
 import os
 import re
+import sqlite3
+import sys
+import time
+from collections import namedtuple
 from datetime import datetime, timedelta
 
-def get_friendly_app_name(app_path):
-    """Convert registry path or package name to a friendly app name."""
-    if not app_path:
-        return "Unknown"
-    
-    app_path = str(app_path)
-    
-    # For desktop apps (file paths)
-    if '\\' in app_path or '/' in app_path:
-        # Extract just the executable name
-        exe_name = os.path.basename(app_path.replace('#', '\\'))
-        
-        # Common app name mappings
-        app_mappings = {
-            'chrome.exe': 'Google Chrome',
-            'firefox.exe': 'Mozilla Firefox',
-            'msedge.exe': 'Microsoft Edge',
-            'opera.exe': 'Opera',
-            'brave.exe': 'Brave Browser',
-            'discord.exe': 'Discord',
-            'slack.exe': 'Slack',
-            'teams.exe': 'Microsoft Teams',
-            'zoom.exe': 'Zoom',
-            'skype.exe': 'Skype',
-            'obs64.exe': 'OBS Studio',
-            'obs32.exe': 'OBS Studio',
-            'streamlabs obs.exe': 'Streamlabs OBS',
-            'code.exe': 'Visual Studio Code',
-            'devenv.exe': 'Visual Studio',
-            'webex.exe': 'Cisco Webex',
-            'facetime.exe': 'FaceTime',
-            'snap camera.exe': 'Snap Camera',
-            'manycam.exe': 'ManyCam',
-            'logitech capture.exe': 'Logitech Capture',
-            'xsplit.exe': 'XSplit',
-            'whatsapp.exe': 'WhatsApp',
-            'telegram.exe': 'Telegram',
-            'signal.exe': 'Signal',
-            'viber.exe': 'Viber',
-            'facecam.exe': 'FaceCam',
-            'youcam.exe': 'YouCam',
-            'bandicam.exe': 'Bandicam',
-            'camtasia.exe': 'Camtasia',
-            'screencast-o-matic.exe': 'Screencast-O-Matic',
-        }
-        
-        return app_mappings.get(exe_name.lower(), exe_name)
-    
-    # For Store apps (package names)
-    # Microsoft.WindowsCamera_8wekyb3d8bbwe -> Windows Camera
-    store_mappings = {
-        'microsoft.windowscamera': 'Windows Camera',
-        'microsoft.skypeapp': 'Skype',
-        'microsoft.teams': 'Microsoft Teams',
-        'microsoft.windows.photos': 'Windows Photos',
-        'microsoft.zunevideo': 'Movies & TV',
-        'microsoft.people': 'People',
-        'discordapp': 'Discord',
-        'zoom': 'Zoom',
-        '5319275a.whatsappdesktop': 'WhatsApp',
-        'telegramdesktop': 'Telegram',
-    }
-    
-    # Extract base package name
-    package_base = app_path.split('_')[0].lower()
-    
-    for key, name in store_mappings.items():
-        if key in package_base:
-            return name
-    
-    # Return cleaned up package name if no mapping found
-    return package_base.replace('microsoft.', '').replace('.', ' ').title()
+from powershell_pool import get_pool, as_list
+from registry_provider import get_default_registry, read_consent_store, read_capability_settings
+from report_engine import ReportCache, print_timings, export_jsonl, export_html
+from event_log_reader import EventFilter, EventBookmarks, scan_source
+from browser_permissions import PermissionCache, scan_browser_permissions
+from video_devices import list_video_devices, get_holder_scanner
+from camera_watch import default_watcher, print_event, format_duration
+from camera_timeline import get_timeline
+from app_identity import get_resolver, read_version_info
 
-def get_camera_currently_in_use():
-    """Check if the camera is currently being used and by which app."""
+# Event logs searched for camera access: (log name or exported .xml/.evtx path, filter).
+# Live log names are only read on Windows; exported logs are read anywhere.
+CAMERA_EVENT_SOURCES = [
+    ('Security', EventFilter(providers=['Microsoft-Windows-Security-Auditing'], event_ids=[4656, 4663],
+                             keywords=r'camera|webcam|video')),
+    ('Application', EventFilter(keywords=r'camera|webcam|video capture')),
+]
+EVENT_BOOKMARK_FILE = os.path.expanduser('~/.camera_monitor_event_bookmarks.json')
+BROWSER_CACHE_FILE = os.path.expanduser('~/.camera_monitor_browser_cache.json')
+REPORT_EXPORT_BASE = os.path.expanduser('~/camera_report')
+
+# What each collector returns. Times are datetimes (None when unknown).
+CameraDevice = namedtuple('CameraDevice', ['name', 'instance_id', 'status'])
+PrivacySettings = namedtuple('PrivacySettings', ['global_access', 'user_access'])
+AppInUse = namedtuple('AppInUse', ['app', 'type', 'started_at', 'pid', 'devices'])
+RunningApp = namedtuple('RunningApp', ['name', 'pid', 'path', 'start_time', 'memory_mb'])
+CameraStatus = namedtuple('CameraStatus', ['apps_in_use', 'running_camera_apps'])
+RegistryApp = namedtuple('RegistryApp', ['app', 'type', 'last_access', 'in_use', 'publisher', 'description',
+                                         'version', 'session_minutes', 'source'])
+DetectedApp = namedtuple('DetectedApp', ['app', 'path', 'type', 'last_activity', 'note', 'source'])
+# browser_sites are browser_permissions.BrowserPermission, log_events event_log_reader.EventRecord
+CameraHistory = namedtuple('CameraHistory', ['registry_apps', 'browser_sites', 'specific_apps', 'log_events'])
+AppPermission = namedtuple('AppPermission', ['app', 'type', 'permission'])
+
+def parse_ps_time(text):
+    """A "yyyy-MM-dd HH:mm:ss" time from the PowerShell checks, or None."""
+    try:
+        return datetime.strptime(text, '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+def format_time(moment):
+    return moment.strftime('%Y-%m-%d %H:%M:%S') if moment else 'Unknown'
+
+_registry = None
+
+def get_registry():
+    """The registry the camera checks read from (the live one on Windows)."""
+    global _registry
+    if _registry is None:
+        _registry = get_default_registry()
+    return _registry
+
+def set_registry(registry):
+    """Point the camera checks at another registry, e.g. a registry_provider.FixtureRegistry."""
+    global _registry
+    _registry = registry
+
+def print_section_header(title):
     print("\n" + "=" * 70)
-    print("  📷 CURRENT CAMERA STATUS")
+    print(f"  {title}")
     print("=" * 70)
+
+def print_section_error(title, message):
+    print_section_header(title)
+    print(f"\n  ⚠️ {message}")
+
+def get_friendly_app_name(app_path):
+    """Convert registry path or package name to a friendly app name."""
+    return get_resolver().name(app_path)
+
+# Process names (without .exe) of apps that commonly use the camera on Linux
+LINUX_CAMERA_APPS = [
+    'zoom', 'teams', 'skype', 'discord', 'obs', 'chrome', 'chromium', 'firefox', 'brave',
+    'opera', 'slack', 'webex', 'telegram', 'signal', 'cheese', 'guvcview', 'kamoso', 'vlc',
+    'ffmpeg', 'gst-launch', 'motion', 'snapshot',
+]
+
+def collect_linux_camera_in_use():
+    """The Linux version of collect_camera_in_use: holders of /dev/video* nodes found via /proc."""
+    import psutil
+    from process_snapshot import get_snapshot_service
+    
+    devices = list_video_devices()
+    names = {d.path: f"{d.path} ({d.name})" for d in devices}
+    apps_in_use = [
+        AppInUse(holder.exe or holder.name, 'Linux Process', holder.first_seen, holder.pid,
+                 [names.get(path, path) for path in holder.devices])
+        for holder in get_holder_scanner().scan(devices)
+    ]
     
-    # Method 1: Check registry for apps currently using camera
-    ps_command = '''
-    $cameraInUse = @()
-    
-    function Convert-FileTime($fileTime) {
-        if ($fileTime -gt 0) {
-            try {
-                return [DateTime]::FromFileTime($fileTime).ToString("yyyy-MM-dd HH:mm:ss")
-            } catch {
-                return $null
-            }
-        }
-        return $null
-    }
-    
-    # Check NonPackaged apps (traditional desktop apps)
-    $nonPackagedPath = "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam\\NonPackagedApps"
-    if (Test-Path $nonPackagedPath) {
-        Get-ChildItem $nonPackagedPath | ForEach-Object {
-            $appPath = $_.PSChildName -replace '#', '\\'
-            $lastUsedStop = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStop -ErrorAction SilentlyContinue).LastUsedTimeStop
-            $lastUsedStart = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStart -ErrorAction SilentlyContinue).LastUsedTimeStart
-            
-            # If LastUsedTimeStop is 0 but LastUsedTimeStart has a value, camera is in use
-            if ($lastUsedStart -gt 0 -and $lastUsedStop -eq 0) {
-                $startTime = Convert-FileTime $lastUsedStart
-                $cameraInUse += @{
-                    App = $appPath
-                    Type = "Desktop App"
-                    InUse = $true
-                    StartedAt = $startTime
-                }
-            }
-        }
-    }
-    
-    # Check Packaged apps (Microsoft Store apps)
-    $packagedPath = "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam"
-    Get-ChildItem $packagedPath -ErrorAction SilentlyContinue | Where-Object { $_.PSChildName -ne "NonPackagedApps" } | ForEach-Object {
-        $appName = $_.PSChildName
-        $lastUsedStop = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStop -ErrorAction SilentlyContinue).LastUsedTimeStop
-        $lastUsedStart = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStart -ErrorAction SilentlyContinue).LastUsedTimeStart
-        
-        if ($lastUsedStart -gt 0 -and $lastUsedStop -eq 0) {
-            $startTime = Convert-FileTime $lastUsedStart
-            $cameraInUse += @{
-                App = $appName
-                Type = "Store App"
-                InUse = $true
-                StartedAt = $startTime
-            }
-        }
-    }
-    
-    $cameraInUse | ConvertTo-Json -Depth 3
-    '''
-    
-    apps_in_use = []
-    
-    try:
-        result = subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True, text=True, timeout=30
-        )
-        
-        if result.stdout.strip() and result.stdout.strip() != 'null':
-            data = json.loads(result.stdout.strip())
-            if not isinstance(data, list):
-                data = [data]
-            apps_in_use.extend(data)
-    except:
-        pass
+    running_camera_apps = []
+    for record in get_snapshot_service().snapshot():
+        if not any(app in record.name.lower() for app in LINUX_CAMERA_APPS):
+            continue
+        try:
+            memory = round(psutil.Process(record.pid).memory_info().rss / 1024 / 1024, 2)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            memory = None
+        running_camera_apps.append(RunningApp(record.name, record.pid, record.exe or 'Unknown',
+                                              datetime.fromtimestamp(record.create_time), memory))
+    
+    return CameraStatus(apps_in_use, running_camera_apps)
+
+def collect_camera_in_use():
+    """Find apps using the camera right now, plus camera-capable apps that are running."""
+    if sys.platform.startswith('linux'):
+        return collect_linux_camera_in_use()
+    
+    # Method 1: Check registry for apps currently using camera (started but not stopped)
+    apps_in_use = [
+        AppInUse(entry.app, entry.type, entry.last_used_start, None, [])
+        for entry in read_consent_store(get_registry())
+        if entry.in_use
+    ]
     
     # Method 2: Check running processes that commonly use camera
     ps_process_check = '''
@@ -198,43 +165,44 @@ def get_camera_currently_in_use():
     
     running_camera_apps = []
     try:
-        result = subprocess.run(
-            ['powershell', '-Command', ps_process_check],
-            capture_output=True, text=True, timeout=30
-        )
-        
-        if result.stdout.strip() and result.stdout.strip() != 'null':
-            data = json.loads(result.stdout.strip())
-            if not isinstance(data, list):
-                data = [data]
-            running_camera_apps = data
+        running_camera_apps = [
+            RunningApp(proc.get('Name', 'Unknown'), proc.get('PID'), proc.get('Path') or 'Unknown',
+                       parse_ps_time(proc.get('StartTime')), proc.get('Memory'))
+            for proc in as_list(get_pool().run_json(ps_process_check, timeout=30))
+        ]
     except:
         pass
     
-    # Display results
+    return CameraStatus(apps_in_use, running_camera_apps)
+
+def show_camera_in_use(status):
+    """Print the current camera status. Returns True if the camera is in use."""
+    print_section_header("📷 CURRENT CAMERA STATUS")
+    apps_in_use = status.apps_in_use
+    running_camera_apps = status.running_camera_apps
+    
     if apps_in_use:
         print("\n  🔴 CAMERA IS CURRENTLY IN USE!")
         print("-" * 70)
         for app in apps_in_use:
-            app_path = app.get('App', 'Unknown')
-            friendly_name = get_friendly_app_name(app_path)
-            app_type = app.get('Type', 'Unknown')
-            started_at = app.get('StartedAt', 'Unknown')
+            friendly_name = get_friendly_app_name(app.app)
             
             print(f"\n  📹 {friendly_name}")
-            print(f"     Type: {app_type}")
-            print(f"     Started Using Camera: {started_at}")
-            print(f"     Full Path/Package: {app_path}")
+            print(f"     Type: {app.type or 'Unknown'}")
+            print(f"     Started Using Camera: {format_time(app.started_at)}")
+            if app.devices:
+                print(f"     Device: {', '.join(app.devices)} (PID: {app.pid or '?'})")
+            print(f"     Full Path/Package: {app.app}")
         
         # Show additional process info if available
         if running_camera_apps:
             print("\n  📊 Related Running Processes:")
             print("-" * 70)
             for proc in running_camera_apps:
-                print(f"     • {proc.get('Name', 'Unknown')} (PID: {proc.get('PID', '?')})")
-                print(f"       Path: {proc.get('Path', 'Unknown')}")
-                print(f"       Started: {proc.get('StartTime', 'Unknown')}")
-                print(f"       Memory: {proc.get('Memory', '?')} MB")
+                print(f"     • {proc.name} (PID: {proc.pid or '?'})")
+                print(f"       Path: {proc.path}")
+                print(f"       Started: {format_time(proc.start_time)}")
+                print(f"       Memory: {proc.memory_mb if proc.memory_mb is not None else '?'} MB")
         
         return True
     else:
@@ -243,251 +211,45 @@ def get_camera_currently_in_use():
         if running_camera_apps:
             print("\n  ℹ️ Camera-capable apps currently running (not using camera):")
             for proc in running_camera_apps[:5]:  # Show top 5
-                print(f"     • {proc.get('Name', 'Unknown')} (PID: {proc.get('PID', '?')})")
+                print(f"     • {proc.name} (PID: {proc.pid or '?'})")
         
         return False
 
-def get_camera_history_last_7_days():
-    """Get all apps that have used the camera in the last 7 days."""
-    print("\n" + "=" * 70)
-    print("  📅 CAMERA ACCESS HISTORY (Last 7 Days)")
-    print("=" * 70)
-    
-    all_apps = []
-    
-    # Method 1: Check Registry for camera access
-    ps_registry_command = '''
-    $results = @()
-    $sevenDaysAgo = (Get-Date).AddDays(-7)
-    
-    function Convert-FileTime($fileTime) {
-        if ($fileTime -gt 0) {
-            try {
-                return [DateTime]::FromFileTime($fileTime)
-            } catch {
-                return $null
-            }
-        }
-        return $null
-    }
-    
-    function Get-AppDetails($appPath) {
-        $details = @{
-            Publisher = $null
-            Description = $null
-            Version = $null
-        }
-        
-        if ($appPath -and (Test-Path $appPath -ErrorAction SilentlyContinue)) {
-            try {
-                $fileInfo = [System.Diagnostics.FileVersionInfo]::GetVersionInfo($appPath)
-                $details.Publisher = $fileInfo.CompanyName
-                $details.Description = $fileInfo.FileDescription
-                $details.Version = $fileInfo.FileVersion
-            } catch {}
-        }
-        
-        return $details
-    }
-    
-    # Check NonPackaged apps (traditional desktop apps)
-    $nonPackagedPath = "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam\\NonPackagedApps"
-    if (Test-Path $nonPackagedPath) {
-        Get-ChildItem $nonPackagedPath | ForEach-Object {
-            $appPath = $_.PSChildName -replace '#', '\\'
-            $lastUsedStop = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStop -ErrorAction SilentlyContinue).LastUsedTimeStop
-            $lastUsedStart = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStart -ErrorAction SilentlyContinue).LastUsedTimeStart
-            
-            $stopTime = Convert-FileTime $lastUsedStop
-            $startTime = Convert-FileTime $lastUsedStart
-            
-            $lastAccess = $stopTime
-            if ($startTime -gt $stopTime) { $lastAccess = $startTime }
-            
-            if ($lastAccess -and $lastAccess -gt $sevenDaysAgo) {
-                $currentlyInUse = ($lastUsedStart -gt 0 -and $lastUsedStop -eq 0)
-                $appDetails = Get-AppDetails $appPath
-                
-                $duration = $null
-                if ($startTime -and $stopTime -and $stopTime -gt $startTime) {
-                    $duration = ($stopTime - $startTime).TotalMinutes
-                }
-                
-                $results += @{
-                    App = $appPath
-                    Type = "Desktop App"
-                    LastAccess = $lastAccess.ToString("yyyy-MM-dd HH:mm:ss")
-                    CurrentlyInUse = $currentlyInUse
-                    Publisher = $appDetails.Publisher
-                    Description = $appDetails.Description
-                    Version = $appDetails.Version
-                    LastSessionMinutes = if ($duration) { [math]::Round($duration, 1) } else { $null }
-                    Source = "Registry"
-                }
-            }
-        }
-    }
-    
-    # Check Packaged apps (Microsoft Store apps)
-    $packagedPath = "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam"
-    Get-ChildItem $packagedPath -ErrorAction SilentlyContinue | Where-Object { $_.PSChildName -ne "NonPackagedApps" } | ForEach-Object {
-        $appName = $_.PSChildName
-        $lastUsedStop = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStop -ErrorAction SilentlyContinue).LastUsedTimeStop
-        $lastUsedStart = (Get-ItemProperty $_.PSPath -Name LastUsedTimeStart -ErrorAction SilentlyContinue).LastUsedTimeStart
+def get_camera_currently_in_use():
+    """Check if the camera is currently being used and by which app."""
+    return show_camera_in_use(collect_camera_in_use())
+
+def registry_history(entries, days=7):
+    """The consent store entries used in the last `days` days, as RegistryApps."""
+    since = datetime.now() - timedelta(days=days)
+    resolver = get_resolver()
+    apps = []
+    for entry in entries:
+        times = [t for t in (entry.last_used_start, entry.last_used_stop) if t]
+        last_access = max(times) if times else None
+        if not last_access or last_access <= since:
+            continue
         
-        $stopTime = Convert-FileTime $lastUsedStop
-        $startTime = Convert-FileTime $lastUsedStart
+        identity = resolver.resolve(entry.app)
+        if entry.type == 'Desktop App':
+            info = read_version_info(entry.app) if os.path.isfile(entry.app) else {}
+            publisher, description = identity.publisher, info.get('FileDescription')
+        else:
+            publisher, description = identity.publisher or 'Microsoft Store', identity.name
         
-        $lastAccess = $stopTime
-        if ($startTime -gt $stopTime) { $lastAccess = $startTime }
+        duration = None
+        if entry.last_used_start and entry.last_used_stop and entry.last_used_stop > entry.last_used_start:
+            duration = round((entry.last_used_stop - entry.last_used_start).total_seconds() / 60, 1)
         
-        if ($lastAccess -and $lastAccess -gt $sevenDaysAgo) {
-            $currentlyInUse = ($lastUsedStart -gt 0 -and $lastUsedStop -eq 0)
-            
-            $displayName = $null
-            try {
-                $package = Get-AppxPackage | Where-Object { $_.PackageFamilyName -like "$appName*" } | Select-Object -First 1
-                if ($package) {
-                    $displayName = $package.Name
-                }
-            } catch {}
-            
-            $duration = $null
-            if ($startTime -and $stopTime -and $stopTime -gt $startTime) {
-                $duration = ($stopTime - $startTime).TotalMinutes
-            }
-            
-            $results += @{
-                App = $appName
-                Type = "Store App"
-                LastAccess = $lastAccess.ToString("yyyy-MM-dd HH:mm:ss")
-                CurrentlyInUse = $currentlyInUse
-                Publisher = "Microsoft Store"
-                Description = $displayName
-                Version = $null
-                LastSessionMinutes = if ($duration) { [math]::Round($duration, 1) } else { $null }
-                Source = "Registry"
-            }
-        }
-    }
-    
-    $results | ConvertTo-Json -Depth 3
-    '''
-    
-    # Method 2: Check Windows Event Logs for camera access
-    ps_eventlog_command = '''
-    $results = @()
-    $sevenDaysAgo = (Get-Date).AddDays(-7)
-    
-    # Check for camera/webcam related events in multiple logs
-    $logNames = @(
-        "Microsoft-Windows-WebcamExperience/Analytic",
-        "Microsoft-Windows-Privacy-Auditing/Operational",
-        "Microsoft-Windows-Kernel-Audit-API-Calls/Operational"
-    )
-    
-    # Try to get events from Application log mentioning camera
-    try {
-        Get-WinEvent -FilterHashtable @{
-            LogName = 'Application'
-            StartTime = $sevenDaysAgo
-        } -ErrorAction SilentlyContinue | Where-Object {
-            $_.Message -match 'camera|webcam|video capture'
-        } | Select-Object -First 50 | ForEach-Object {
-            # Extract process info from message
-            $results += @{
-                Time = $_.TimeCreated.ToString("yyyy-MM-dd HH:mm:ss")
-                Message = $_.Message.Substring(0, [Math]::Min(200, $_.Message.Length))
-                Source = $_.ProviderName
-            }
-        }
-    } catch {}
-    
-    # Check Security log for object access (requires admin)
-    try {
-        Get-WinEvent -FilterHashtable @{
-            LogName = 'Security'
-            Id = 4663, 4656  # Object access events
-            StartTime = $sevenDaysAgo
-        } -ErrorAction SilentlyContinue | Where-Object {
-            $_.Message -match 'camera|webcam|video'
-        } | Select-Object -First 20 | ForEach-Object {
-            $results += @{
-                Time = $_.TimeCreated.ToString("yyyy-MM-dd HH:mm:ss")
-                Message = $_.Message.Substring(0, [Math]::Min(200, $_.Message.Length))
-                Source = "Security Log"
-            }
-        }
-    } catch {}
-    
-    $results | ConvertTo-Json -Depth 3
-    '''
-    
-    # Method 3: Check for browser-based camera access (Discord web, Google Meet, etc.)
-    ps_browser_command = '''
-    $browserApps = @()
-    $sevenDaysAgo = (Get-Date).AddDays(-7)
-    
-    # Check Chrome camera permissions
-    $chromePath = "$env:LOCALAPPDATA\\Google\\Chrome\\User Data\\Default\\Preferences"
-    if (Test-Path $chromePath) {
-        try {
-            $prefs = Get-Content $chromePath -Raw | ConvertFrom-Json
-            $mediaEngagement = $prefs.profile.content_settings.exceptions.media_engagement
-            $cameraPermissions = $prefs.profile.content_settings.exceptions.media_stream_camera
-            
-            if ($cameraPermissions) {
-                $cameraPermissions.PSObject.Properties | ForEach-Object {
-                    $site = $_.Name -replace ',.*$', ''
-                    $setting = $_.Value.setting
-                    if ($setting -eq 1) {  # 1 = allowed
-                        $browserApps += @{
-                            App = $site
-                            Browser = "Google Chrome"
-                            Type = "Website"
-                            Permission = "Allowed"
-                        }
-                    }
-                }
-            }
-        } catch {}
-    }
-    
-    # Check Edge camera permissions
-    $edgePath = "$env:LOCALAPPDATA\\Microsoft\\Edge\\User Data\\Default\\Preferences"
-    if (Test-Path $edgePath) {
-        try {
-            $prefs = Get-Content $edgePath -Raw | ConvertFrom-Json
-            $cameraPermissions = $prefs.profile.content_settings.exceptions.media_stream_camera
-            
-            if ($cameraPermissions) {
-                $cameraPermissions.PSObject.Properties | ForEach-Object {
-                    $site = $_.Name -replace ',.*$', ''
-                    $setting = $_.Value.setting
-                    if ($setting -eq 1) {
-                        $browserApps += @{
-                            App = $site
-                            Browser = "Microsoft Edge"
-                            Type = "Website"
-                            Permission = "Allowed"
-                        }
-                    }
-                }
-            }
-        } catch {}
-    }
-    
-    # Check Firefox camera permissions
-    $firefoxProfiles = "$env:APPDATA\\Mozilla\\Firefox\\Profiles"
-    if (Test-Path $firefoxProfiles) {
-        Get-ChildItem $firefoxProfiles -Directory | ForEach-Object {
-            $permissionsDb = Join-Path $_.FullName "permissions.sqlite"
-            # Note: Would need SQLite to properly read this
-        }
-    }
-    
-    $browserApps | ConvertTo-Json -Depth 3
-    '''
+        apps.append(RegistryApp(entry.app, entry.type, last_access, entry.in_use, publisher, description,
+                                identity.version, duration, 'Registry'))
+    return apps
+
+def collect_camera_history():
+    """Gather camera access from the last 7 days: registry, browser permissions and known apps."""
+    # Method 1: The consent store, read natively and shared with the long-term timeline
+    consent_store = read_consent_store(get_registry())
+    all_apps = registry_history(consent_store)
     
     # Method 4: Check for Discord, Teams, Zoom specific access
     ps_apps_command = '''
@@ -570,66 +332,74 @@ def get_camera_history_last_7_days():
     $appHistory | ConvertTo-Json -Depth 3
     '''
     
+    # The app check runs on the PowerShell pool while the browser profiles are read here
+    pool = get_pool()
+    apps_job = pool.submit_json(ps_apps_command, timeout=30)
+    browser_sites = collect_camera_browser_sites()
+    
     try:
-        # Run registry check
-        result1 = subprocess.run(
-            ['powershell', '-Command', ps_registry_command],
-            capture_output=True, text=True, timeout=60
-        )
-        
-        if result1.stdout.strip() and result1.stdout.strip() != 'null':
-            data = json.loads(result1.stdout.strip())
-            if not isinstance(data, list):
-                data = [data]
-            all_apps.extend(data)
+        # App-specific check
+        specific_apps = [
+            DetectedApp(app.get('App', 'Unknown'), app.get('Path'), app.get('Type', 'Unknown'),
+                        parse_ps_time(app.get('LastLog')), app.get('Note'), app.get('Source', ''))
+            for app in as_list(apps_job.result())
+        ]
     except:
-        pass
+        specific_apps = []
     
+    # Keep every session the registry shows in the long-term timeline
     try:
-        # Run browser check
-        result2 = subprocess.run(
-            ['powershell', '-Command', ps_browser_command],
-            capture_output=True, text=True, timeout=30
-        )
-        
-        browser_sites = []
-        if result2.stdout.strip() and result2.stdout.strip() != 'null':
-            data = json.loads(result2.stdout.strip())
-            if not isinstance(data, list):
-                data = [data]
-            browser_sites = data
-    except:
-        browser_sites = []
+        get_timeline().ingest_consent_store(consent_store)
+    except sqlite3.Error:
+        pass
     
+    return CameraHistory(all_apps, browser_sites, specific_apps, collect_camera_events())
+
+def collect_camera_browser_sites():
+    """Websites allowed to use the camera, from every browser profile (Chromium-family and Firefox)."""
+    cache = PermissionCache(BROWSER_CACHE_FILE)
     try:
-        # Run app-specific check
-        result3 = subprocess.run(
-            ['powershell', '-Command', ps_apps_command],
-            capture_output=True, text=True, timeout=30
-        )
-        
-        specific_apps = []
-        if result3.stdout.strip() and result3.stdout.strip() != 'null':
-            data = json.loads(result3.stdout.strip())
-            if not isinstance(data, list):
-                data = [data]
-            specific_apps = data
-    except:
-        specific_apps = []
+        permissions = scan_browser_permissions(cache)
+    finally:
+        cache.save()
+    return [p for p in permissions if p.permission == 'Allowed']
+
+def collect_camera_events(sources=None, days=7):
+    """Camera-related events from the event logs, newest first. Only events since the last run are read."""
+    since = datetime.now() - timedelta(days=days)
+    bookmarks = EventBookmarks(EVENT_BOOKMARK_FILE, keep_days=days)
+    events = []
+    for source, event_filter in sources or CAMERA_EVENT_SOURCES:
+        if os.name != 'nt' and not source.lower().endswith(('.xml', '.evtx')):
+            continue
+        try:
+            records, _ = scan_source(source, event_filter, since, bookmarks)
+            events.extend(records)
+        except (OSError, ImportError):
+            pass  # Log not readable (the Security log needs admin)
+    bookmarks.save()
+    events.sort(key=lambda e: e.time or datetime.min, reverse=True)
+    return events
+
+def show_camera_history(history):
+    """Print camera access history. Returns the apps found in the registry."""
+    print_section_header("📅 CAMERA ACCESS HISTORY (Last 7 Days)")
+    all_apps = history.registry_apps
+    browser_sites = history.browser_sites
+    specific_apps = history.specific_apps
     
-    # Display results
     if all_apps:
         # Filter out generic Windows Camera if other specific apps are found
         specific_app_names = ['discord', 'teams', 'zoom', 'chrome', 'firefox', 'edge', 'skype', 'slack']
         has_specific_apps = any(
-            any(name in str(app.get('App', '')).lower() for name in specific_app_names)
+            any(name in str(app.app).lower() for name in specific_app_names)
             for app in all_apps
         )
         
         # If we only have Windows Camera but browser sites show other apps, note this
         windows_camera_only = all(
-            'windowscamera' in str(app.get('App', '')).lower() or 
-            'microsoft.windows' in str(app.get('App', '')).lower()
+            'windowscamera' in str(app.app).lower() or 
+            'microsoft.windows' in str(app.app).lower()
             for app in all_apps
         )
         
@@ -637,16 +407,16 @@ def get_camera_history_last_7_days():
         print("-" * 70)
         
         for i, app in enumerate(all_apps, 1):
-            app_path = app.get('App', 'Unknown')
+            app_path = app.app
             friendly_name = get_friendly_app_name(app_path)
-            app_type = app.get('Type', 'Unknown')
-            last_access = app.get('LastAccess', 'Unknown')
-            in_use = app.get('CurrentlyInUse', False)
-            publisher = app.get('Publisher') or 'Unknown'
-            description = app.get('Description') or friendly_name
-            version = app.get('Version')
-            duration = app.get('LastSessionMinutes')
-            source = app.get('Source', 'Registry')
+            app_type = app.type
+            last_access = format_time(app.last_access)
+            in_use = app.in_use
+            publisher = app.publisher or 'Unknown'
+            description = app.description or friendly_name
+            version = app.version
+            duration = app.session_minutes
+            source = app.source
             
             status_icon = "🔴 CURRENTLY IN USE" if in_use else ""
             
@@ -678,8 +448,7 @@ def get_camera_history_last_7_days():
         print("-" * 70)
         
         for site in browser_sites:
-            site_name = site.get('App', 'Unknown')
-            browser = site.get('Browser', 'Unknown')
+            site_name = site.site
             
             # Identify common services
             service_name = site_name
@@ -699,8 +468,10 @@ def get_camera_history_last_7_days():
                 service_name = f"Cisco Webex ({site_name})"
             
             print(f"\n  • {service_name}")
-            print(f"    Browser: {browser}")
+            print(f"    Browser: {site.browser} (profile: {site.profile})")
             print(f"    Permission: ✅ Allowed")
+            if site.last_modified:
+                print(f"    Granted/Changed: {site.last_modified:%Y-%m-%d %H:%M:%S}")
     
     # Show specific apps detected
     if specific_apps:
@@ -709,196 +480,255 @@ def get_camera_history_last_7_days():
         print("-" * 70)
         
         for app in specific_apps:
-            app_name = app.get('App', 'Unknown')
-            app_type = app.get('Type', 'Unknown')
-            last_log = app.get('LastLog')
-            source = app.get('Source', '')
-            note = app.get('Note', '')
-            
-            print(f"\n  • {app_name}")
-            print(f"    Type: {app_type}")
-            if last_log:
-                print(f"    Recent Activity: {last_log}")
-            if note:
-                print(f"    Note: {note}")
-    
-    if not all_apps and not browser_sites and not specific_apps:
+            print(f"\n  • {app.app}")
+            print(f"    Type: {app.type}")
+            if app.last_activity:
+                print(f"    Recent Activity: {format_time(app.last_activity)}")
+            if app.note:
+                print(f"    Note: {app.note}")
+    
+    # Show camera-related event log entries
+    log_events = history.log_events
+    if log_events:
+        print("\n" + "-" * 70)
+        print(f"  📜 CAMERA EVENTS IN THE EVENT LOGS ({len(log_events)}):")
+        print("-" * 70)
+        
+        for event in log_events[:50]:
+            data = event.data
+            detail = data.get('ProcessName') or data.get('ObjectName') or ' '.join(v for v in data.values() if v)
+            print(f"\n  • {event.time:%Y-%m-%d %H:%M:%S}  {event.provider} (Event {event.event_id})")
+            if data.get('ObjectName') and data.get('ProcessName'):
+                print(f"    Object: {data['ObjectName'][:150]}")
+            print(f"    {detail[:200]}")
+    
+    if not all_apps and not browser_sites and not specific_apps and not log_events:
         print("\n  ✅ No camera access history found")
     
     return all_apps
 
-def get_all_camera_permissions():
-    """Get all apps that have permission to access the camera."""
-    print("\n" + "=" * 70)
-    print("  🔐 APPS WITH CAMERA PERMISSION")
-    print("=" * 70)
+def get_camera_history_last_7_days():
+    """Get all apps that have used the camera in the last 7 days."""
+    return show_camera_history(collect_camera_history())
+
+def collect_camera_permissions():
+    """Read every app's camera permission from the consent store."""
+    return [AppPermission(entry.app, entry.type, entry.permission) for entry in read_consent_store(get_registry())]
+
+def show_camera_permissions(apps):
+    """Print the apps allowed and denied camera access."""
+    print_section_header("🔐 APPS WITH CAMERA PERMISSION")
     
-    ps_command = '''
-    $results = @()
-    
-    # Check NonPackaged apps
-    $nonPackagedPath = "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam\\NonPackagedApps"
-    if (Test-Path $nonPackagedPath) {
-        Get-ChildItem $nonPackagedPath | ForEach-Object {
-            $appPath = $_.PSChildName -replace '#', '\\'
-            $value = (Get-ItemProperty $_.PSPath -Name Value -ErrorAction SilentlyContinue).Value
-            $results += @{
-                App = $appPath
-                Type = "Desktop App"
-                Permission = $value
-            }
-        }
-    }
+    if not apps:
+        print("\n  No camera permissions found")
+        return []
     
-    # Check Packaged apps
-    $packagedPath = "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam"
-    Get-ChildItem $packagedPath -ErrorAction SilentlyContinue | Where-Object { $_.PSChildName -ne "NonPackagedApps" } | ForEach-Object {
-        $appName = $_.PSChildName
-        $value = (Get-ItemProperty $_.PSPath -Name Value -ErrorAction SilentlyContinue).Value
-        $results += @{
-            App = $appName
-            Type = "Store App"  
-            Permission = $value
-        }
-    }
+    allowed = [a for a in apps if a.permission == 'Allow']
+    denied = [a for a in apps if a.permission == 'Deny']
     
-    $results | ConvertTo-Json -Depth 3
-    '''
+    if allowed:
+        print(f"\n  ✅ ALLOWED ({len(allowed)} apps):")
+        print("-" * 70)
+        for app in allowed:
+            app_name = app.app
+            if '\\' in str(app_name):
+                display_name = os.path.basename(str(app_name))
+            else:
+                display_name = str(app_name).split('_')[0] if '_' in str(app_name) else str(app_name)
+            print(f"    ✓ {display_name}")
+    
+    if denied:
+        print(f"\n  ❌ DENIED ({len(denied)} apps):")
+        print("-" * 70)
+        for app in denied:
+            app_name = app.app
+            if '\\' in str(app_name):
+                display_name = os.path.basename(str(app_name))
+            else:
+                display_name = str(app_name).split('_')[0] if '_' in str(app_name) else str(app_name)
+            print(f"    ✗ {display_name}")
     
+    return apps
+
+def get_all_camera_permissions():
+    """Get all apps that have permission to access the camera."""
     try:
-        result = subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True, text=True, timeout=30
-        )
-        
-        if result.stdout.strip() and result.stdout.strip() != 'null':
-            apps = json.loads(result.stdout.strip())
-            if not isinstance(apps, list):
-                apps = [apps]
-            
-            allowed = [a for a in apps if a.get('Permission') == 'Allow']
-            denied = [a for a in apps if a.get('Permission') == 'Deny']
-            
-            if allowed:
-                print(f"\n  ✅ ALLOWED ({len(allowed)} apps):")
-                print("-" * 70)
-                for app in allowed:
-                    app_name = app.get('App', 'Unknown')
-                    if '\\' in str(app_name):
-                        display_name = os.path.basename(str(app_name))
-                    else:
-                        display_name = str(app_name).split('_')[0] if '_' in str(app_name) else str(app_name)
-                    print(f"    ✓ {display_name}")
-            
-            if denied:
-                print(f"\n  ❌ DENIED ({len(denied)} apps):")
-                print("-" * 70)
-                for app in denied:
-                    app_name = app.get('App', 'Unknown')
-                    if '\\' in str(app_name):
-                        display_name = os.path.basename(str(app_name))
-                    else:
-                        display_name = str(app_name).split('_')[0] if '_' in str(app_name) else str(app_name)
-                    print(f"    ✗ {display_name}")
-            
-            return apps
-            
-        print("\n  No camera permissions found")
-        return []
-        
+        return show_camera_permissions(collect_camera_permissions())
     except Exception as e:
-        print(f"\n  ⚠️ Error getting permissions: {e}")
+        print_section_error("🔐 APPS WITH CAMERA PERMISSION", f"Error getting permissions: {e}")
         return []
 
+def collect_camera_privacy_settings():
+    """Read the system-wide and per-user camera switches."""
+    settings = read_capability_settings(get_registry())
+    return PrivacySettings(settings.get('GlobalAccess'), settings.get('UserAccess'))
+
+def show_camera_privacy_settings(settings):
+    """Print the system-wide and per-user camera switches."""
+    print_section_header("⚙️ CAMERA PRIVACY SETTINGS")
+    
+    global_access = settings.global_access or 'Unknown'
+    user_access = settings.user_access or 'Unknown'
+    
+    print(f"\n  System-wide camera access: ", end="")
+    if global_access == 'Allow':
+        print("✅ Enabled")
+    elif global_access == 'Deny':
+        print("❌ Disabled")
+    else:
+        print(f"⚠️ {global_access}")
+    
+    print(f"  User camera access: ", end="")
+    if user_access == 'Allow':
+        print("✅ Enabled")
+    elif user_access == 'Deny':
+        print("❌ Disabled")
+    else:
+        print(f"⚠️ {user_access}")
+
 def check_camera_privacy_settings():
     """Check system-wide camera privacy settings."""
-    print("\n" + "=" * 70)
-    print("  ⚙️ CAMERA PRIVACY SETTINGS")
-    print("=" * 70)
-    
-    ps_command = '''
-    $settings = @{}
-    
-    # Check if camera access is enabled system-wide
-    $globalPath = "HKLM:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam"
-    if (Test-Path $globalPath) {
-        $globalValue = (Get-ItemProperty $globalPath -Name Value -ErrorAction SilentlyContinue).Value
-        $settings.GlobalAccess = $globalValue
-    }
-    
-    # Check user-level setting
-    $userPath = "HKCU:\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\CapabilityAccessManager\\ConsentStore\\webcam"
-    if (Test-Path $userPath) {
-        $userValue = (Get-ItemProperty $userPath -Name Value -ErrorAction SilentlyContinue).Value
-        $settings.UserAccess = $userValue
-    }
-    
-    $settings | ConvertTo-Json
-    '''
-    
     try:
-        result = subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True, text=True, timeout=15
-        )
-        
-        if result.stdout.strip():
-            settings = json.loads(result.stdout.strip())
-            
-            global_access = settings.get('GlobalAccess', 'Unknown')
-            user_access = settings.get('UserAccess', 'Unknown')
-            
-            print(f"\n  System-wide camera access: ", end="")
-            if global_access == 'Allow':
-                print("✅ Enabled")
-            elif global_access == 'Deny':
-                print("❌ Disabled")
-            else:
-                print(f"⚠️ {global_access}")
-            
-            print(f"  User camera access: ", end="")
-            if user_access == 'Allow':
-                print("✅ Enabled")
-            elif user_access == 'Deny':
-                print("❌ Disabled")
-            else:
-                print(f"⚠️ {user_access}")
-                
+        show_camera_privacy_settings(collect_camera_privacy_settings())
     except Exception as e:
-        print(f"\n  ⚠️ Error checking settings: {e}")
+        print_section_error("⚙️ CAMERA PRIVACY SETTINGS", f"Error checking settings: {e}")
 
-def list_camera_devices():
-    """List all camera devices on the system."""
-    print("\n" + "=" * 70)
-    print("  🎥 DETECTED CAMERA DEVICES")
-    print("=" * 70)
-    
+def collect_camera_devices():
+    """List the camera devices Windows reports as working."""
     ps_command = '''
     Get-PnpDevice -Class Camera -Status OK | Select-Object FriendlyName, InstanceId, Status | ConvertTo-Json
     '''
-    
+    return [
+        CameraDevice(device.get('FriendlyName') or 'Unknown Camera', device.get('InstanceId') or 'Unknown',
+                     device.get('Status') or 'Unknown')
+        for device in as_list(get_pool().run_json(ps_command, timeout=15))
+    ]
+
+def show_camera_devices(devices):
+    """Print the camera devices."""
+    print_section_header("🎥 DETECTED CAMERA DEVICES")
+    
+    if devices:
+        print(f"\n  Found {len(devices)} camera(s):\n")
+        for i, device in enumerate(devices, 1):
+            print(f"  [{i}] {device.name}")
+            print(f"      Status: {device.status}")
+            print(f"      ID: {device.instance_id[:50]}...")
+            print()
+    else:
+        print("\n  No cameras detected")
+
+def list_camera_devices():
+    """List all camera devices on the system."""
     try:
-        result = subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True, text=True, timeout=15
-        )
-        
-        if result.stdout.strip() and result.stdout.strip() != 'null':
-            devices = json.loads(result.stdout.strip())
-            if not isinstance(devices, list):
-                devices = [devices]
-            
-            print(f"\n  Found {len(devices)} camera(s):\n")
-            for i, device in enumerate(devices, 1):
-                print(f"  [{i}] {device.get('FriendlyName', 'Unknown Camera')}")
-                print(f"      Status: {device.get('Status', 'Unknown')}")
-                print(f"      ID: {device.get('InstanceId', 'Unknown')[:50]}...")
-                print()
-        else:
-            print("\n  No cameras detected")
-            
+        show_camera_devices(collect_camera_devices())
     except Exception as e:
-        print(f"\n  ⚠️ Error listing cameras: {e}")
+        print_section_error("🎥 DETECTED CAMERA DEVICES", f"Error listing cameras: {e}")
+
+# Sections of the full report: (name, title, collect, show, timeout, ttl), in seconds.
+# A section's data is reused for `ttl` seconds; devices rarely change, in-use status always might.
+REPORT_SECTIONS = [
+    ('devices', "🎥 DETECTED CAMERA DEVICES", collect_camera_devices, show_camera_devices, 30, 600),
+    ('settings', "⚙️ CAMERA PRIVACY SETTINGS", collect_camera_privacy_settings, show_camera_privacy_settings, 15, 120),
+    ('in_use', "📷 CURRENT CAMERA STATUS", collect_camera_in_use, show_camera_in_use, 45, 0),
+    ('history', "📅 CAMERA ACCESS HISTORY (Last 7 Days)", collect_camera_history, show_camera_history, 90, 300),
+    ('permissions', "🔐 APPS WITH CAMERA PERMISSION", collect_camera_permissions, show_camera_permissions, 15, 120),
+]
+
+_report_cache = None
+
+def get_report_cache():
+    """The section cache shared by the full report and the exports."""
+    global _report_cache
+    if _report_cache is None:
+        _report_cache = ReportCache()
+    return _report_cache
+
+def section_labels():
+    return {name: title.split(' ', 1)[1].title() for name, title, *_ in REPORT_SECTIONS}
+
+def collect_camera_report(force=False):
+    """Every section's CollectorResult, re-running only those older than their ttl (all of them if force)."""
+    return get_report_cache().run(
+        [(name, collect, timeout, ttl) for name, _, collect, _, timeout, ttl in REPORT_SECTIONS], force)
+
+def full_camera_report(force=False):
+    """Collect every section at once, then print them in order. Returns {section: data}."""
+    print("\n  ⏳ Collecting camera report...")
+    start = time.perf_counter()
+    results = collect_camera_report(force)
+    wall_time = time.perf_counter() - start
+    
+    for name, title, _, show, *_ in REPORT_SECTIONS:
+        result = results[name]
+        if result.error:
+            print_section_error(title, result.error)
+        else:
+            show(result.value)
+    
+    print_timings(results, section_labels(), wall_time)
+    return {name: result.value for name, result in results.items()}
+
+def export_camera_report(base_path=REPORT_EXPORT_BASE):
+    """Write the report (cached sections where still fresh) to <base>.jsonl and <base>.html."""
+    print_section_header("💾 EXPORT CAMERA REPORT")
+    results = collect_camera_report()
+    titles = {name: title.split(' ', 1)[1] for name, title, *_ in REPORT_SECTIONS}
+    try:
+        lines = export_jsonl(results, base_path + '.jsonl', titles)
+        export_html(results, base_path + '.html', "Camera Report", titles)
+    except OSError as e:
+        print(f"\n  ⚠️ Could not write the report: {e}")
+        return None
+    cached = sum(1 for r in results.values() if r.cached)
+    print(f"\n  ✅ {lines} lines written to {base_path}.jsonl")
+    print(f"  ✅ HTML report written to {base_path}.html")
+    print(f"     ({cached} of {len(results)} sections reused from the cache)")
+    return results
+
+def watch_camera():
+    """Report apps starting and stopping camera use as it happens, until Ctrl+C."""
+    print_section_header("👁️ WATCHING CAMERA USE (Ctrl+C to stop)")
+    timeline = get_timeline()
+    source = 'registry' if sys.platform == 'win32' else 'video_device'
+    
+    def on_event(event):
+        print_event(event, get_friendly_app_name)
+        timeline.record_event(event, source)
+    
+    watcher = default_watcher(get_registry(), on_event)
+    mode = "change notifications" if watcher.notifying else f"polling every {watcher.poll_interval:.0f}s"
+    print(f"\n  Using {mode}\n")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    # Nothing is watching these any more, so close them in the timeline rather than leave them open
+    for event in watcher.end_sessions():
+        timeline.record_event(event, source)
+    print(f"\n  Stopped after {watcher.stats['checks']} checks, {watcher.stats['events']} events "
+          f"({watcher.stats['cpu'] * 1000:.0f} ms CPU)")
+
+def show_camera_timeline(weeks=12):
+    """Camera minutes per app for each of the last few weeks, from the stored timeline."""
+    print_section_header(f"📈 CAMERA USE OVER THE LAST {weeks} WEEKS")
+    timeline = get_timeline()
+    timeline.ingest_consent_store(read_consent_store(get_registry()))
+    totals = timeline.minutes_per_week(datetime.now() - timedelta(weeks=weeks))
+    
+    if not totals:
+        print("\n  ✅ No camera sessions recorded yet")
+        return totals
+    
+    for week, apps in totals.items():
+        print(f"\n  Week of {week:%Y-%m-%d}: {format_duration(sum(apps.values()) * 60)} total")
+        for app, minutes in sorted(apps.items(), key=lambda item: -item[1]):
+            print(f"     {get_friendly_app_name(app):<40}{format_duration(minutes * 60):>12}")
+    
+    active = timeline.overlapping(datetime.now())
+    if active:
+        print("\n  🔴 Sessions still open: " + ", ".join(get_friendly_app_name(s.app) for s in active))
+    return totals
 
 if __name__ == "__main__":
     while True:
@@ -912,9 +742,12 @@ if __name__ == "__main__":
         print("  4. Check camera privacy settings")
         print("  5. List camera devices")
         print("  6. Full report (all of the above)")
-        print("  7. Exit")
+        print("  7. Watch camera use live")
+        print("  8. Camera use over time (weekly totals)")
+        print("  9. Export report (JSON Lines + HTML)")
+        print("  10. Exit")
         
-        choice = input("\nSelect option (1-7): ").strip()
+        choice = input("\nSelect option (1-10): ").strip()
         
         if choice == '1':
             get_camera_currently_in_use()
@@ -927,16 +760,18 @@ if __name__ == "__main__":
         elif choice == '5':
             list_camera_devices()
         elif choice == '6':
-            list_camera_devices()
-            check_camera_privacy_settings()
-            get_camera_currently_in_use()
-            get_camera_history_last_7_days()
-            get_all_camera_permissions()
+            full_camera_report()
         elif choice == '7':
+            watch_camera()
+        elif choice == '8':
+            show_camera_timeline()
+        elif choice == '9':
+            export_camera_report()
+        elif choice == '10':
             print("\nExiting...")
             break
         else:
-            print("\n  ⚠️ Invalid option. Please select 1-7.")
+            print("\n  ⚠️ Invalid option. Please select 1-10.")
         
         print("\n" + "=" * 70)
         input("\nPress Enter to return to main menu...")
@@ -0,0 +1,343 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Watch mode for camera_monitor. Reports each app that starts or stops using
+# the camera as it happens, with how long the session lasted. It waits on change
+# notifications where the OS gives them (registry change events for the Windows consent
+# store, inotify open/close events on Linux's /dev/video* nodes), and otherwise polls.
+# Checks are spaced out so they stay inside a CPU budget.
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from registry_provider import CONSENT_STORE, read_consent_store
+from video_devices import list_video_devices, HolderScanner
+
+# One app's ongoing use of the camera
+Session = namedtuple('Session', ['app', 'started', 'detail'])
+
+# A start or stop. duration is in seconds (stops only).
+WatchEvent = namedtuple('WatchEvent', ['kind', 'app', 'time', 'started', 'duration', 'detail'])
+
+
+class ConsentStoreSampler:
+    """Camera sessions from the Windows consent store: started but not yet stopped."""
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.stops = {}
+
+    def sample(self):
+        sessions = {}
+        self.stops = {}
+        for entry in read_consent_store(self.registry):
+            key = (entry.app, entry.last_used_start)
+            if entry.in_use:
+                sessions[key] = Session(entry.app, entry.last_used_start, entry.type)
+            elif entry.last_used_stop:
+                self.stops[key] = entry.last_used_stop
+        return sessions
+
+    def stopped_at(self, key):
+        """When the registry says a session ended (None if it doesn't say)."""
+        return self.stops.get(key)
+
+
+class VideoHolderSampler:
+    """Camera sessions on Linux: processes holding a /dev/video* node open."""
+
+    def __init__(self, scanner=None, devices=None):
+        self.scanner = scanner or HolderScanner()
+        self.devices = devices if devices is not None else list_video_devices()
+
+    def sample(self):
+        return {
+            (holder.pid, holder.start_time): Session(
+                holder.exe or holder.name, holder.first_seen,
+                f"PID {holder.pid}, {', '.join(holder.devices)}"
+            )
+            for holder in self.scanner.scan(self.devices)
+        }
+
+    def stopped_at(self, key):
+        return None
+
+
+class RegistryChangeWaiter:
+    """Waits for a change anywhere under a registry key (RegNotifyChangeKeyValue)."""
+
+    REG_NOTIFY_CHANGE_NAME = 0x1
+    REG_NOTIFY_CHANGE_LAST_SET = 0x4
+    WAIT_OBJECT_0 = 0
+
+    def __init__(self, path, hive='HKEY_CURRENT_USER'):
+        import winreg
+        self.advapi32 = ctypes.windll.advapi32
+        self.kernel32 = ctypes.windll.kernel32
+        self.key = winreg.OpenKey(getattr(winreg, hive), path, 0, winreg.KEY_NOTIFY | winreg.KEY_READ)
+        self.event = self.kernel32.CreateEventW(None, False, False, None)
+        if not self.event:
+            raise OSError("CreateEventW failed")
+        self._arm()
+
+    def _arm(self):
+        # Asynchronous notifications are tied to the calling thread, so arm and wait on the same one
+        result = self.advapi32.RegNotifyChangeKeyValue(
+            ctypes.c_void_p(int(self.key)), True,
+            self.REG_NOTIFY_CHANGE_NAME | self.REG_NOTIFY_CHANGE_LAST_SET,
+            ctypes.c_void_p(self.event), True
+        )
+        if result != 0:
+            raise OSError(result, "RegNotifyChangeKeyValue failed")
+
+    def wait(self, timeout):
+        """True if something changed within `timeout` seconds."""
+        if self.kernel32.WaitForSingleObject(ctypes.c_void_p(self.event), int(timeout * 1000)) != self.WAIT_OBJECT_0:
+            return False
+        self._arm()
+        return True
+
+    def close(self):
+        self.kernel32.CloseHandle(ctypes.c_void_p(self.event))
+        self.key.Close()
+
+
+class InotifyWaiter:
+    """Waits for any of a set of files (e.g. /dev/video*) to be opened or closed."""
+
+    IN_OPEN = 0x20
+    IN_CLOSE_WRITE = 0x08
+    IN_CLOSE_NOWRITE = 0x10
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_OPEN | self.IN_CLOSE_WRITE | self.IN_CLOSE_NOWRITE
+        for path in paths:
+            if libc.inotify_add_watch(self.fd, os.fsencode(path), mask) < 0:
+                error = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(error, f"Cannot watch {path}")
+
+    def wait(self, timeout):
+        """True if a watched file was opened or closed within `timeout` seconds."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        try:
+            while os.read(self.fd, 4096):
+                pass  # Drain: one check covers however many events piled up
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWaiter:
+    """The fallback when there's nothing to wait on: just let the time pass."""
+
+    def __init__(self, sleep=time.sleep):
+        self.sleep = sleep
+
+    def wait(self, timeout):
+        self.sleep(timeout)
+        return False
+
+    def close(self):
+        pass
+
+
+class CameraWatcher:
+    """
+    Turns successive camera samples into start/stop events.
+
+    With a notifying waiter, a check runs shortly after each notification (after `settle`
+    seconds, so the app has finished starting up), plus every `max_interval` seconds in
+    case one was missed. With PollingWaiter, a check runs every `poll_interval` seconds.
+    Either way, after a check that cost C CPU-seconds the next waits at least
+    C / cpu_budget seconds, so watching averages no more than `cpu_budget` of one core.
+
+    Session edges come from notification times where there are any. Pending notifications
+    are drained just before each sample, so every one timed afterwards happened after that
+    sample. A new session starts at the first notification since the last check. An ended
+    one stops at the last, since the app's own stop is the latest thing that could have
+    removed it. While a check is held back by the budget, the watcher keeps listening, so
+    a stop during that wait is still timed when it happens.
+    """
+
+    def __init__(self, sampler, waiter=None, on_event=None, poll_interval=2.0, max_interval=30.0,
+                 cpu_budget=0.005, settle=0.25, clock=time.monotonic, cpu_clock=time.process_time,
+                 sleep=time.sleep):
+        self.sampler = sampler
+        self.waiter = waiter or PollingWaiter(sleep)
+        self.notifying = not isinstance(self.waiter, PollingWaiter)
+        self.on_event = on_event or print_event
+        self.poll_interval = poll_interval
+        self.max_interval = max_interval
+        self.cpu_budget = cpu_budget
+        self.settle = settle
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+        self.sleep = sleep
+        self.sessions = {}
+        self.earliest_next = 0.0
+        self.notified_at = None       # First notification since the last check
+        self.last_notified_at = None  # Latest notification since the last check
+        self.stats = {'checks': 0, 'notifications': 0, 'events': 0, 'cpu': 0.0}
+
+    def check(self):
+        """Sample now and emit events for whatever changed. Returns the events."""
+        cpu_start, wall_start = self.cpu_clock(), self.clock()
+        current = self.sampler.sample()
+        now = datetime.now()
+        events = []
+        for key, session in current.items():
+            if key not in self.sessions:
+                if self.notified_at and session.started and session.started > self.notified_at:
+                    # First seen after the notification it caused: the notification is the better start time
+                    session = current[key] = session._replace(started=self.notified_at)
+                events.append(WatchEvent('start', session.app, now, session.started, None, session.detail))
+        for key, session in self.sessions.items():
+            if key not in current:
+                ended = self.sampler.stopped_at(key) or self.last_notified_at or now
+                duration = (ended - session.started).total_seconds() if session.started else None
+                events.append(WatchEvent('stop', session.app, ended, session.started, duration, session.detail))
+        self.sessions = current
+        self.notified_at = self.last_notified_at = None
+
+        cost = self.cpu_clock() - cpu_start
+        self.stats['checks'] += 1
+        self.stats['cpu'] += cost
+        self.stats['events'] += len(events)
+        self.earliest_next = wall_start + (cost / self.cpu_budget if self.cpu_budget else 0)
+        for event in events:
+            self.on_event(event)
+        return events
+
+    def end_sessions(self):
+        """
+        Stop events, timed now, for the sessions still open, e.g. when watching ends. They
+        aren't passed to on_event, since the apps haven't necessarily stopped.
+        """
+        now = datetime.now()
+        events = [WatchEvent('stop', session.app, now, session.started,
+                             (now - session.started).total_seconds() if session.started else None, session.detail)
+                  for session in self.sessions.values()]
+        self.sessions = {}
+        return events
+
+    def run(self, should_stop=lambda: False):
+        """Check, then wait and check again until should_stop() (or Ctrl+C)."""
+        self._drain()
+        self.check()
+        try:
+            while not should_stop():
+                if self.waiter.wait(self.max_interval if self.notifying else self.poll_interval):
+                    self._notified()
+                    self.sleep(self.settle)
+                # Over budget: hold the check back, but keep timing notifications meanwhile
+                wait = self.earliest_next - self.clock()
+                while wait > 0:
+                    if not self.notifying:
+                        self.sleep(wait)
+                    elif self.waiter.wait(wait):
+                        self._notified()
+                    wait = self.earliest_next - self.clock()
+                self._drain()
+                self.check()
+        finally:
+            self.waiter.close()
+
+    def _notified(self):
+        now = datetime.now()
+        self.stats['notifications'] += 1
+        self.notified_at = self.notified_at or now
+        self.last_notified_at = now
+
+    def _drain(self):
+        """Take in notifications already queued, so none timed after the next sample predates it."""
+        if self.notifying and self.waiter.wait(0):
+            self._notified()
+
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60}m"
+
+
+def print_event(event, describe=None):
+    name = describe(event.app) if describe else event.app
+    if event.kind == 'start':
+        late = event.started and (event.time - event.started).total_seconds() > 5
+        since = f" (since {event.started:%Y-%m-%d %H:%M:%S})" if late else ""
+        print(f"  🔴 {event.time:%Y-%m-%d %H:%M:%S}  {name} started using the camera{since}")
+    else:
+        duration = f" after {format_duration(event.duration)}" if event.duration is not None else ""
+        print(f"  ⚪ {event.time:%Y-%m-%d %H:%M:%S}  {name} stopped using the camera{duration}")
+    print(f"       {event.detail}: {event.app}" if event.detail else f"       {event.app}")
+
+
+def default_watcher(registry=None, on_event=None):
+    """A watcher for this platform, using change notifications when they can be set up."""
+    if sys.platform == 'win32':
+        sampler = ConsentStoreSampler(registry)
+        try:
+            waiter = RegistryChangeWaiter(CONSENT_STORE + r'\webcam')
+        except OSError:
+            waiter = None
+    else:
+        sampler = VideoHolderSampler()
+        try:
+            waiter = InotifyWaiter([d.path for d in sampler.devices]) if sampler.devices else None
+        except (OSError, AttributeError):
+            waiter = None
+    return CameraWatcher(sampler, waiter, on_event)
+
+
+if __name__ == "__main__":
+    import tempfile
+    import threading
+    from video_devices import build_fixture
+
+    # A fixture camera that "Zoom" opens for two seconds, watched through inotify on the fixture node
+    with tempfile.TemporaryDirectory() as folder:
+        proc_root, dev_root, sys_root = build_fixture(folder, processes=300, holders=())
+        devices = list_video_devices(dev_root, sys_root)
+        sampler = VideoHolderSampler(HolderScanner(proc_root), devices)
+        power = os.path.join(devices[0].power, 'runtime_status')
+        link = os.path.join(proc_root, '151', 'fd', '99')
+
+        def app_session():
+            time.sleep(1)
+            with open(power, 'w') as f:
+                f.write('active\n')
+            with open(devices[0].path):  # Fires IN_OPEN / IN_CLOSE_NOWRITE on the node
+                os.symlink(devices[0].path, link)
+            time.sleep(2)
+            os.remove(link)
+            with open(power, 'w') as f:
+                f.write('suspended\n')
+            with open(devices[0].path):
+                pass
+
+        watcher = CameraWatcher(sampler, InotifyWaiter([d.path for d in devices]), max_interval=5)
+        threading.Thread(target=app_session, daemon=True).start()
+        start, cpu_start = time.monotonic(), time.process_time()
+        watcher.run(should_stop=lambda: time.monotonic() - start > 6)
+        elapsed = time.monotonic() - start
+        print(f"\n{watcher.stats['checks']} checks, {watcher.stats['notifications']} notifications, "
+              f"{watcher.stats['events']} events in {elapsed:.1f}s; checks used "
+              f"{watcher.stats['cpu'] * 1000:.1f} ms CPU ({watcher.stats['cpu'] / elapsed:.3%} of a core)")
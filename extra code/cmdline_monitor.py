@@ -3,15 +3,18 @@
 # Description: Monitors what apps or files open the command line and reports back
 # what it is, what it's doing, and when it was installed.
 
-import psutil
 import os
 import time
 import hashlib
-import subprocess
 import json
 import struct
 from datetime import datetime
 
+from findings_collector import Agent, cmdline_finding
+from process_snapshot import get_snapshot_service
+from powershell_pool import run_powershell, get_pool, ps_quote
+from app_identity import get_resolver
+
 # Optional: for web lookups
 try:
     import urllib.request
@@ -54,6 +57,10 @@ SUSPICIOUS_EXTENSIONS = {
     '.msh2xml', '.scf', '.lnk', '.inf', '.reg', '.hta'
 }
 
+# Send findings to a central collector (see findings_collector.py) as well as the console.
+# 'host:port' for TCP or 'unix:/path/to.sock'. None keeps everything local.
+COLLECTOR_ADDRESS = None
+
 # Known malicious process names (common malware names)
 KNOWN_MALICIOUS_NAMES = {
     'cryptolocker', 'wannacry', 'petya', 'notpetya', 'locky', 'cerber',
@@ -87,16 +94,12 @@ def check_digital_signature(file_path):
     try:
         if file_path and os.path.exists(file_path):
             # Use PowerShell to check digital signature
-            result = subprocess.run(
-                ['powershell', '-Command', f'(Get-AuthenticodeSignature "{file_path}").Status'],
-                capture_output=True, text=True, timeout=10
-            )
-            status = result.stdout.strip()
+            status = run_powershell(f'(Get-AuthenticodeSignature -LiteralPath {ps_quote(file_path)}).Status', timeout=10).strip()
             return {
                 'signed': status == 'Valid',
                 'status': status
             }
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+    except OSError:  # Includes timeouts and PowerShell not being available
         pass
     return {'signed': False, 'status': 'Unknown'}
 
@@ -303,12 +306,12 @@ def get_file_metadata(file_path):
     
     try:
         ps_command = f'''
-        $file = Get-Item "{file_path}"
+        $file = Get-Item -LiteralPath {ps_quote(file_path)}
         $shell = New-Object -ComObject Shell.Application
         $folder = $shell.Namespace($file.DirectoryName)
         $item = $folder.ParseName($file.Name)
         
-        $versionInfo = [System.Diagnostics.FileVersionInfo]::GetVersionInfo("{file_path}")
+        $versionInfo = [System.Diagnostics.FileVersionInfo]::GetVersionInfo($file.FullName)
         
         @{{
             Description = $versionInfo.FileDescription
@@ -320,13 +323,9 @@ def get_file_metadata(file_path):
         }} | ConvertTo-Json
         '''
         
-        result = subprocess.run(
-            ['powershell', '-Command', ps_command],
-            capture_output=True, text=True, timeout=15
-        )
+        data = get_pool().run_json(ps_command, timeout=15)
         
-        if result.stdout.strip():
-            data = json.loads(result.stdout.strip())
+        if data:
             metadata['description'] = data.get('Description')
             metadata['company'] = data.get('Company')
             metadata['product'] = data.get('Product')
@@ -555,12 +554,11 @@ def check_persistence(file_path):
     
     for reg_path, description in autorun_checks:
         try:
-            result = subprocess.run(
-                ['powershell', '-Command', f'Get-ItemProperty -Path "{reg_path}" -ErrorAction SilentlyContinue | Format-List'],
-                capture_output=True, text=True, timeout=5
-            )
+            output = run_powershell(
+                f'Get-ItemProperty -Path "{reg_path}" -ErrorAction SilentlyContinue | Format-List', timeout=5
+            ).lower()
             
-            if file_name in result.stdout.lower() or file_path.lower() in result.stdout.lower():
+            if file_name in output or file_path.lower() in output:
                 print(f"     🔴 Found in {description} registry!")
                 found_persistence = True
                 
@@ -569,12 +567,12 @@ def check_persistence(file_path):
     
     # Check scheduled tasks
     try:
-        result = subprocess.run(
-            ['powershell', '-Command', 'Get-ScheduledTask | Where-Object {$_.State -ne "Disabled"} | Select-Object TaskName, TaskPath | ConvertTo-Json'],
-            capture_output=True, text=True, timeout=10
+        output = run_powershell(
+            'Get-ScheduledTask | Where-Object {$_.State -ne "Disabled"} | Select-Object TaskName, TaskPath | ConvertTo-Json',
+            timeout=10
         )
         
-        if file_name in result.stdout.lower():
+        if file_name in output.lower():
             print(f"     🔴 Found in Scheduled Tasks!")
             found_persistence = True
             
@@ -594,65 +592,63 @@ def get_file_creation_time(file_path):
         pass
     return "Unknown"
 
-def get_process_cmdline(proc):
-    """Get the command line arguments of a process."""
-    try:
-        cmdline = proc.cmdline()
-        if cmdline:
-            return ' '.join(cmdline)
-    except (psutil.AccessDenied, psutil.NoSuchProcess):
-        pass
-    return "Access Denied"
-
-def get_parent_info(proc):
-    """Get information about the parent process."""
-    try:
-        parent = proc.parent()
-        if parent:
-            return {
-                'name': parent.name(),
-                'pid': parent.pid,
-                'exe': parent.exe() if parent.exe() else "Unknown",
-                'cmdline': get_process_cmdline(parent)
-            }
-    except (psutil.AccessDenied, psutil.NoSuchProcess):
-        pass
-    return None
+def get_parent_details(snapshot, record):
+    """Get information about the parent process from a process snapshot."""
+    parent = snapshot.parent(record)
+    if parent is None:
+        return None
+    # Same resolver as camera_monitor; memoised, so repeat parents (explorer, code...) cost a dict lookup
+    identity = get_resolver().process(parent.name, parent.exe)
+    return {
+        'name': parent.name,
+        'app': identity.name,
+        'publisher': identity.publisher,
+        'pid': parent.pid,
+        'exe': parent.exe or "Unknown",
+        'cmdline': ' '.join(parent.cmdline) if parent.cmdline else "Access Denied"
+    }
 
 def scan_cmdline_openers():
     """Scan for all processes that have opened command line processes."""
     cmdline_instances = []
     
-    for proc in psutil.process_iter(['pid', 'name', 'exe', 'create_time']):
-        try:
-            proc_name = proc.info['name'].lower() if proc.info['name'] else ''
-            
-            # Check if this is a command line process
-            if proc_name in CMDLINE_PROCESSES:
-                proc_exe = proc.info['exe'] or ''
-                create_time = datetime.fromtimestamp(proc.info['create_time']).strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Get parent process info (what opened the command line)
-                parent_info = get_parent_info(proc)
-                
-                # Get the command being run
-                cmdline = get_process_cmdline(proc)
-                
-                cmdline_instances.append({
-                    'cmdline_process': proc_name,
-                    'cmdline_pid': proc.info['pid'],
-                    'cmdline_started': create_time,
-                    'command_running': cmdline,
-                    'parent': parent_info,
-                    'parent_installed': get_file_creation_time(parent_info['exe']) if parent_info else "Unknown",
-                    'malware_check': check_if_malicious(parent_info['exe'], parent_info['name']) if parent_info else None
-                })
-                
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            continue
+    # The process table is walked once per tick and shared with security_scanner
+    snapshot = get_snapshot_service().snapshot()
+    
+    for record in snapshot.with_names(CMDLINE_PROCESSES):
+        proc_name = record.name.lower()
+        create_time = datetime.fromtimestamp(record.create_time).strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Get parent process info (what opened the command line)
+        parent_info = get_parent_details(snapshot, record)
+        
+        # Get the command being run
+        cmdline = ' '.join(record.cmdline) if record.cmdline else "Access Denied"
+        
+        cmdline_instances.append({
+            'cmdline_process': proc_name,
+            'cmdline_pid': record.pid,
+            'cmdline_started': create_time,
+            'command_running': cmdline,
+            'parent': parent_info,
+            'parent_installed': get_file_creation_time(parent_info['exe']) if parent_info else "Unknown",
+            'malware_check': check_if_malicious(parent_info['exe'], parent_info['name']) if parent_info else None
+        })
     
     return cmdline_instances
 
+_collector_agent = None
+
+def report_to_collector(instances):
+    """Queue findings about what opened each command line for the collector, if one is configured."""
+    global _collector_agent
+    if not COLLECTOR_ADDRESS:
+        return
+    if _collector_agent is None:
+        _collector_agent = Agent(COLLECTOR_ADDRESS).start()
+    for instance in instances:
+        _collector_agent.send(cmdline_finding(instance))
+
 def display_results(instances):
     """Display the results in a formatted table."""
     print("\n" + "=" * 100)
@@ -677,7 +673,8 @@ def display_results(instances):
         
         if instance['parent']:
             print(f"\n  OPENED BY:")
-            print(f"  ├── Application   : {instance['parent']['name']}")
+            publisher = f", {instance['parent']['publisher']}" if instance['parent'].get('publisher') else ""
+            print(f"  ├── Application   : {instance['parent'].get('app', instance['parent']['name'])} ({instance['parent']['name']}{publisher})")
             print(f"  ├── Parent PID    : {instance['parent']['pid']}")
             print(f"  ├── Executable    : {instance['parent']['exe']}")
             print(f"  ├── Installed On  : {instance['parent_installed']}")
@@ -711,6 +708,7 @@ def continuous_monitor(interval=10):
             if new_instances:
                 print(f"\n⚡ NEW COMMAND LINE ACTIVITY DETECTED at {datetime.now().strftime('%H:%M:%S')}")
                 display_results(new_instances)
+                report_to_collector(new_instances)
                 
                 # Add to seen
                 for inst in new_instances:
@@ -727,6 +725,9 @@ def continuous_monitor(interval=10):
             
     except KeyboardInterrupt:
         print("\n\n🛑 Monitor stopped by user.")
+    finally:
+        if _collector_agent is not None:
+            _collector_agent.stop()
 
 if __name__ == "__main__":
     print("\n" + "=" * 100)
@@ -743,6 +744,9 @@ if __name__ == "__main__":
     if choice == '1':
         instances = scan_cmdline_openers()
         display_results(instances)
+        report_to_collector(instances)
+        if _collector_agent is not None:
+            _collector_agent.stop()
     elif choice == '2':
         interval = input("Enter scan interval in seconds (default 10): ").strip()
         interval = int(interval) if interval.isdigit() else 10
@@ -0,0 +1,454 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Streams Windows event logs (XML exports, .evtx files or the live logs through
+# wevtutil) and keeps only events from the wanted providers, event IDs and time range. The
+# provider/ID/time checks run on each event's raw text, so events that don't match are never
+# parsed as XML, and no message text is ever rendered.
+# A bookmark file remembers where each log was read up to, so later runs only read new events.
+
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+try:
+    from Evtx.Evtx import Evtx  # python-evtx, only needed for .evtx files
+    EVTX_AVAILABLE = True
+except ImportError:
+    EVTX_AVAILABLE = False
+
+CHUNK_SIZE = 64 * 1024
+XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# One matching event. time is a local datetime; data maps <Data Name=...> (or UserData
+# element names) to their text.
+EventRecord = namedtuple('EventRecord', ['record_id', 'time', 'provider', 'event_id', 'channel', 'computer', 'data'])
+
+
+def parse_system_time(text):
+    """Parse TimeCreated/@SystemTime ('2026-10-19T08:15:02.1234567Z') to a local datetime."""
+    if not text:
+        return None
+    match = re.match(r'(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)(\.\d+)?', text)
+    if not match:
+        return None
+    fraction = (match.group(2) or '.0')[:7]  # Windows writes 100ns ticks; datetime stops at µs
+    utc = datetime.strptime(match.group(1) + fraction, '%Y-%m-%dT%H:%M:%S.%f').replace(tzinfo=timezone.utc)
+    return utc.astimezone().replace(tzinfo=None)
+
+
+def to_system_time(local):
+    """The reverse of parse_system_time, for XPath queries and fixtures."""
+    return local.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+class EventFilter:
+    """
+    Which events to keep. providers and event_ids are checked from <System> alone;
+    keywords (a regex) is checked against the event's data values and provider name.
+    Leave any of them as None to accept everything.
+    """
+
+    def __init__(self, providers=None, event_ids=None, keywords=None):
+        self.provider_names = sorted(providers) if providers else []
+        self.providers = {p.lower() for p in providers} if providers else None
+        self.event_ids = set(event_ids) if event_ids else None
+        self.keywords = re.compile(keywords, re.IGNORECASE) if keywords else None
+
+    def matches_system(self, provider, event_id):
+        if self.providers is not None and (provider or '').lower() not in self.providers:
+            return False
+        return self.event_ids is None or event_id in self.event_ids
+
+    def matches_data(self, provider, data):
+        if self.keywords is None:
+            return True
+        return bool(self.keywords.search(provider or '')) or any(
+            self.keywords.search(value) for value in data.values() if value)
+
+    def xpath(self, since=None):
+        """An event log XPath query doing the same provider/ID/time filtering on the Windows side."""
+        conditions = []
+        if self.provider_names:
+            conditions.append(' or '.join(f"Provider[@Name='{p}']" for p in self.provider_names))
+        if self.event_ids:
+            conditions.append(' or '.join(f"EventID={i}" for i in sorted(self.event_ids)))
+        if since:
+            conditions.append(f"TimeCreated[@SystemTime>='{to_system_time(since)}']")
+        if not conditions:
+            return '*'
+        return '*[System[' + ' and '.join(f'({c})' for c in conditions) + ']]'
+
+
+class EventStreamParser:
+    """
+    Incremental event XML reader. feed() it text in chunks of any size and it returns the
+    EventRecords that passed the filter so far. Works on a full export (<Events> root, with
+    or without an XML declaration) and on bare <Event> elements one after another.
+
+    Each event's record number, time, provider and ID are pulled from the raw text first;
+    only events that pass those checks are parsed as XML for their data. Events older than
+    `since`, newer than `until`, or at/before the bookmark `after` ((record_id, time) from
+    a previous run) are dropped.
+    """
+
+    def __init__(self, event_filter=None, since=None, until=None, after=None):
+        self.filter = event_filter or EventFilter()
+        self.since = since
+        self.until = until
+        self.after = after
+        # SystemTime strings sort like the times they hold, so compare them as text
+        self.since_key = _time_key(to_system_time(since)) if since else None
+        self.until_key = _time_key(to_system_time(until)) if until else None
+        self.after_key = (after[0], _time_key(to_system_time(after[1]))) if after else None
+        self.buffer = ''
+        self.newest = None  # (record_id, time key) of the newest event seen, matched or not
+        self.stats = {'events': 0, 'skipped': 0, 'matched': 0}
+
+    @property
+    def last(self):
+        """(record_id, time) of the newest event seen, for the next run's bookmark."""
+        if self.newest is None:
+            return None
+        return self.newest[0], parse_system_time(self.newest[1])
+
+    def feed(self, text):
+        self.buffer += text
+        matched = []
+        pos = 0
+        while True:
+            end = self.buffer.find('</Event>', pos)
+            if end == -1:
+                break
+            end += len('</Event>')
+            start = EVENT_START.search(self.buffer, pos, end)
+            if start is not None:
+                record = self._event(self.buffer[start.start():end])
+                if record is not None:
+                    matched.append(record)
+            pos = end
+        self.buffer = self.buffer[pos:]
+        return matched
+
+    def close(self):
+        self.buffer = ''
+        return []
+
+    def _event(self, text):
+        self.stats['events'] += 1
+        record_id = _int(_search(RECORD_ID, text))
+        when = _time_key(_search(TIME_CREATED, text))
+        if record_id is not None and when is not None and (self.newest is None or (when, record_id) > self.newest[::-1]):
+            self.newest = (record_id, when)
+
+        if not self._wanted(record_id, when) or \
+                not self.filter.matches_system(_search(PROVIDER, text), _int(_search(EVENT_ID, text))):
+            self.stats['skipped'] += 1
+            return None
+
+        try:
+            elem = ET.fromstring(text)
+        except ET.ParseError:
+            self.stats['skipped'] += 1
+            return None
+        header = elem.find(f'{{{_namespace(elem)}}}System')
+        system = {_local(child.tag): child for child in (header if header is not None else [])}
+        provider = system['Provider'].get('Name') if 'Provider' in system else None
+        data = _event_data(elem)
+        if not self.filter.matches_data(provider, data):
+            self.stats['skipped'] += 1
+            return None
+
+        self.stats['matched'] += 1
+        return EventRecord(
+            record_id, parse_system_time(when), provider,
+            _int(system['EventID'].text) if 'EventID' in system else None,
+            system['Channel'].text if 'Channel' in system else None,
+            system['Computer'].text if 'Computer' in system else None,
+            data
+        )
+
+    def _wanted(self, record_id, when):
+        """The time and bookmark checks."""
+        if when is not None:
+            if self.since_key is not None and when < self.since_key:
+                return False
+            if self.until_key is not None and when > self.until_key:
+                return False
+        if self.after_key is not None and record_id is not None and when is not None:
+            last_id, last_time = self.after_key
+            if record_id <= last_id and when <= last_time:
+                return False  # Already read on an earlier run (a cleared log restarts IDs but not time)
+        return True
+
+
+EVENT_START = re.compile(r'<Event[\s>]')
+PROVIDER = re.compile(r'<Provider\s[^>]*?Name=[\'"]([^\'"]*)')
+EVENT_ID = re.compile(r'<EventID[^>]*>\s*(\d+)')
+TIME_CREATED = re.compile(r'<TimeCreated\s[^>]*?SystemTime=[\'"]([^\'"]*)')
+RECORD_ID = re.compile(r'<EventRecordID>\s*(\d+)')
+
+
+def _search(pattern, text):
+    match = pattern.search(text)
+    return match.group(1) if match else None
+
+
+def _time_key(system_time):
+    """SystemTime as 'YYYY-MM-DDTHH:MM:SS.ffffff', so times written with any fraction compare as text."""
+    if not system_time:
+        return None
+    fraction = system_time[20:26].rstrip('Z') if system_time[19:20] == '.' else ''
+    return system_time[:19] + '.' + fraction.ljust(6, '0')
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _namespace(elem):
+    return elem.tag[1:].split('}', 1)[0] if elem.tag.startswith('{') else ''
+
+
+def _event_data(elem):
+    """<EventData> values by Name (Data1, Data2... when unnamed) and <UserData> leaf values."""
+    data = {}
+    for child in elem:
+        tag = _local(child.tag)
+        if tag == 'EventData':
+            for item in child:
+                data[item.get('Name') or f"Data{len(data) + 1}"] = (item.text or '').strip()
+        elif tag == 'UserData':
+            for leaf in child.iter():
+                if len(leaf) == 0:
+                    data[_local(leaf.tag)] = (leaf.text or '').strip()
+    return data
+
+
+def _int(text):
+    try:
+        return int(text)
+    except (TypeError, ValueError):
+        return None
+
+
+def read_xml_events(path, parser):
+    """Stream an XML export (Event Viewer's 'Save as XML', or wevtutil qe /f:xml /e:Events)."""
+    with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), ''):
+            yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def read_evtx_events(path, parser):
+    """
+    Stream a binary .evtx file (needs python-evtx). Each record's header time and number are
+    checked before its XML is rendered, so old records cost almost nothing.
+    """
+    if not EVTX_AVAILABLE:
+        raise ImportError("Reading .evtx files needs python-evtx (pip install python-evtx)")
+    since_utc = parser.since.astimezone(timezone.utc).replace(tzinfo=None) if parser.since else None
+    with Evtx(path) as log:
+        for record in log.records():
+            if since_utc is not None and record.timestamp() < since_utc:
+                continue
+            if parser.after is not None and record.record_num() <= parser.after[0] \
+                    and record.timestamp() <= parser.after[1].astimezone(timezone.utc).replace(tzinfo=None):
+                continue
+            yield from parser.feed(XML_DECLARATION.sub('', record.xml()))
+    yield from parser.close()
+
+
+def read_live_events(log_name, parser):
+    """Stream a live log through wevtutil, letting Windows apply the provider/ID/time filter."""
+    if sys.platform != 'win32':
+        raise OSError("Live event logs can only be read on Windows")
+    since = parser.since
+    if parser.after is not None and (since is None or parser.after[1] > since):
+        since = parser.after[1]
+    query = parser.filter.xpath(since)
+    flags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+    proc = subprocess.Popen(
+        ['wevtutil', 'qe', log_name, f'/q:{query}', '/f:xml', '/e:Events'],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        text=True, encoding='utf-8', errors='replace', creationflags=flags
+    )
+    try:
+        for chunk in iter(lambda: proc.stdout.read(CHUNK_SIZE), ''):
+            yield from parser.feed(chunk)
+        yield from parser.close()
+    finally:
+        proc.stdout.close()
+        proc.wait()
+
+
+def read_events(source, parser):
+    """Pick a reader by source: a .xml or .evtx path, or otherwise a live log name."""
+    lowered = source.lower()
+    if lowered.endswith('.xml'):
+        return read_xml_events(source, parser)
+    if lowered.endswith('.evtx'):
+        return read_evtx_events(source, parser)
+    return read_live_events(source, parser)
+
+
+class EventBookmarks:
+    """
+    Persistent per-source bookmarks: the newest (record_id, time) read from each log, plus
+    the matches found so far (dropped once older than `keep_days`), so a later run can read
+    only the new events and still report everything in its window.
+    """
+
+    def __init__(self, path=None, keep_days=7):
+        self.path = path
+        self.keep_days = keep_days
+        self.entries = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        """Write the bookmarks to disk if anything changed."""
+        if not self.path or not self.dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️ Could not save event bookmarks: {e}")
+
+    def get(self, source):
+        """The (record_id, time) bookmark for a source, or None if it hasn't been read yet."""
+        entry = self.entries.get(source)
+        if not entry or entry.get('record_id') is None:
+            return None
+        return entry['record_id'], datetime.fromisoformat(entry['time'])
+
+    def update(self, source, last, new_records, keep_since=None):
+        """Move a source's bookmark forward and add its new matches, dropping ones before keep_since."""
+        entry = self.entries.setdefault(source, {'record_id': None, 'time': None, 'events': []})
+        if last is not None:
+            entry['record_id'], entry['time'] = last[0], last[1].isoformat()
+        entry['events'].extend(_record_to_json(r) for r in new_records)
+        cutoff = (keep_since or datetime.now() - timedelta(days=self.keep_days)).isoformat()
+        entry['events'] = [e for e in entry['events'] if e['time'] and e['time'] >= cutoff]
+        self.dirty = True
+
+    def events(self, source):
+        return [_record_from_json(e) for e in self.entries.get(source, {}).get('events', [])]
+
+
+def _record_to_json(record):
+    return record._replace(time=record.time.isoformat() if record.time else None)._asdict()
+
+
+def _record_from_json(entry):
+    record = EventRecord(**entry)
+    return record._replace(time=datetime.fromisoformat(record.time) if record.time else None)
+
+
+def scan_source(source, event_filter, since=None, bookmarks=None):
+    """
+    Read a log's new events and return (every match since `since`, parser stats). With
+    bookmarks, only events after the last run are read and earlier matches come from the
+    bookmark file.
+    """
+    after = bookmarks.get(source) if bookmarks else None
+    parser = EventStreamParser(event_filter, since=since, after=after)
+    new_records = list(read_events(source, parser))
+    if bookmarks is None:
+        return new_records, parser.stats
+    bookmarks.update(source, parser.last, new_records, since)
+    records = [r for r in bookmarks.events(source) if since is None or (r.time and r.time >= since)]
+    return records, parser.stats
+
+
+def build_fixture(path, events=10000, match_every=500, start=None, days=10, first_record=1):
+    """
+    Write an XML export shaped like the Security log: mostly logon noise (4624), with an
+    object-access event (4663) on a camera device every `match_every` events, spread over
+    `days` days from `start`. Returns the time of the last event.
+    """
+    when = start or datetime.now() - timedelta(days=days)
+    step = timedelta(days=days) / events
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<Events>\n')
+        for i in range(events):
+            when += step
+            camera = i % match_every == match_every - 1
+            event_id = 4663 if camera else 4624
+            if camera:
+                data = ('<Data Name="ObjectType">Device</Data>'
+                        '<Data Name="ObjectName">\\Device\\00000042 (USB Video Device webcam)</Data>'
+                        f'<Data Name="ProcessName">C:\\Users\\user\\AppData\\Local\\Discord\\app-1.0.{i}\\Discord.exe</Data>')
+            else:
+                data = ('<Data Name="TargetUserName">user</Data><Data Name="LogonType">5</Data>'
+                        '<Data Name="ProcessName">C:\\Windows\\System32\\services.exe</Data>')
+            f.write(
+                '<Event xmlns="http://schemas.microsoft.com/win/2004/08/events/event"><System>'
+                '<Provider Name="Microsoft-Windows-Security-Auditing" Guid="{54849625-5478-4994-a5ba-3e3b0328c30d}"/>'
+                f'<EventID>{event_id}</EventID><Level>0</Level>'
+                f'<TimeCreated SystemTime="{to_system_time(when)}"/>'
+                f'<EventRecordID>{first_record + i}</EventRecordID>'
+                '<Channel>Security</Channel><Computer>DESKTOP-TEST</Computer></System>'
+                f'<EventData>{data}</EventData></Event>\n'
+            )
+        f.write('</Events>\n')
+    return when
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    camera_filter = EventFilter(providers={'Microsoft-Windows-Security-Auditing'},
+                                event_ids={4656, 4663}, keywords=r'camera|webcam|video')
+    since = datetime.now() - timedelta(days=7)
+
+    with tempfile.TemporaryDirectory() as folder:
+        log_path = os.path.join(folder, 'Security.xml')
+        build_fixture(log_path, events=50000)
+        size_mb = os.path.getsize(log_path) / 1024 / 1024
+
+        # Load-everything-then-filter, the way Get-WinEvent | Where-Object works
+        start = time.perf_counter()
+        tree = ET.parse(log_path)
+        ns = '{http://schemas.microsoft.com/win/2004/08/events/event}'
+        slow = [e for e in tree.getroot()
+                if int(e.find(f'{ns}System/{ns}EventID').text) in (4656, 4663)
+                and parse_system_time(e.find(f'{ns}System/{ns}TimeCreated').get('SystemTime')) >= since]
+        full_time = time.perf_counter() - start
+        del tree
+
+        bookmarks = EventBookmarks(os.path.join(folder, 'bookmarks.json'))
+        start = time.perf_counter()
+        records, stats = scan_source(log_path, camera_filter, since, bookmarks)
+        stream_time = time.perf_counter() - start
+        bookmarks.save()
+
+        print(f"{size_mb:.1f} MB export, {stats['events']:,} events")
+        print(f"  Parse everything, then filter: {full_time * 1000:.0f} ms ({len(slow)} matches)")
+        print(f"  Streaming with early filter:   {stream_time * 1000:.0f} ms ({len(records)} matches)")
+
+        # Second run: append 1000 newer events and only those get kept
+        last = build_fixture(log_path, events=1000, match_every=100,
+                             start=datetime.now() - timedelta(hours=1), days=1 / 24, first_record=50001)
+        bookmarks = EventBookmarks(os.path.join(folder, 'bookmarks.json'))
+        records, stats = scan_source(log_path, camera_filter, since, bookmarks)
+        print(f"  Next run with a bookmark: {stats['matched']} new matches, "
+              f"{len(records)} in the last 7 days in total")
@@ -0,0 +1,225 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Allowlists programs by what they are (path + SHA-256, plus code-signing
+# signer on Windows) instead of by process name. Hashes are cached on disk by a stat
+# fingerprint (size, mtime, inode), so a file is only hashed again when it changes.
+
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from powershell_pool import run_powershell, ps_quote
+
+
+def normalize_path(path):
+    """Lowercase, single-separator form of a path for comparisons."""
+    return os.path.normcase(os.path.abspath(path)).replace('\\', '/').lower()
+
+
+def stat_fingerprint(path):
+    """Cheap 'has this file changed?' fingerprint. Returns None if the file can't be read."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+
+def sha256_file(path):
+    """Hash a file in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_signer(path):
+    """Get the Authenticode signer subject for a file (Windows only). Returns None if unsigned."""
+    if sys.platform != 'win32':
+        return None
+    try:
+        output = run_powershell(
+            f'$s = Get-AuthenticodeSignature -LiteralPath {ps_quote(path)}; '
+            f'if ($s.Status -eq "Valid") {{ $s.SignerCertificate.Subject }}',
+            timeout=15
+        )
+        return output.strip() or None
+    except OSError:  # Includes timeouts and PowerShell not being available
+        return None
+
+
+class HashCache:
+    """
+    Persistent path -> (fingerprint, sha256, signer) cache.
+
+    The first sighting of an executable pays for a full hash (and a signature check
+    on Windows). After that, verification is a single os.stat() as long as the file's
+    size, mtime and inode haven't changed.
+
+    The scanner, the response worker and the prompt thread all use the same cache, so
+    `lock` guards the entries and saving. Hashing happens outside it, so one thread
+    hashing a large file doesn't hold up the others.
+    """
+
+    def __init__(self, path=None, check_signatures=True):
+        self.path = path
+        self.check_signatures = check_signatures
+        self.lock = threading.RLock()
+        self.entries = {}
+        self.dirty = False
+        self.stats = {'hits': 0, 'hashed': 0}
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.entries = {}
+
+    def save(self):
+        """Write the cache to disk if anything changed."""
+        with self.lock:
+            if not self.path or not self.dirty:
+                return
+            tmp_path = self.path + '.tmp'
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.entries, f)
+                os.replace(tmp_path, self.path)
+                self.dirty = False
+            except OSError as e:
+                print(f"⚠️ Could not save hash cache: {e}")
+
+    def identity(self, exe_path):
+        """Return {'path', 'sha256', 'signer'} for an executable, or None if unreadable."""
+        key = normalize_path(exe_path)
+        fingerprint = stat_fingerprint(exe_path)
+        if fingerprint is None:
+            return None
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry['fingerprint'] == fingerprint:
+                self.stats['hits'] += 1
+                return {'path': key, 'sha256': entry['sha256'], 'signer': entry['signer']}
+
+        try:
+            sha256 = sha256_file(exe_path)
+        except OSError:
+            return None
+        signer = get_signer(exe_path) if self.check_signatures else None
+        entry = {
+            'fingerprint': fingerprint, 'sha256': sha256, 'signer': signer,
+            'hashed_at': time.time()
+        }
+        with self.lock:
+            self.entries[key] = entry
+            self.dirty = True
+            self.stats['hashed'] += 1
+
+        return {'path': key, 'sha256': entry['sha256'], 'signer': entry['signer']}
+
+
+class ExecutableAllowlist:
+    """
+    Allowlist of executables by identity.
+
+    Each rule is a dict with any of 'sha256', 'signer' and 'path', plus a 'name' for
+    display. Every field a rule sets has to match, and a rule must set 'sha256' or
+    'signer' - a path alone proves nothing. Example rules:
+        {"name": "Chrome", "signer": "CN=Google LLC, O=Google LLC, ..."}
+        {"name": "My sync tool", "path": "C:/Tools/sync.exe", "sha256": "ab12..."}
+
+    trust() runs on the prompt thread while the scanner calls match(), so `lock` guards
+    the rules, their indexes and saving.
+    """
+
+    def __init__(self, rules_path=None, cache_path=None, check_signatures=True):
+        self.rules_path = rules_path
+        self.lock = threading.RLock()
+        self.rules = []
+        self.by_hash = {}
+        self.by_signer = {}
+        self.cache = HashCache(cache_path, check_signatures)
+        self.load()
+
+    def load(self):
+        if not self.rules_path or not os.path.exists(self.rules_path):
+            return
+        try:
+            with open(self.rules_path, 'r') as f:
+                rules = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ Could not load allowlist {self.rules_path}: {e}")
+            return
+        with self.lock:
+            self.rules = [r for r in rules if r.get('sha256') or r.get('signer')]
+            self._index()
+
+    def _index(self):
+        # Hash-keyed rules are found with one dict lookup, signer rules with another
+        self.by_hash = {}
+        self.by_signer = {}
+        for rule in self.rules:
+            if rule.get('sha256'):
+                self.by_hash.setdefault(rule['sha256'].lower(), []).append(rule)
+            else:
+                self.by_signer.setdefault(rule['signer'], []).append(rule)
+
+    def save(self):
+        with self.lock:
+            if not self.rules_path:
+                return
+            tmp_path = self.rules_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.rules, f, indent=2)
+            os.replace(tmp_path, self.rules_path)
+
+    @staticmethod
+    def _rule_matches(rule, identity):
+        if rule.get('sha256') and rule['sha256'].lower() != identity['sha256']:
+            return False
+        if rule.get('signer') and rule['signer'] != identity['signer']:
+            return False
+        if rule.get('path') and normalize_path(rule['path']) != identity['path']:
+            return False
+        return True
+
+    def match(self, exe_path):
+        """Return the matching rule for an executable, or None."""
+        if not exe_path or not self.rules:
+            return None
+        identity = self.cache.identity(exe_path)
+        if identity is None:
+            return None
+
+        with self.lock:
+            candidates = self.by_hash.get(identity['sha256'], [])
+            if identity['signer']:
+                candidates = candidates + self.by_signer.get(identity['signer'], [])
+            for rule in candidates:
+                if self._rule_matches(rule, identity):
+                    return rule
+        return None
+
+    def trust(self, exe_path, name=None, pin_path=True):
+        """Add a rule for an executable's current hash (and path, if pin_path)."""
+        identity = self.cache.identity(exe_path)
+        if identity is None:
+            raise OSError(f"Cannot read {exe_path}")
+        rule = {'name': name or os.path.basename(exe_path), 'sha256': identity['sha256']}
+        if pin_path:
+            rule['path'] = identity['path']
+        with self.lock:
+            self.rules.append(rule)
+            self._index()
+            self.save()
+        self.cache.save()
+        return rule
@@ -0,0 +1,554 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Agent/collector mode for security_scanner and cmdline_monitor. Agents batch
+# their findings and stream them, zlib-compressed, over TCP or a Unix socket to a collector,
+# which aggregates them across hosts (e.g. one remote IP contacted from 40 machines, or the
+# same unsigned parent executable everywhere). The collector listens on loopback by default;
+# listening on other addresses needs a shared secret, which signs every frame with HMAC-SHA256.
+
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import random
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+
+DEFAULT_PORT = 47800
+DEFAULT_LISTEN = f'127.0.0.1:{DEFAULT_PORT}'
+
+# Shared secret for agents and collector (FINDINGS_SECRET in the environment), None for none
+SHARED_SECRET = os.environ.get('FINDINGS_SECRET') or None
+
+# Frame on the wire: 4-byte big-endian length, then the HMAC-SHA256 of the rest (only with a
+# secret), then zlib(JSON {"host", "sent", "events"})
+FRAME_HEADER = struct.Struct('>I')
+TAG_SIZE = hashlib.sha256().digest_size
+MAX_FRAME = 16 * 1024 * 1024
+MAX_BATCH = 16 * 1024 * 1024  # Decompressed size limit, so a small frame can't inflate to gigabytes
+MAX_HOST_NAME = 255
+
+
+def parse_address(address):
+    """
+    'host:port' -> ('tcp', (host, port)); 'unix:/path/to.sock' -> ('unix', path).
+    IPv6 hosts are written '[::1]:port', or just '::1' for the default port.
+    """
+    if isinstance(address, tuple):
+        return 'tcp', address
+    if address.startswith('unix:'):
+        return 'unix', address[5:]
+    if address.startswith('['):
+        host, _, rest = address[1:].partition(']')
+        port = rest[1:] if rest.startswith(':') else ''
+    elif address.count(':') > 1:
+        host, port = address, ''  # Bare IPv6 literal
+    else:
+        host, sep, port = address.rpartition(':')
+        if not sep and not port.isdigit():
+            host, port = port, ''  # Host name without a port
+    return 'tcp', (host or '127.0.0.1', int(port) if port else DEFAULT_PORT)
+
+
+def format_address(host, port):
+    """The reverse of parse_address() for TCP addresses."""
+    return f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+
+
+def connect(address, timeout=5.0):
+    kind, target = parse_address(address)
+    if kind == 'unix':
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET6 if ':' in target[0] else socket.AF_INET,
+                             socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(target)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _sign(secret, data):
+    return hmac.new(secret.encode('utf-8') if isinstance(secret, str) else secret, data, hashlib.sha256).digest()
+
+
+def encode_batch(host, events, secret=None):
+    payload = zlib.compress(json.dumps(
+        {'host': host, 'sent': time.time(), 'events': events}, separators=(',', ':')
+    ).encode('utf-8'), 6)
+    if secret:
+        payload = _sign(secret, payload) + payload
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+def decode_batch(payload, secret=None, limit=MAX_BATCH):
+    """
+    The batch in a frame's payload. Raises ValueError if the signature doesn't match (with
+    a secret), the data inflates past `limit` bytes, or it isn't valid JSON.
+    """
+    if secret:
+        tag, payload = payload[:TAG_SIZE], payload[TAG_SIZE:]
+        if not hmac.compare_digest(tag, _sign(secret, payload)):
+            raise ValueError("Bad signature")
+    inflater = zlib.decompressobj()
+    data = inflater.decompress(payload, limit)
+    if inflater.unconsumed_tail or not inflater.eof:
+        raise ValueError(f"Batch is truncated or inflates past {limit:,} bytes")
+    return json.loads(data)
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def valid_batch(batch):
+    """True if a decoded batch has the shape agents send: a host name and a list of flat findings."""
+    return (isinstance(batch, dict)
+            and isinstance(batch.get('host'), str) and 0 < len(batch['host']) <= MAX_HOST_NAME
+            and isinstance(batch.get('events'), list)
+            and all(isinstance(event, dict) and all(isinstance(v, _SCALARS) for v in event.values())
+                    for event in batch['events']))
+
+
+def is_loopback(address):
+    """True for Unix sockets and loopback TCP addresses (what's safe without a secret)."""
+    kind, target = parse_address(address)
+    if kind == 'unix':
+        return True
+    if target[0] == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(target[0]).is_loopback
+    except ValueError:
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Findings: compact dicts built from each tool's results
+# ---------------------------------------------------------------------------
+
+def scanner_finding(process_info, sha256=None, signed=None):
+    """Turn a security_scanner process_info dict into a compact finding."""
+    return {
+        'kind': 'net', 'time': time.time(),
+        'name': process_info['name'], 'exe': process_info.get('exe') or None,
+        'sha256': sha256, 'signed': signed,
+        'remote_ip': process_info['remote_ip'], 'remote_port': process_info['remote_port'],
+        'blocklist': process_info.get('blocklist_hit'),
+        'sensitive': bool(process_info.get('accessing_sensitive')),
+        'bulk': bool(process_info.get('bulk_upload')),
+    }
+
+
+def cmdline_finding(instance):
+    """Turn a cmdline_monitor instance dict into a compact finding about its parent."""
+    parent = instance.get('parent') or {}
+    check = instance.get('malware_check') or {}
+    signature = check.get('signature') or {}
+    return {
+        'kind': 'cmdline', 'time': time.time(),
+        'name': parent.get('name'), 'exe': parent.get('exe'),
+        'sha256': (check.get('hash') or {}).get('sha256'),
+        # 'Unknown' means the check couldn't run (e.g. no PowerShell), not that it's unsigned
+        'signed': signature.get('signed') if signature.get('status', 'Unknown') != 'Unknown' else None,
+        'child': instance['cmdline_process'],
+        'command': instance['command_running'][:200],
+        'risk': check.get('risk_level'),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Agent
+# ---------------------------------------------------------------------------
+
+class Agent:
+    """
+    Sends findings to a collector without ever blocking the scanner.
+
+    send() appends to an in-memory buffer. A sender thread ships the buffer in
+    batches of up to `batch_size` every `flush_interval` seconds (sooner when a full
+    batch is waiting), reconnecting with backoff if the collector goes away. While
+    disconnected, at most `max_buffer` findings are kept and the oldest are dropped.
+    """
+
+    def __init__(self, address, host=None, batch_size=500, flush_interval=1.0,
+                 max_buffer=100000, secret=SHARED_SECRET):
+        self.address = address
+        self.secret = secret
+        self.host = host or socket.gethostname()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = deque(maxlen=max_buffer)
+        self.wakeup = threading.Event()
+        self.sock = None
+        self.running = False
+        self.thread = None
+        self.stats = {'sent': 0, 'batches': 0, 'bytes': 0, 'errors': 0}
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self.thread = threading.Thread(target=self._sender, name='findings-agent', daemon=True)
+            self.thread.start()
+        return self
+
+    def send(self, finding):
+        """Queue a finding. Never blocks."""
+        self.buffer.append(finding)
+        if len(self.buffer) >= self.batch_size:
+            self.wakeup.set()
+
+    def flush(self, timeout=10.0):
+        """Wait until everything queued so far has been sent (or timeout). Returns True if empty."""
+        deadline = time.monotonic() + timeout
+        self.wakeup.set()
+        while self.buffer and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return not self.buffer
+
+    def stop(self, timeout=5.0):
+        self.flush(timeout)
+        self.running = False
+        self.wakeup.set()
+        if self.thread:
+            self.thread.join(timeout)
+        self._close()
+
+    def _close(self):
+        if self.sock is not None:
+            try:
+                self.sock.close()
+            except OSError:
+                pass
+            self.sock = None
+
+    def _sender(self):
+        batch = []
+        retry_delay = 0.5
+        while self.running:
+            if not batch:
+                self.wakeup.wait(self.flush_interval)
+                self.wakeup.clear()
+            while len(batch) < self.batch_size and self.buffer:
+                batch.append(self.buffer.popleft())
+            if not batch:
+                continue
+            try:
+                if self.sock is None:
+                    self.sock = connect(self.address)
+                frame = encode_batch(self.host, batch, self.secret)
+                self.sock.sendall(frame)
+                self.stats['sent'] += len(batch)
+                self.stats['batches'] += 1
+                self.stats['bytes'] += len(frame)
+                batch = []
+                retry_delay = 0.5
+            except OSError:
+                # Keep the batch and try again once the collector is back
+                self.stats['errors'] += 1
+                self._close()
+                time.sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, 30)
+
+
+# ---------------------------------------------------------------------------
+# Collector
+# ---------------------------------------------------------------------------
+
+class Indicator:
+    """Everything the collector knows about one value (an IP, a hash) across hosts."""
+    __slots__ = ('hosts', 'events', 'first_seen', 'last_seen', 'names', 'alerted')
+
+    def __init__(self, now):
+        self.hosts = {}        # host -> last seen
+        self.events = 0
+        self.first_seen = now
+        self.last_seen = now
+        self.names = set()     # A few program names seen with it, for display
+        self.alerted = False
+
+
+# Each index pulls one value out of a finding; findings without it aren't indexed
+INDEXES = {
+    'remote_ip': lambda e: e.get('remote_ip'),
+    'unsigned_hash': lambda e: e.get('sha256') if e.get('sha256') and e.get('signed') is False else None,
+    'exe_name': lambda e: (e.get('name') or '').lower() or None,
+}
+
+
+class Aggregator:
+    """
+    In-memory, indexed view of findings from every host.
+
+    Each index maps a value to an Indicator holding the hosts that reported it, so
+    "how many machines talked to 198.51.100.7?" is one dict lookup. `on_spread` is
+    called once per indicator when it is first seen on `spread_hosts` hosts. Each
+    index keeps at most `max_indicators` values, dropping the least recently seen.
+    """
+
+    def __init__(self, spread_hosts=5, on_spread=None, max_indicators=200000):
+        self.spread_hosts = spread_hosts
+        self.on_spread = on_spread
+        self.max_indicators = max_indicators
+        self.indexes = {name: OrderedDict() for name in INDEXES}
+        self.hosts = {}  # host -> {'last_seen', 'events'}
+        self.events = 0
+        self.lock = threading.Lock()
+
+    def ingest(self, host, events):
+        now = time.time()
+        spread = []
+        with self.lock:
+            info = self.hosts.setdefault(host, {'last_seen': now, 'events': 0})
+            info['last_seen'] = now
+            info['events'] += len(events)
+            self.events += len(events)
+
+            for name, extract in INDEXES.items():
+                index = self.indexes[name]
+                for event in events:
+                    value = extract(event)
+                    if value is None:
+                        continue
+                    indicator = index.get(value)
+                    if indicator is None:
+                        indicator = index[value] = Indicator(now)
+                        if len(index) > self.max_indicators:
+                            index.popitem(last=False)
+                    else:
+                        index.move_to_end(value)
+                    indicator.hosts[host] = now
+                    indicator.events += 1
+                    indicator.last_seen = now
+                    if len(indicator.names) < 5 and event.get('name'):
+                        indicator.names.add(event['name'])
+                    if not indicator.alerted and len(indicator.hosts) >= self.spread_hosts:
+                        indicator.alerted = True
+                        spread.append((name, value, len(indicator.hosts)))
+
+        if self.on_spread:
+            for name, value, host_count in spread:
+                self.on_spread(name, value, host_count)
+
+    def widespread(self, index, min_hosts=2, limit=20):
+        """Values in an index reported by at least `min_hosts` hosts, most widespread first."""
+        with self.lock:
+            rows = [(value, len(ind.hosts), ind.events, sorted(ind.names))
+                    for value, ind in self.indexes[index].items() if len(ind.hosts) >= min_hosts]
+        rows.sort(key=lambda row: (-row[1], -row[2]))
+        return rows[:limit]
+
+    def hosts_for(self, index, value):
+        with self.lock:
+            indicator = self.indexes[index].get(value)
+            return sorted(indicator.hosts) if indicator else []
+
+    def expire(self, max_age):
+        """Forget hosts that haven't re-reported a value in `max_age` seconds."""
+        cutoff = time.time() - max_age
+        with self.lock:
+            for index in self.indexes.values():
+                for value in [v for v, ind in index.items() if ind.last_seen < cutoff]:
+                    del index[value]
+                for indicator in index.values():
+                    for host in [h for h, seen in indicator.hosts.items() if seen < cutoff]:
+                        del indicator.hosts[host]
+
+
+class _FrameHandler(socketserver.BaseRequestHandler):
+    def _read_exact(self, size):
+        data = bytearray()
+        while len(data) < size:
+            chunk = self.request.recv(min(size - len(data), 1024 * 1024))
+            if not chunk:
+                return None
+            data += chunk
+        return bytes(data)
+
+    def handle(self):
+        collector = self.server.collector
+        while True:
+            header = self._read_exact(FRAME_HEADER.size)
+            if header is None:
+                return
+            (length,) = FRAME_HEADER.unpack(header)
+            if length > MAX_FRAME:
+                return  # Not one of our agents
+            payload = self._read_exact(length)
+            if payload is None:
+                return
+            try:
+                batch = decode_batch(payload, collector.secret)
+            except (zlib.error, ValueError):
+                collector.stats['bad_frames'] += 1
+                return  # Drop the connection: its sender isn't a (working) agent of ours
+            if not valid_batch(batch):
+                collector.stats['bad_frames'] += 1
+                continue
+            collector.stats['frames'] += 1
+            collector.stats['bytes'] += FRAME_HEADER.size + length
+            collector.aggregator.ingest(batch['host'], batch['events'])
+
+
+class _TcpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _TcpServer6(_TcpServer):
+    address_family = socket.AF_INET6
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:
+    _UnixServer = None
+
+
+class Collector:
+    """
+    Accepts agent connections (one thread each) and feeds their batches into an Aggregator.
+    Anything other than loopback or a Unix socket needs a `secret`, so frames from hosts
+    that don't know it are dropped before they are decompressed.
+    """
+
+    def __init__(self, address=DEFAULT_LISTEN, aggregator=None, secret=SHARED_SECRET):
+        if not secret and not is_loopback(address):
+            raise ValueError(f"Listening on {address} needs a shared secret (set FINDINGS_SECRET)")
+        self.aggregator = aggregator or Aggregator()
+        self.secret = secret
+        self.stats = {'frames': 0, 'bytes': 0, 'bad_frames': 0}
+        kind, target = parse_address(address)
+        if kind == 'unix':
+            if _UnixServer is None:
+                raise OSError("Unix sockets are not supported on this platform")
+            if os.path.exists(target):
+                os.remove(target)
+            self.server = _UnixServer(target, _FrameHandler)
+        else:
+            server = _TcpServer6 if ':' in target[0] else _TcpServer
+            self.server = server(target, _FrameHandler)
+        self.server.collector = self
+        self.thread = None
+
+    @property
+    def address(self):
+        """The bound address in parse_address() form (useful after binding to port 0)."""
+        bound = self.server.server_address
+        if isinstance(bound, str):
+            return 'unix:' + bound
+        return format_address(bound[0], bound[1])
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='collector', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def print_summary(self, min_hosts=2):
+        agg = self.aggregator
+        print(f"\n📊 {agg.events:,} findings from {len(agg.hosts)} host(s)")
+        titles = {'remote_ip': 'Remote IPs', 'unsigned_hash': 'Unsigned executables (SHA-256)',
+                  'exe_name': 'Program names'}
+        for index, title in titles.items():
+            rows = agg.widespread(index, min_hosts, limit=10)
+            if rows:
+                print(f"\n  {title} seen on {min_hosts}+ hosts:")
+                for value, hosts, events, names in rows:
+                    label = value[:16] + '...' if index == 'unsigned_hash' else value
+                    print(f"    {label:<40} {hosts:>4} hosts {events:>8,} events  {', '.join(names)}")
+
+
+def simulate(agents=40, events_per_agent=5000, address='127.0.0.1:0'):
+    """
+    Load-test a collector on loopback with simulated agents. Most findings are unique to
+    each host, but one IP and one unsigned hash show up everywhere. Returns events/sec.
+    """
+    collector = Collector(address, Aggregator(spread_hosts=agents)).start()
+    shared_ip, shared_hash = '203.0.113.66', 'ab' * 32
+
+    def run_agent(n):
+        rng = random.Random(n)
+        agent = Agent(collector.address, host=f"sim-{n:03d}", flush_interval=0.05).start()
+        for i in range(events_per_agent):
+            # Every agent runs the same unsigned 'updater.exe' talking to one IP now and
+            # then; everything else is per-host noise
+            if i % 100 == 0:
+                name, sha256, ip = 'updater.exe', shared_hash, shared_ip
+            else:
+                name = f'app{rng.randrange(50)}-{n}.exe'
+                sha256 = f"{n:032x}{rng.randrange(200):032x}"
+                ip = f"198.{18 + n % 2}.{n // 2 % 256}.{rng.randrange(256)}"
+            agent.send({'kind': 'net', 'time': time.time(), 'name': name, 'exe': None,
+                        'sha256': sha256, 'signed': False, 'remote_ip': ip, 'remote_port': 443,
+                        'blocklist': None, 'sensitive': False, 'bulk': False})
+        agent.stop()
+
+    total = agents * events_per_agent
+    start = time.perf_counter()
+    threads = [threading.Thread(target=run_agent, args=(n,)) for n in range(agents)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    while collector.aggregator.events < total and time.perf_counter() - start < 60:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    rate = collector.aggregator.events / elapsed
+    print(f"  {collector.aggregator.events:,}/{total:,} findings from {agents} agents in "
+          f"{elapsed:.2f}s ({rate:,.0f}/s, {collector.stats['bytes'] / 1024:,.0f} KB on the wire)")
+    collector.print_summary(min_hosts=agents)
+    collector.stop()
+    return rate
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("       FINDINGS COLLECTOR")
+    print("=" * 60)
+    print("\nOptions:")
+    print("  1. Run collector")
+    print("  2. Loopback load test with simulated agents")
+    print("  3. Exit")
+
+    choice = input("\nSelect option (1-3): ").strip()
+
+    if choice == '1':
+        address = input(f"Listen address (host:port or unix:/path, default {DEFAULT_LISTEN}): ").strip()
+        try:
+            collector = Collector(
+                address or DEFAULT_LISTEN,
+                Aggregator(on_spread=lambda index, value, hosts:
+                           print(f"🚨 {index} {value} now seen on {hosts} hosts"))
+            ).start()
+        except ValueError as e:
+            print(f"⚠️ {e}")
+            sys.exit(1)
+        print(f"📡 Collecting on {collector.address} - Ctrl+C for a summary and exit")
+        try:
+            while True:
+                time.sleep(60)
+                collector.print_summary()
+        except KeyboardInterrupt:
+            collector.print_summary()
+            collector.stop()
+    elif choice == '2':
+        simulate()
+    else:
+        print("Exiting...")
+        sys.exit(0)
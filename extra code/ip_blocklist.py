@@ -0,0 +1,307 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Loads large IP/CIDR threat lists (millions of entries) into sorted integer
+# range arrays and checks a whole connection table against them at once. Lists are
+# reloaded automatically when their file changes on disk.
+
+import os
+import socket
+import time
+from array import array
+from bisect import bisect_right
+
+from ip_classifier import parse_ip
+
+# Optional: numpy makes membership tests vectorized (falls back to bisect without it)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def parse_blocklist_line(line):
+    """
+    Parse one threat-list line into (version, start, end) or None.
+    Accepts '1.2.3.4', '1.2.3.0/24', '2001:db8::/32' and '1.2.3.4-1.2.3.9' ranges.
+    Anything after '#' or ';' is a comment, and extra columns after whitespace are ignored.
+    """
+    line = line.split('#', 1)[0].split(';', 1)[0].strip()
+    if not line:
+        return None
+    line = line.split()[0].split(',')[0]
+
+    if '-' in line:
+        first, last = line.split('-', 1)
+        version, start = parse_ip(first.strip())
+        end_version, end = parse_ip(last.strip())
+        if start is None or end is None or version != end_version or end < start:
+            return None
+        return version, start, end
+
+    prefix_len = None
+    if '/' in line:
+        line, prefix = line.split('/', 1)
+        if not prefix.isdigit():
+            return None
+        prefix_len = int(prefix)
+
+    version, value = parse_ip(line)
+    if value is None:
+        return None
+
+    # IPv4-mapped IPv6 CIDRs come back from parse_ip as IPv4
+    bits = 32 if version == 4 else 128
+    if prefix_len is not None and ':' in line and version == 4:
+        prefix_len -= 96
+    if prefix_len is None:
+        prefix_len = bits
+    if not 0 <= prefix_len <= bits:
+        return None
+
+    host_bits = bits - prefix_len
+    start = (value >> host_bits) << host_bits
+    return version, start, start | ((1 << host_bits) - 1)
+
+
+def merge_ranges(starts, ends):
+    """Sort ranges by start and merge overlapping/adjacent ones. Returns (starts, ends) lists."""
+    merged_starts = []
+    merged_ends = []
+    for start, end in sorted(zip(starts, ends)):
+        if merged_ends and start <= merged_ends[-1] + 1:
+            if end > merged_ends[-1]:
+                merged_ends[-1] = end
+        else:
+            merged_starts.append(start)
+            merged_ends.append(end)
+    return merged_starts, merged_ends
+
+
+def merge_ranges_numpy(starts, ends):
+    """Vectorized merge_ranges() for IPv4, used when numpy is available."""
+    starts = np.frombuffer(starts, dtype=np.uint32).astype(np.int64)
+    ends = np.frombuffer(ends, dtype=np.uint32).astype(np.int64)
+    if not len(starts):
+        return np.array([], dtype=np.uint32), np.array([], dtype=np.uint32)
+
+    order = np.argsort(starts, kind='stable')
+    starts = starts[order]
+    reach = np.maximum.accumulate(ends[order])
+
+    # A new merged range begins wherever a start isn't covered by everything before it
+    new_group = np.ones(len(starts), dtype=bool)
+    new_group[1:] = starts[1:] > reach[:-1] + 1
+    first = np.flatnonzero(new_group)
+    last = np.append(first[1:] - 1, len(starts) - 1)
+
+    return starts[first].astype(np.uint32), reach[last].astype(np.uint32)
+
+
+class RangeTable:
+    """
+    Sorted, non-overlapping [start, end] ranges for one address family.
+
+    IPv4 ranges are two uint32 arrays (8 bytes per range). IPv6 ranges are stored
+    as 16-byte big-endian strings, which sort the same way as the numbers they hold
+    (32 bytes per range). Single addresses and CIDRs that touch are merged on load.
+    """
+
+    def __init__(self, version, starts=(), ends=()):
+        self.version = version
+
+        if version == 4:
+            starts = array('I', starts)
+            ends = array('I', ends)
+            if NUMPY_AVAILABLE:
+                self.starts, self.ends = merge_ranges_numpy(starts, ends)
+            else:
+                merged_starts, merged_ends = merge_ranges(starts, ends)
+                self.starts = array('I', merged_starts)
+                self.ends = array('I', merged_ends)
+        else:
+            merged_starts, merged_ends = merge_ranges(starts, ends)
+            self.starts = [v.to_bytes(16, 'big') for v in merged_starts]
+            self.ends = [v.to_bytes(16, 'big') for v in merged_ends]
+            if NUMPY_AVAILABLE:
+                self.starts = np.array(self.starts, dtype='S16')
+                self.ends = np.array(self.ends, dtype='S16')
+
+        self.count = len(self.starts)
+
+    def _key(self, value):
+        return value if self.version == 4 else value.to_bytes(16, 'big')
+
+    def contains(self, value):
+        """Check if one integer address falls inside any range."""
+        if not self.count:
+            return False
+        key = self._key(value)
+        idx = bisect_right(self.starts, key) - 1
+        return idx >= 0 and key <= self.ends[idx]
+
+    def contains_many(self, values):
+        """Check a batch of integer addresses. Returns a list of bools."""
+        if not self.count or not values:
+            return [False] * len(values)
+
+        if not NUMPY_AVAILABLE:
+            return [self.contains(v) for v in values]
+
+        dtype = np.uint32 if self.version == 4 else 'S16'
+        keys = np.array([self._key(v) for v in values], dtype=dtype)
+        idx = np.searchsorted(self.starts, keys, side='right') - 1
+        safe_idx = np.clip(idx, 0, self.count - 1)
+        return ((idx >= 0) & (keys <= self.ends[safe_idx])).tolist()
+
+    def nbytes(self):
+        """Approximate memory used by the range arrays."""
+        if NUMPY_AVAILABLE:
+            return self.starts.nbytes + self.ends.nbytes
+        if self.version == 4:
+            return self.starts.itemsize * len(self.starts) * 2
+        return 32 * self.count
+
+
+class Blocklist:
+    """One threat-list file compiled into IPv4 and IPv6 range tables."""
+
+    def __init__(self, path, name=None):
+        self.path = path
+        self.name = name or os.path.basename(path)
+        self.fingerprint = None
+        self.tables = {4: RangeTable(4), 6: RangeTable(6)}
+        self.entries = 0
+        self.load_seconds = 0.0
+
+    def _file_fingerprint(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def load(self):
+        """(Re)compile the list from disk."""
+        start_time = time.perf_counter()
+        starts = {4: array('I'), 6: []}
+        ends = {4: array('I'), 6: []}
+        entries = 0
+        inet_pton = socket.inet_pton
+        from_bytes = int.from_bytes
+
+        with open(self.path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                # Fast path for the common "a.b.c.d" / "a.b.c.d/nn" lines
+                addr, _, prefix = line.strip().partition('/')
+                try:
+                    value = from_bytes(inet_pton(socket.AF_INET, addr), 'big')
+                    host_bits = 32 - int(prefix) if prefix else 0
+                    if not 0 <= host_bits <= 32:
+                        continue
+                    start = (value >> host_bits) << host_bits
+                    starts[4].append(start)
+                    ends[4].append(start | ((1 << host_bits) - 1))
+                    entries += 1
+                    continue
+                except (OSError, ValueError):
+                    pass
+
+                parsed = parse_blocklist_line(line)
+                if parsed:
+                    version, start, end = parsed
+                    starts[version].append(start)
+                    ends[version].append(end)
+                    entries += 1
+
+        self.tables = {v: RangeTable(v, starts[v], ends[v]) for v in (4, 6)}
+        self.entries = entries
+        self.fingerprint = self._file_fingerprint()
+        self.load_seconds = time.perf_counter() - start_time
+
+    def refresh(self):
+        """Reload the list if the file changed since the last load. Returns True if reloaded."""
+        fingerprint = self._file_fingerprint()
+        if fingerprint is None or fingerprint == self.fingerprint:
+            return False
+        self.load()
+        return True
+
+    def contains_many(self, parsed_ips):
+        """Check (version, value) pairs against this list. Returns a list of bools."""
+        hits = [False] * len(parsed_ips)
+        for version in (4, 6):
+            positions = [i for i, (v, _) in enumerate(parsed_ips) if v == version]
+            if not positions:
+                continue
+            values = [parsed_ips[i][1] for i in positions]
+            for i, hit in zip(positions, self.tables[version].contains_many(values)):
+                hits[i] = hit
+        return hits
+
+    def nbytes(self):
+        return self.tables[4].nbytes() + self.tables[6].nbytes()
+
+
+class BlocklistSet:
+    """A group of threat lists checked together. Each hit reports the list that matched."""
+
+    def __init__(self, paths=()):
+        self.blocklists = [Blocklist(path) for path in paths]
+
+    def refresh(self):
+        """Reload any list whose file changed. Returns the names of lists that were reloaded."""
+        reloaded = []
+        for blocklist in self.blocklists:
+            try:
+                if blocklist.refresh():
+                    reloaded.append(blocklist.name)
+            except OSError:
+                continue  # Keep the last good copy if the file is mid-write or gone
+        return reloaded
+
+    def match_many(self, ips):
+        """Check address strings against every list. Returns the matching list name or None per IP."""
+        ips = list(ips)
+        matches = [None] * len(ips)
+        if not self.blocklists or not ips:
+            return matches
+
+        parsed = [parse_ip(ip) for ip in ips]
+        for blocklist in self.blocklists:
+            for i, hit in enumerate(blocklist.contains_many(parsed)):
+                if hit and matches[i] is None and parsed[i][1] is not None:
+                    matches[i] = blocklist.name
+        return matches
+
+    def match(self, ip):
+        """Check one address string. Returns the matching list name or None."""
+        return self.match_many([ip])[0]
+
+    def summary(self):
+        """Entry counts, range counts and memory use per list."""
+        return [{
+            'name': b.name,
+            'entries': b.entries,
+            'ranges': b.tables[4].count + b.tables[6].count,
+            'bytes': b.nbytes(),
+            'load_seconds': b.load_seconds,
+        } for b in self.blocklists]
+
+
+if __name__ == "__main__":
+    path = input("Path to IP/CIDR threat list: ").strip()
+    blocklists = BlocklistSet([path])
+    blocklists.refresh()
+
+    for info in blocklists.summary():
+        per_entry = info['bytes'] / info['entries'] if info['entries'] else 0
+        print(f"\n  Loaded {info['entries']:,} entries as {info['ranges']:,} ranges "
+              f"in {info['load_seconds']:.2f}s ({info['bytes']:,} bytes, {per_entry:.1f} bytes/entry)")
+
+    while True:
+        ip = input("\nIP address to check (blank line to exit): ").strip()
+        if not ip:
+            break
+        hit = blocklists.match(ip)
+        print(f"  🔴 Listed in {hit}" if hit else "  ✅ Not listed")
@@ -0,0 +1,239 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Classifies IPv4/IPv6 addresses (loopback, private, CGNAT, link-local, ...)
+# with a binary radix trie over integer addresses. Loads the IANA special-purpose
+# registries plus any number of user allowlist/denylist networks.
+
+import ipaddress
+import os
+import socket
+
+# IANA IPv4 Special-Purpose Address Registry (RFC 6890 and updates).
+# Only blocks that are NOT globally reachable are listed.
+SPECIAL_PURPOSE_V4 = [
+    ('0.0.0.0/8', 'this-network'),
+    ('10.0.0.0/8', 'private'),
+    ('100.64.0.0/10', 'cgnat'),
+    ('127.0.0.0/8', 'loopback'),
+    ('169.254.0.0/16', 'link-local'),
+    ('172.16.0.0/12', 'private'),
+    ('192.0.0.0/24', 'ietf-protocol'),
+    ('192.0.2.0/24', 'documentation'),
+    ('192.88.99.0/24', 'reserved'),
+    ('192.168.0.0/16', 'private'),
+    ('198.18.0.0/15', 'benchmarking'),
+    ('198.51.100.0/24', 'documentation'),
+    ('203.0.113.0/24', 'documentation'),
+    ('224.0.0.0/4', 'multicast'),
+    ('240.0.0.0/4', 'reserved'),
+    ('255.255.255.255/32', 'broadcast'),
+]
+
+# IANA IPv6 Special-Purpose Address Registry (RFC 6890 and updates).
+# IPv4-mapped addresses (::ffff:0:0/96) are classified as the IPv4 address they carry.
+SPECIAL_PURPOSE_V6 = [
+    ('::/128', 'unspecified'),
+    ('::1/128', 'loopback'),
+    ('64:ff9b:1::/48', 'nat64-local'),
+    ('100::/64', 'discard'),
+    ('2001::/23', 'ietf-protocol'),
+    ('2001:2::/48', 'benchmarking'),
+    ('2001:db8::/32', 'documentation'),
+    ('3fff::/20', 'documentation'),
+    ('5f00::/16', 'srv6'),
+    ('fc00::/7', 'unique-local'),
+    ('fe80::/10', 'link-local'),
+    ('fec0::/10', 'reserved'),
+    ('ff00::/8', 'multicast'),
+]
+
+ALLOW = 'allowlist'
+DENY = 'denylist'
+INVALID = 'invalid'
+
+# Labels that still count as "external" when matched
+EXTERNAL_LABELS = {None, DENY}
+
+
+class CidrTrie:
+    """
+    A binary radix trie keyed on the bits of an integer address.
+
+    Nodes live in parallel lists (zero child, one child, label, priority) instead of
+    one object per node, which keeps millions of prefixes cheap to hold. Child
+    index 0 means "no child" because the root is never anyone's child.
+    """
+
+    def __init__(self, bits):
+        self.bits = bits
+        self._zero = [0]
+        self._one = [0]
+        self._label = [None]
+        self._priority = [-1]
+
+    def __len__(self):
+        return len(self._label)
+
+    def insert(self, value, prefix_len, label, priority=0):
+        """Store a label for value/prefix_len. Higher priority wins on equal prefixes."""
+        node = 0
+        for shift in range(self.bits - 1, self.bits - 1 - prefix_len, -1):
+            children = self._one if (value >> shift) & 1 else self._zero
+            child = children[node]
+            if not child:
+                child = len(self._label)
+                self._zero.append(0)
+                self._one.append(0)
+                self._label.append(None)
+                self._priority.append(-1)
+                children[node] = child
+            node = child
+
+        if priority >= self._priority[node]:
+            self._label[node] = label
+            self._priority[node] = priority
+
+    def longest_match(self, value):
+        """Return the label of the longest stored prefix containing value (or None)."""
+        zero, one, labels = self._zero, self._one, self._label
+        node = 0
+        best = labels[0]
+        shift = self.bits - 1
+
+        while shift >= 0:
+            node = one[node] if (value >> shift) & 1 else zero[node]
+            if not node:
+                break
+            if labels[node] is not None:
+                best = labels[node]
+            shift -= 1
+
+        return best
+
+
+def _read_network_entries(entries):
+    """Expand a list of CIDRs and/or file paths (one CIDR per line) into CIDR strings."""
+    if isinstance(entries, str):
+        entries = [entries]
+
+    for entry in entries:
+        entry = entry.strip()
+        if not entry or entry.startswith('#'):
+            continue
+        if os.path.isfile(entry):
+            with open(entry, 'r') as f:
+                for line in f:
+                    line = line.split('#', 1)[0].strip()
+                    if line:
+                        yield line
+        else:
+            yield entry
+
+
+def parse_ip(ip):
+    """Turn an address string into (version, integer). Returns (None, None) if invalid."""
+    try:
+        ip = ip.split('%', 1)[0]  # Strip IPv6 zone ids like fe80::1%eth0
+        if ':' in ip:
+            value = int.from_bytes(socket.inet_pton(socket.AF_INET6, ip), 'big')
+            if value >> 32 == 0xFFFF:
+                return 4, value & 0xFFFFFFFF  # IPv4-mapped
+            return 6, value
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, ip), 'big')
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None, None
+
+
+class IpClassifier:
+    """
+    Compiled classifier for IPv4 and IPv6 addresses.
+
+    Lookups walk at most 32 (IPv4) or 128 (IPv6) trie levels, no matter how many
+    networks are loaded. User lists beat the registries on equal-length prefixes,
+    and the denylist beats the allowlist.
+    """
+
+    def __init__(self, allowlist=(), denylist=(), include_registries=True):
+        self.tries = {4: CidrTrie(32), 6: CidrTrie(128)}
+
+        if include_registries:
+            for cidr, label in SPECIAL_PURPOSE_V4 + SPECIAL_PURPOSE_V6:
+                self.add(cidr, label, priority=0)
+
+        self.load(allowlist, ALLOW, priority=1)
+        self.load(denylist, DENY, priority=2)
+
+    def add(self, cidr, label, priority=0):
+        """Add one network (e.g. '10.0.0.0/8' or '2001:db8::/32') with a label."""
+        network = ipaddress.ip_network(cidr, strict=False)
+        value = int(network.network_address)
+        prefix_len = network.prefixlen
+
+        if network.version == 6 and value >> 32 == 0xFFFF and prefix_len >= 96:
+            # ::ffff:a.b.c.d/N is really an IPv4 network
+            self.tries[4].insert(value & 0xFFFFFFFF, prefix_len - 96, label, priority)
+        else:
+            self.tries[network.version].insert(value, prefix_len, label, priority)
+
+    def load(self, entries, label, priority=1):
+        """Load CIDRs (or files of CIDRs) under one label. Returns how many were added."""
+        count = 0
+        for cidr in _read_network_entries(entries):
+            try:
+                self.add(cidr, label, priority)
+                count += 1
+            except ValueError:
+                continue  # Skip junk lines instead of failing the whole list
+        return count
+
+    def classify(self, ip):
+        """Return the label for an address: a registry label, 'allowlist', 'denylist',
+        'invalid', or None for an ordinary public address."""
+        version, value = parse_ip(ip)
+        if value is None:
+            return INVALID
+        return self.tries[version].longest_match(value)
+
+    def is_external(self, ip):
+        """Check if an address is external (public, or forced external by the denylist)."""
+        return self.classify(ip) in EXTERNAL_LABELS
+
+    def classify_many(self, ips):
+        """Classify a batch of addresses at once. Repeated addresses are only looked up once."""
+        seen = {}
+        labels = []
+        for ip in ips:
+            if ip not in seen:
+                seen[ip] = self.classify(ip)
+            labels.append(seen[ip])
+        return labels
+
+    def is_external_many(self, ips):
+        """Batch version of is_external()."""
+        return [label in EXTERNAL_LABELS for label in self.classify_many(ips)]
+
+    def classify_connections(self, connections):
+        """
+        Classify a whole connection table in one call.
+        Takes psutil-style connections (or (pid, conn) pairs) and returns
+        {remote_ip: label} for every connection with a remote address.
+        """
+        ips = []
+        for conn in connections:
+            if isinstance(conn, tuple) and len(conn) == 2:
+                conn = conn[1]
+            if conn.raddr:
+                ips.append(conn.raddr.ip)
+        return dict(zip(ips, self.classify_many(ips)))
+
+
+if __name__ == "__main__":
+    classifier = IpClassifier()
+    print("\nIP Classifier - enter addresses to classify (blank line to exit)")
+    while True:
+        ip = input("\nIP address: ").strip()
+        if not ip:
+            break
+        label = classifier.classify(ip)
+        print(f"  Label: {label or 'public'}")
+        print(f"  External: {'Yes' if classifier.is_external(ip) else 'No'}")
@@ -0,0 +1,254 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Adds context to the remote IPs security_scanner reports: ASN, organization
+# and country from a local range database (imported from a CSV dump such as iptoasn.com's
+# ip2asn files), plus reverse DNS from a background resolver with an LRU+TTL cache.
+
+import csv
+import socket
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from ip_classifier import parse_ip
+
+
+class TtlLruCache:
+    """A thread-safe LRU cache where every entry also expires after a TTL."""
+
+    def __init__(self, max_size=10000, ttl=3600):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] < time.monotonic():
+                del self.entries[key]
+                return default
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value, ttl=None):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return self.get(key, self) is not self
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class AsnDatabase:
+    """
+    IP range -> (ASN, country, organization) lookups with binary search.
+
+    Ranges are kept in sorted start/end arrays per address family (uint32 for IPv4,
+    16-byte big-endian strings for IPv6). ASNs live in a parallel array, and country
+    and organization names are interned into small string tables referenced by index,
+    so a few hundred thousand ranges take a few MB.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.strings = []
+        self.string_ids = {}
+        self.size = 0
+
+    def _intern(self, text):
+        index = self.string_ids.get(text)
+        if index is None:
+            index = self.string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return index
+
+    def import_csv(self, path):
+        """
+        Import a CSV/TSV dump with columns: range_start, range_end, asn, country, organization.
+        Rows with ASN 0 ("not routed") are skipped. Returns the number of ranges loaded.
+        """
+        rows = {4: [], 6: []}
+
+        with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+            sample = f.read(4096)
+            f.seek(0)
+            delimiter = '\t' if sample.count('\t') > sample.count(',') else ','
+
+            for row in csv.reader(f, delimiter=delimiter):
+                if len(row) < 5 or row[0].startswith('#'):
+                    continue
+                version, start = parse_ip(row[0].strip())
+                end_version, end = parse_ip(row[1].strip())
+                if start is None or version != end_version or not row[2].strip().isdigit():
+                    continue  # Header row or junk
+                asn = int(row[2])
+                if asn == 0:
+                    continue
+                rows[version].append((start, end, asn,
+                                      self._intern(row[3].strip()), self._intern(row[4].strip())))
+
+        for version, entries in rows.items():
+            entries.sort()
+            if version == 4:
+                starts = array('I', (e[0] for e in entries))
+                ends = array('I', (e[1] for e in entries))
+            else:
+                starts = [e[0].to_bytes(16, 'big') for e in entries]
+                ends = [e[1].to_bytes(16, 'big') for e in entries]
+            self.tables[version] = (
+                starts, ends,
+                array('I', (e[2] for e in entries)),
+                array('I', (e[3] for e in entries)),
+                array('I', (e[4] for e in entries)),
+            )
+
+        self.size = len(rows[4]) + len(rows[6])
+        return self.size
+
+    def lookup(self, ip):
+        """Return {'asn', 'country', 'org'} for an address, or None if it isn't in any range."""
+        version, value = parse_ip(ip)
+        table = self.tables.get(version)
+        if table is None:
+            return None
+
+        starts, ends, asns, countries, orgs = table
+        key = value if version == 4 else value.to_bytes(16, 'big')
+        idx = bisect_right(starts, key) - 1
+        if idx < 0 or key > ends[idx]:
+            return None
+        return {
+            'asn': asns[idx],
+            'country': self.strings[countries[idx]],
+            'org': self.strings[orgs[idx]],
+        }
+
+
+class StaticResolver:
+    """Offline stand-in for socket.gethostbyaddr, answering from a dict. Handy for tests and demos."""
+
+    def __init__(self, names=None, delay=0.0):
+        self.names = dict(names or {})
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, ip):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if ip not in self.names:
+            raise socket.herror(1, 'Unknown host')
+        return self.names[ip], [], [ip]
+
+
+class ReverseDnsResolver:
+    """
+    Reverse DNS that never blocks the caller.
+
+    lookup() answers from the cache straight away. On a miss it starts a background
+    lookup on a small thread pool and returns None (or waits up to `timeout` seconds
+    if asked). Failed lookups are cached too, for a shorter `negative_ttl`, so a dead
+    resolver isn't hammered every scan.
+    """
+
+    def __init__(self, resolve=socket.gethostbyaddr, workers=4, ttl=3600,
+                 negative_ttl=300, max_size=10000):
+        self.resolve = resolve
+        self.cache = TtlLruCache(max_size, ttl)
+        self.negative_ttl = negative_ttl
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rdns')
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def _resolve(self, ip):
+        try:
+            hostname = self.resolve(ip)[0]
+            self.cache.put(ip, hostname)
+        except (OSError, socket.herror, socket.gaierror, UnicodeError):
+            self.cache.put(ip, '', ttl=self.negative_ttl)
+        finally:
+            with self.lock:
+                self.in_flight.pop(ip, None)
+
+    def prefetch(self, ip):
+        """Start resolving an address in the background if it isn't cached or in flight."""
+        if ip in self.cache:
+            return None
+        with self.lock:
+            future = self.in_flight.get(ip)
+            if future is None:
+                future = self.in_flight[ip] = self.pool.submit(self._resolve, ip)
+        return future
+
+    def lookup(self, ip, timeout=0):
+        """Return the hostname for an address, '' if it has none, or None if not resolved yet."""
+        cached = self.cache.get(ip)
+        if cached is not None:
+            return cached
+
+        future = self.prefetch(ip)
+        if future is not None and timeout:
+            try:
+                future.result(timeout)
+            except Exception:
+                pass
+        return self.cache.get(ip)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False)
+
+
+class Enricher:
+    """Combines the ASN database and reverse DNS into one enrich() call for scanner alerts."""
+
+    def __init__(self, asn_db=None, resolver=None):
+        self.asn_db = asn_db
+        self.resolver = resolver if resolver is not None else ReverseDnsResolver()
+
+    def prefetch(self, ips):
+        """Kick off reverse DNS for a batch of addresses without waiting."""
+        for ip in ips:
+            self.resolver.prefetch(ip)
+
+    def enrich(self, process_info, timeout=0):
+        """Add 'hostname', 'asn', 'org' and 'country' to a scanner process_info dict."""
+        ip = process_info['remote_ip']
+        info = self.asn_db.lookup(ip) if self.asn_db else None
+        process_info['asn'] = info['asn'] if info else None
+        process_info['org'] = info['org'] if info else None
+        process_info['country'] = info['country'] if info else None
+        process_info['hostname'] = self.resolver.lookup(ip, timeout) or None
+        return process_info
+
+
+if __name__ == "__main__":
+    db_path = input("Path to ASN CSV/TSV dump (blank to skip): ").strip()
+    asn_db = None
+    if db_path:
+        asn_db = AsnDatabase()
+        start = time.perf_counter()
+        count = asn_db.import_csv(db_path)
+        print(f"  Loaded {count:,} ranges in {time.perf_counter() - start:.2f}s")
+
+    enricher = Enricher(asn_db)
+    while True:
+        ip = input("\nIP address (blank line to exit): ").strip()
+        if not ip:
+            break
+        info = enricher.enrich({'remote_ip': ip}, timeout=3)
+        print(f"  Hostname: {info['hostname'] or 'Unknown'}")
+        if info['asn']:
+            print(f"  AS{info['asn']} {info['org']} ({info['country']})")
+        else:
+            print("  Not found in ASN database")
@@ -0,0 +1,170 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Fast "is this file under a sensitive directory?" checks for security_scanner.
+# Sensitive roots and glob patterns are compiled into a trie of normalized path components,
+# so each open file is matched in a single walk of its path.
+
+import fnmatch
+import os
+import re
+import time
+from collections import OrderedDict
+
+GLOB_CHARS = re.compile(r'[*?\[]')
+
+
+def split_path(path):
+    """Normalize a path into lowercase components ('C:\\Users\\Me' -> ['c:', 'users', 'me'])."""
+    path = os.path.expanduser(str(path)).replace('\\', '/').lower()
+    return [part for part in path.split('/') if part and part != '.']
+
+
+class _Node:
+    __slots__ = ('children', 'globs', 'root', 'any_depth')
+
+    def __init__(self):
+        self.children = {}     # exact component -> _Node
+        self.globs = []        # (compiled pattern, _Node) for components like '*' or 'wallet*'
+        self.root = None       # set when a configured root/pattern ends here
+        self.any_depth = None  # _Node reached through a '**' component
+
+
+class PathIndex:
+    """
+    Trie of sensitive directory roots and glob patterns.
+
+    Roots match themselves and anything below them ('~/Documents' matches
+    '~/Documents/taxes/2025.pdf'). Components can use fnmatch globs ('*', '?',
+    '[abc]'), and '**' matches any number of directories. Results are memoized
+    per path in a bounded LRU, since processes keep reopening the same files.
+    """
+
+    def __init__(self, roots=(), max_cache=50000):
+        self.trie = _Node()
+        self.max_cache = max_cache
+        self.cache = OrderedDict()
+        self.size = 0
+        for root in roots:
+            self.add(root)
+
+    def add(self, root):
+        """Add a sensitive directory root or glob pattern."""
+        node = self.trie
+        for part in split_path(root):
+            if part == '**':
+                if node.any_depth is None:
+                    node.any_depth = _Node()
+                node = node.any_depth
+            elif GLOB_CHARS.search(part):
+                pattern = re.compile(fnmatch.translate(part))
+                for existing, child in node.globs:
+                    if existing.pattern == pattern.pattern:
+                        node = child
+                        break
+                else:
+                    child = _Node()
+                    node.globs.append((pattern, child))
+                    node = child
+            else:
+                node = node.children.setdefault(part, _Node())
+
+        if node.root is None:
+            node.root = root
+            self.size += 1
+        self.cache.clear()
+
+    def _walk(self, node, parts, i):
+        """Return the first configured root matching parts[i:] from this node."""
+        while True:
+            if node.root is not None:
+                return node.root
+
+            if node.any_depth is not None:
+                # '**' can swallow zero or more components
+                for j in range(i, len(parts) + 1):
+                    match = self._walk(node.any_depth, parts, j)
+                    if match:
+                        return match
+
+            if i >= len(parts):
+                return None
+
+            part = parts[i]
+            for pattern, child in node.globs:
+                if pattern.match(part):
+                    match = self._walk(child, parts, i + 1)
+                    if match:
+                        return match
+
+            node = node.children.get(part)
+            if node is None:
+                return None
+            i += 1
+
+    def match(self, path):
+        """Return the sensitive root a path falls under, or None."""
+        cached = self.cache.get(path, False)
+        if cached is not False:
+            self.cache.move_to_end(path)
+            return cached
+
+        result = self._walk(self.trie, split_path(path), 0)
+        self.cache[path] = result
+        if len(self.cache) > self.max_cache:
+            self.cache.popitem(last=False)
+        return result
+
+    def match_any(self, paths):
+        """Return the first (path, root) where a path is sensitive, or None."""
+        for path in paths:
+            root = self.match(path)
+            if root:
+                return path, root
+        return None
+
+    def __len__(self):
+        return self.size
+
+
+class OpenFilesCache:
+    """
+    Caches each process's open-file list across scan cycles.
+
+    psutil's open_files() is one of the most expensive per-process calls. The list
+    is only re-read when the process's fd/handle count changes or the entry is older
+    than `max_age` seconds. Entries are keyed by (pid, create_time) so a reused PID
+    never sees another process's files.
+    """
+
+    def __init__(self, max_age=120):
+        self.max_age = max_age
+        self.entries = {}  # (pid, create_time) -> (handle_count, timestamp, paths)
+
+    @staticmethod
+    def _handle_count(proc):
+        try:
+            if hasattr(proc, 'num_handles'):
+                return proc.num_handles()  # Windows
+            return proc.num_fds()
+        except Exception:
+            return None
+
+    def get(self, proc, create_time):
+        """Return the open file paths for a psutil.Process, using the cache when possible."""
+        key = (proc.pid, create_time)
+        handle_count = self._handle_count(proc)
+        now = time.monotonic()
+
+        entry = self.entries.get(key)
+        if entry and handle_count is not None and entry[0] == handle_count \
+                and now - entry[1] < self.max_age:
+            return entry[2]
+
+        paths = [f.path for f in proc.open_files()]
+        self.entries[key] = (handle_count, now, paths)
+        return paths
+
+    def expire(self, live_keys):
+        """Forget processes that weren't seen in the latest scan."""
+        for key in [k for k in self.entries if k not in live_keys]:
+            del self.entries[key]
@@ -0,0 +1,352 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: A pool of long-running PowerShell hosts for camera_monitor and cmdline_monitor.
+# Starting powershell.exe costs 0.3-2s, so instead of one process per command, a few hosts
+# stay alive and run scripts sent over stdin/stdout as one JSON object per line.
+# Hosts that crash or time out are replaced. The transport is pluggable, and FakeTransport
+# stands in for PowerShell on Linux for tests and benchmarks.
+
+import base64
+import itertools
+import json
+import queue
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+POOL_SIZE = 3
+START_TIMEOUT = 30
+
+# Runs inside each PowerShell host. Reads {"id", "script"} lines, runs each script in its
+# own scope and answers with one {"id", "ok", "output", "error"} line.
+HOST_SCRIPT = r'''
+$ErrorActionPreference = 'Continue'
+$ProgressPreference = 'SilentlyContinue'
+[Console]::InputEncoding = [Text.UTF8Encoding]::new($false)
+[Console]::OutputEncoding = [Text.UTF8Encoding]::new($false)
+[Console]::Out.WriteLine('{"id":0,"ok":true,"ready":true}')
+[Console]::Out.Flush()
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    if (-not $line.Trim()) { continue }
+    $request = $line | ConvertFrom-Json
+    $response = @{ id = $request.id; ok = $true; output = ''; error = $null }
+    try {
+        $response.output = (& ([scriptblock]::Create($request.script)) | Out-String -Width 4096)
+    } catch {
+        $response.ok = $false
+        $response.error = $_.Exception.Message
+    }
+    [Console]::Out.WriteLine(($response | ConvertTo-Json -Compress -Depth 2))
+    [Console]::Out.Flush()
+}
+'''
+
+
+class PowerShellError(OSError):
+    """A script failed, or a host couldn't be started or died mid-call."""
+
+
+class LineTransport:
+    """Base for transports: lines from the shell arrive on a queue so reads can time out."""
+
+    def __init__(self):
+        self.lines = queue.Queue()
+
+    def readline(self, timeout):
+        """Next line from the shell, None at EOF. Raises TimeoutError."""
+        try:
+            return self.lines.get(timeout=max(timeout, 0))
+        except queue.Empty:
+            raise TimeoutError("No response from shell") from None
+
+
+class SubprocessTransport(LineTransport):
+    """Talks to a real process over its stdin/stdout pipes."""
+
+    def __init__(self, argv):
+        super().__init__()
+        self.argv = argv
+        self.proc = None
+
+    def start(self):
+        flags = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+        self.proc = subprocess.Popen(
+            self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', errors='replace', bufsize=1, creationflags=flags
+        )
+        threading.Thread(target=self._reader, daemon=True, name='pwsh-reader').start()
+
+    def _reader(self):
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+
+    def send(self, line):
+        self.proc.stdin.write(line + '\n')
+        self.proc.stdin.flush()
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def close(self):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.kill()
+
+
+def powershell_transport():
+    """Transport for a real PowerShell host."""
+    encoded = base64.b64encode(HOST_SCRIPT.encode('utf-16-le')).decode('ascii')
+    exe = 'powershell' if sys.platform == 'win32' else 'pwsh'
+    return SubprocessTransport([exe, '-NoLogo', '-NoProfile', '-NonInteractive',
+                                '-EncodedCommand', encoded])
+
+
+class FakeShellCrash(Exception):
+    """Raise from a FakeTransport handler to make the fake host die."""
+
+
+class FakeTransport(LineTransport):
+    """
+    In-process stand-in for a PowerShell host, speaking the same protocol.
+
+    `handler(script)` returns the script's output (or raises: FakeShellCrash kills the
+    host, anything else is reported as a script error). `startup_delay` and
+    `call_delay` simulate PowerShell's start-up and per-call cost.
+    """
+
+    def __init__(self, handler, startup_delay=0.0, call_delay=0.0):
+        super().__init__()
+        self.handler = handler
+        self.startup_delay = startup_delay
+        self.call_delay = call_delay
+        self.inbox = queue.Queue()
+        self.running = False
+
+    def start(self):
+        time.sleep(self.startup_delay)
+        self.running = True
+        threading.Thread(target=self._serve, daemon=True, name='fake-shell').start()
+        self.lines.put('{"id":0,"ok":true,"ready":true}\n')
+
+    def _serve(self):
+        while self.running:
+            line = self.inbox.get()
+            if line is None:
+                break
+            request = json.loads(line)
+            time.sleep(self.call_delay)
+            response = {'id': request['id'], 'ok': True, 'output': '', 'error': None}
+            try:
+                response['output'] = self.handler(request['script'])
+            except FakeShellCrash:
+                break
+            except Exception as e:
+                response['ok'] = False
+                response['error'] = str(e)
+            self.lines.put(json.dumps(response) + '\n')
+        self.running = False
+        self.lines.put(None)
+
+    def send(self, line):
+        if not self.running:
+            raise BrokenPipeError("Fake shell is not running")
+        self.inbox.put(line)
+
+    def alive(self):
+        return self.running
+
+    def close(self):
+        self.running = False
+        self.inbox.put(None)
+
+
+class _Host:
+    """One running shell and the request ids sent to it."""
+
+    def __init__(self, transport, start_timeout):
+        self.transport = transport
+        self.ids = itertools.count(1)
+        transport.start()
+        self._wait_for(0, start_timeout)
+
+    def _wait_for(self, request_id, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            line = self.transport.readline(deadline - time.monotonic())
+            if line is None:
+                raise PowerShellError("PowerShell host exited")
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue  # Stray output (banner, warnings) - not part of the protocol
+            if isinstance(response, dict) and response.get('id') == request_id:
+                return response
+
+    def call(self, script, timeout):
+        request_id = next(self.ids)
+        self.transport.send(json.dumps({'id': request_id, 'script': script}))
+        return self._wait_for(request_id, timeout)
+
+    def close(self):
+        self.transport.close()
+
+
+class PowerShellPool:
+    """
+    Keeps up to `size` shell hosts alive and hands scripts to whichever is idle.
+
+    run() is thread-safe: concurrent callers each get their own host, and wait for
+    one to free up when all are busy. Hosts start lazily. A host that times out
+    (it's still busy with the script) or dies is thrown away and a new one is started
+    on the next call.
+    """
+
+    def __init__(self, size=POOL_SIZE, transport_factory=powershell_transport,
+                 start_timeout=START_TIMEOUT):
+        self.size = size
+        self.transport_factory = transport_factory
+        self.start_timeout = start_timeout
+        self.idle = queue.LifoQueue()  # Most recently used (warmest) host first
+        self.count = 0
+        self.lock = threading.Lock()
+        self.executor = None
+        self.stats = {'calls': 0, 'started': 0, 'replaced': 0, 'timeouts': 0}
+
+    def _acquire(self):
+        while True:
+            try:
+                return self.idle.get(timeout=0.05)
+            except queue.Empty:
+                pass
+            with self.lock:
+                if self.count >= self.size:
+                    continue
+                self.count += 1
+            try:
+                host = _Host(self.transport_factory(), self.start_timeout)
+            except Exception as e:
+                with self.lock:
+                    self.count -= 1
+                if isinstance(e, OSError):
+                    raise
+                raise PowerShellError(f"Could not start PowerShell host: {e}") from e
+            self.stats['started'] += 1
+            return host
+
+    def _discard(self, host):
+        host.close()
+        with self.lock:
+            self.count -= 1
+        self.stats['replaced'] += 1
+
+    def run(self, script, timeout=30):
+        """Run a script and return its output as text. Raises PowerShellError or TimeoutError."""
+        host = self._acquire()
+        self.stats['calls'] += 1
+        try:
+            response = host.call(script, timeout)
+        except TimeoutError:
+            self.stats['timeouts'] += 1
+            self._discard(host)
+            raise
+        except Exception:
+            self._discard(host)
+            raise
+        self.idle.put(host)
+        if not response.get('ok'):
+            raise PowerShellError(response.get('error') or "Script failed")
+        return response.get('output') or ''
+
+    def run_json(self, script, timeout=30):
+        """Run a script that ends in ConvertTo-Json and return the parsed value (None if empty)."""
+        output = self.run(script, timeout).strip()
+        if not output or output == 'null':
+            return None
+        return json.loads(output)
+
+    def submit(self, script, timeout=30, parse_json=False):
+        """Run a script on the pool in the background. Returns a concurrent.futures.Future."""
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='pwsh')
+        return self.executor.submit(self.run_json if parse_json else self.run, script, timeout)
+
+    def submit_json(self, script, timeout=30):
+        """Like submit(), but the Future's result is run_json()'s parsed value."""
+        return self.submit(script, timeout, parse_json=True)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The pool shared by every module in this process."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PowerShellPool()
+    return _pool
+
+
+def run_powershell(script, timeout=30):
+    """Run a script on the shared pool and return its output text."""
+    return get_pool().run(script, timeout)
+
+
+def ps_quote(value):
+    """
+    A value as a single-quoted PowerShell string literal, for putting paths and other data
+    into script text. Nothing inside single quotes is expanded ($var, $(...), backticks);
+    the only special characters are the quotes themselves, which are doubled. PowerShell
+    also treats the typographic quotes ‘ ’ ‚ ‛ as single quotes.
+    """
+    return "'" + re.sub("['‘’‚‛]", lambda m: m.group(0) * 2, str(value)) + "'"
+
+
+def as_list(data):
+    """ConvertTo-Json gives a bare object for one result and null for none; always get a list."""
+    if data is None:
+        return []
+    return data if isinstance(data, list) else [data]
+
+
+if __name__ == "__main__":
+    # Compare one-process-per-call with the pool, using a fake shell that takes 0.5s
+    # to start (like powershell.exe) and 20ms per script
+    def handler(script):
+        return json.dumps({'Echo': script})
+
+    def fake():
+        return FakeTransport(handler, startup_delay=0.5, call_delay=0.02)
+
+    scripts = [f"Get-Thing {i}" for i in range(10)]
+
+    start = time.perf_counter()
+    for script in scripts:
+        PowerShellPool(1, fake).run(script)
+    spawn_time = time.perf_counter() - start
+
+    pool = PowerShellPool(3, fake)
+    pool.run('warm-up')
+    start = time.perf_counter()
+    futures = [pool.submit(script) for script in scripts]
+    results = [f.result() for f in futures]
+    pool_time = time.perf_counter() - start
+
+    print(f"10 scripts, new shell each time: {spawn_time:.2f}s")
+    print(f"10 scripts on a warm pool of 3:  {pool_time:.2f}s  ({pool.stats})")
@@ -0,0 +1,477 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Linux-native connection backend for security_scanner. Reads /proc/net/tcp
+# and /proc/net/tcp6 in bulk (or asks the kernel over NETLINK_SOCK_DIAG) and maps socket
+# inodes to PIDs with a cache that only re-walks the fds of processes it hasn't seen yet.
+
+import os
+import socket
+import struct
+import time
+from collections import namedtuple
+
+# Same shape as psutil's connection tuples so the scanner can use either backend
+Address = namedtuple('Address', ['ip', 'port'])
+Connection = namedtuple('Connection', ['family', 'laddr', 'raddr', 'status', 'inode'])
+
+# Kernel TCP state numbers (include/net/tcp_states.h) -> psutil status names
+TCP_STATES = {
+    1: 'ESTABLISHED',
+    2: 'SYN_SENT',
+    3: 'SYN_RECV',
+    4: 'FIN_WAIT1',
+    5: 'FIN_WAIT2',
+    6: 'TIME_WAIT',
+    7: 'CLOSE',
+    8: 'CLOSE_WAIT',
+    9: 'LAST_ACK',
+    10: 'LISTEN',
+    11: 'CLOSING',
+    12: 'NEW_SYN_RECV',
+}
+
+PROC_NET_FILES = [
+    ('/proc/net/tcp', socket.AF_INET),
+    ('/proc/net/tcp6', socket.AF_INET6),
+]
+
+# Netlink constants (linux/netlink.h, linux/sock_diag.h, linux/inet_diag.h)
+NETLINK_SOCK_DIAG = 4
+SOCK_DIAG_BY_FAMILY = 20
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLMSG_HEADER = struct.Struct('=IHHII')
+INET_DIAG_REQ_V2 = struct.Struct('=BBBBI')
+INET_DIAG_SOCKID = struct.Struct('>HH16s16s')
+INET_DIAG_MSG_TAIL = struct.Struct('=IIIII')  # expires, rqueue, wqueue, uid, inode
+INET_DIAG_MSG_SIZE = 72
+INET_DIAG_INFO = 2
+RTATTR_HEADER = struct.Struct('=HH')
+TCP_INFO_BYTES = struct.Struct('=QQ')  # tcpi_bytes_acked, tcpi_bytes_received
+TCP_INFO_BYTES_OFFSET = 120
+ALL_STATES = 0xFFFFFFFF
+
+
+def is_supported():
+    """Check whether this host exposes /proc/net/tcp (Linux only)."""
+    return os.path.exists('/proc/net/tcp')
+
+
+def parse_hex_address(hex_addr, family):
+    """Convert a /proc/net address like '0100007F:0050' into an Address."""
+    hex_ip, hex_port = hex_addr.split(':')
+    port = int(hex_port, 16)
+
+    if family == socket.AF_INET:
+        packed = struct.pack('<I', int(hex_ip, 16))
+    else:
+        # IPv6 is stored as four host-order 32-bit words
+        packed = b''.join(
+            struct.pack('<I', int(hex_ip[i:i + 8], 16)) for i in range(0, 32, 8)
+        )
+
+    return Address(socket.inet_ntop(family, packed), port)
+
+
+def read_proc_net(path, family, states=None):
+    """Parse one /proc/net/tcp{,6} file into a list of Connection tuples."""
+    connections = []
+
+    try:
+        with open(path, 'r') as f:
+            lines = f.read().splitlines()[1:]  # Skip the header line
+    except (FileNotFoundError, PermissionError, OSError):
+        return connections
+
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 10:
+            continue
+
+        status = TCP_STATES.get(int(fields[3], 16), 'NONE')
+        if states and status not in states:
+            continue
+
+        laddr = parse_hex_address(fields[1], family)
+        raddr = parse_hex_address(fields[2], family)
+        if raddr.port == 0:
+            raddr = ()  # psutil uses an empty tuple for "no remote address"
+
+        connections.append(Connection(family, laddr, raddr, status, int(fields[9])))
+
+    return connections
+
+
+def read_all_proc_net(states=None):
+    """Read every TCP socket on the system from /proc/net in one pass."""
+    connections = []
+    for path, family in PROC_NET_FILES:
+        connections.extend(read_proc_net(path, family, states))
+    return connections
+
+
+def established_fingerprint():
+    """
+    A hash of the ESTABLISHED rows of /proc/net/tcp{,6} (addresses and socket inode), taken
+    from the raw text: no address parsing and no inode -> PID mapping. It changes whenever
+    a connection opens or closes, and not for queue or timer updates on existing ones.
+    """
+    rows = []
+    for path, _ in PROC_NET_FILES:
+        try:
+            with open(path, 'r') as f:
+                next(f, None)  # Header
+                for line in f:
+                    fields = line.split()
+                    if len(fields) >= 10 and fields[3] == '01':  # 01 = ESTABLISHED
+                        rows.append((fields[1], fields[2], fields[9]))
+        except OSError:
+            continue
+    return hash(frozenset(rows))
+
+
+def _build_sock_diag_request(family, state_mask, seq, ext=0):
+    """Build an inet_diag_req_v2 dump request for one address family."""
+    sockid = INET_DIAG_SOCKID.pack(0, 0, b'\x00' * 16, b'\x00' * 16) + b'\x00' * 12
+    body = INET_DIAG_REQ_V2.pack(family, socket.IPPROTO_TCP, ext, 0, state_mask) + sockid
+    header = NLMSG_HEADER.pack(
+        NLMSG_HEADER.size + len(body), SOCK_DIAG_BY_FAMILY,
+        NLM_F_REQUEST | NLM_F_DUMP, seq, 0
+    )
+    return header + body
+
+
+def _parse_sock_diag_message(data, family):
+    """Parse one inet_diag_msg payload into a Connection."""
+    _, state = data[0], data[1]
+    sport, dport, src, dst = INET_DIAG_SOCKID.unpack_from(data, 4)
+    inode = INET_DIAG_MSG_TAIL.unpack_from(data, 4 + INET_DIAG_SOCKID.size + 12)[4]
+
+    addr_len = 4 if family == socket.AF_INET else 16
+    laddr = Address(socket.inet_ntop(family, src[:addr_len]), sport)
+    raddr = Address(socket.inet_ntop(family, dst[:addr_len]), dport)
+    if dport == 0:
+        raddr = ()
+
+    return Connection(family, laddr, raddr, TCP_STATES.get(state, 'NONE'), inode)
+
+
+def _state_mask(states):
+    """Turn a set of psutil status names into the kernel's state bitmask."""
+    if not states:
+        return ALL_STATES
+    numbers = {num for num, name in TCP_STATES.items() if name in states}
+    return sum(1 << num for num in numbers)
+
+
+def _sock_diag_dump(states=None, ext=0, timeout=2.0):
+    """
+    Dump every TCP socket over NETLINK_SOCK_DIAG.
+    Returns a list of (family, inet_diag_msg payload) pairs, or None if netlink isn't available.
+    """
+    state_mask = _state_mask(states)
+
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_SOCK_DIAG)
+    except (AttributeError, OSError):
+        return None
+
+    messages = []
+    try:
+        sock.settimeout(timeout)
+        for seq, family in enumerate((socket.AF_INET, socket.AF_INET6), 1):
+            sock.send(_build_sock_diag_request(family, state_mask, seq, ext))
+
+            done = False
+            while not done:
+                data = sock.recv(65536)
+                offset = 0
+                while offset + NLMSG_HEADER.size <= len(data):
+                    msg_len, msg_type, _, _, _ = NLMSG_HEADER.unpack_from(data, offset)
+                    if msg_len < NLMSG_HEADER.size:
+                        done = True
+                        break
+                    if msg_type == NLMSG_DONE:
+                        done = True
+                        break
+                    if msg_type == NLMSG_ERROR:
+                        return None
+                    if msg_type == SOCK_DIAG_BY_FAMILY:
+                        messages.append((family, data[offset + NLMSG_HEADER.size:offset + msg_len]))
+                    offset += (msg_len + 3) & ~3  # Messages are 4-byte aligned
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+    return messages
+
+
+def query_sock_diag(states=None, timeout=2.0):
+    """
+    Ask the kernel for every TCP socket over NETLINK_SOCK_DIAG.
+    Returns a list of Connection tuples, or None if netlink isn't available.
+    """
+    messages = _sock_diag_dump(states, timeout=timeout)
+    if messages is None:
+        return None
+
+    try:
+        return [_parse_sock_diag_message(payload, family) for family, payload in messages]
+    except struct.error:
+        return None
+
+
+def query_socket_counters(states=None, timeout=2.0):
+    """
+    Read per-socket byte counters (tcp_info bytes_acked / bytes_received, Linux 4.1+).
+    Returns {inode: (bytes_sent, bytes_received)}, or None if netlink isn't available.
+    """
+    messages = _sock_diag_dump(states, ext=1 << (INET_DIAG_INFO - 1), timeout=timeout)
+    if messages is None:
+        return None
+
+    counters = {}
+    for _, payload in messages:
+        try:
+            inode = INET_DIAG_MSG_TAIL.unpack_from(payload, 4 + INET_DIAG_SOCKID.size + 12)[4]
+
+            # Walk the netlink attributes after the fixed message looking for tcp_info
+            offset = INET_DIAG_MSG_SIZE
+            while offset + RTATTR_HEADER.size <= len(payload):
+                attr_len, attr_type = RTATTR_HEADER.unpack_from(payload, offset)
+                if attr_len < RTATTR_HEADER.size:
+                    break
+                info_len = attr_len - RTATTR_HEADER.size
+                if attr_type == INET_DIAG_INFO and info_len >= TCP_INFO_BYTES_OFFSET + TCP_INFO_BYTES.size:
+                    start = offset + RTATTR_HEADER.size + TCP_INFO_BYTES_OFFSET
+                    counters[inode] = TCP_INFO_BYTES.unpack_from(payload, start)
+                    break
+                offset += (attr_len + 3) & ~3
+        except struct.error:
+            continue
+
+    return counters
+
+
+def _read_start_time(pid):
+    """Read a process start time (clock ticks) so reused PIDs can be spotted."""
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        # The command name can contain spaces, so split after its closing paren
+        return int(stat[stat.rindex(b')') + 2:].split()[19])
+    except (FileNotFoundError, PermissionError, ProcessLookupError, ValueError, OSError):
+        return None
+
+
+class InodePidCache:
+    """
+    Maps socket inodes to the PID that owns them.
+
+    A full walk of /proc/*/fd reads a symlink for every open fd on the box, which is
+    what makes psutil slow on busy hosts. This cache remembers each PID's fd -> inode
+    table and, on refresh, only walks PIDs it hasn't seen before. Known PIDs are only
+    revisited (new fd numbers only) when a socket can't be resolved, and everything is
+    re-walked every `full_rescan_every` refreshes to drop stale fd reuse.
+
+    Without root, other users' fd folders can't be read, so their sockets never resolve.
+    Those PIDs are remembered with their start time and those inodes as unresolvable,
+    and neither is retried until the PID is replaced or the next full rescan - otherwise
+    every refresh would turn back into a walk of every PID. Start times are only re-read
+    for PIDs that own a socket being looked up, so reused PIDs still can't be misreported.
+    """
+
+    def __init__(self, full_rescan_every=20):
+        self.full_rescan_every = full_rescan_every
+        self.pid_fds = {}         # pid -> {fd: inode or None}
+        self.pid_starts = {}      # pid -> start time in clock ticks
+        self.unreadable = set()   # PIDs whose fd folder we aren't allowed to list
+        self.unresolved = set()   # Socket inodes no readable PID owned when last searched
+        self.inode_to_pid = {}
+        self.refresh_count = 0
+        self.stats = {'pids_walked': 0, 'fds_read': 0, 'starts_read': 0}
+
+    def _walk_pid(self, pid, only_new=False):
+        """Read the socket fds of one PID (optionally only fd numbers we haven't seen)."""
+        fd_dir = f'/proc/{pid}/fd'
+        known = self.pid_fds.get(pid, {}) if only_new else {}
+        fds = {}
+
+        try:
+            names = os.listdir(fd_dir)
+        except PermissionError:
+            self.unreadable.add(pid)
+            return
+        except (FileNotFoundError, ProcessLookupError, OSError):
+            return
+
+        self.stats['pids_walked'] += 1
+        for name in names:
+            if name in known:
+                fds[name] = known[name]
+                continue
+            try:
+                target = os.readlink(f'{fd_dir}/{name}')
+            except OSError:
+                continue
+            self.stats['fds_read'] += 1
+            # Non-socket fds are remembered as None so they aren't read again
+            fds[name] = int(target[8:-1]) if target.startswith('socket:[') else None
+
+        for inode in self.pid_fds.get(pid, {}).values():
+            if inode is not None and self.inode_to_pid.get(inode) == pid:
+                del self.inode_to_pid[inode]
+        self.pid_fds[pid] = fds
+        for inode in fds.values():
+            if inode is not None:
+                self.inode_to_pid[inode] = pid
+
+    def _forget_pid(self, pid):
+        """Drop everything we know about a PID that has exited."""
+        for inode in self.pid_fds.pop(pid, {}).values():
+            if inode is not None and self.inode_to_pid.get(inode) == pid:
+                del self.inode_to_pid[inode]
+        self.pid_starts.pop(pid, None)
+        self.unreadable.discard(pid)
+
+    def _start_changed(self, pid):
+        """Re-read a PID's start time; if it's a different process now, forget the old one."""
+        self.stats['starts_read'] += 1
+        start = _read_start_time(pid)
+        if self.pid_starts.get(pid) == start:
+            return False
+        self._forget_pid(pid)
+        self.pid_starts[pid] = start
+        return True
+
+    def refresh(self, wanted_inodes=()):
+        """Bring the cache up to date, doing as little fd walking as possible."""
+        self.refresh_count += 1
+        full_rescan = self.refresh_count % self.full_rescan_every == 0
+        wanted = set(wanted_inodes)
+
+        try:
+            current = {int(name) for name in os.listdir('/proc') if name.isdigit()}
+        except OSError:
+            return
+
+        for pid in set(self.pid_starts) - current:
+            self._forget_pid(pid)
+
+        if full_rescan:
+            self.unresolved.clear()
+            for pid in current:
+                self._forget_pid(pid)
+                self.stats['starts_read'] += 1
+                self.pid_starts[pid] = _read_start_time(pid)
+                self._walk_pid(pid)
+        else:
+            for pid in current - set(self.pid_starts):
+                self.stats['starts_read'] += 1
+                self.pid_starts[pid] = _read_start_time(pid)
+                self._walk_pid(pid)
+
+            # Make sure the PIDs we're about to report still are the processes we walked
+            for pid in {self.inode_to_pid[inode] for inode in wanted if inode in self.inode_to_pid}:
+                if self._start_changed(pid):
+                    self._walk_pid(pid)
+
+        # Sockets opened by processes we already knew about: look at new fds only
+        self.unresolved &= wanted
+        missing = {inode for inode in wanted if inode not in self.inode_to_pid} - self.unresolved
+        if missing and not full_rescan:
+            for pid in current:
+                if self._start_changed(pid):
+                    self._walk_pid(pid)
+                elif pid not in self.unreadable:
+                    self._walk_pid(pid, only_new=True)
+        self.unresolved |= {inode for inode in missing if inode not in self.inode_to_pid}
+
+    def lookup(self, inode):
+        """Return the PID owning a socket inode, or None if unknown."""
+        return self.inode_to_pid.get(inode)
+
+
+class ProcNetBackend:
+    """Connection table backed by /proc/net (or sock_diag) plus an InodePidCache."""
+
+    def __init__(self, use_sock_diag=False):
+        self.use_sock_diag = use_sock_diag
+        self.pid_cache = InodePidCache()
+
+    def read_connections(self, states=None):
+        """Read raw connections, preferring sock_diag when asked and available."""
+        if self.use_sock_diag:
+            connections = query_sock_diag(states)
+            if connections is not None:
+                return connections
+        return read_all_proc_net(states)
+
+    def connections(self, states=None):
+        """Return every TCP connection on the system as (pid, Connection) pairs."""
+        connections = self.read_connections(states)
+        # inode 0 means the socket has no owner any more (e.g. TIME_WAIT)
+        self.pid_cache.refresh(c.inode for c in connections if c.inode)
+        return [(self.pid_cache.lookup(c.inode), c) for c in connections]
+
+    def socket_counters(self, states=None):
+        """Per-socket (bytes_sent, bytes_received) keyed by inode, or None if unsupported."""
+        return query_socket_counters(states)
+
+
+def benchmark_backends(rounds=5, states=('ESTABLISHED',)):
+    """Time the psutil path against /proc/net and sock_diag and print the results."""
+    results = {}
+
+    def timed(name, func):
+        timings = []
+        count = 0
+        for _ in range(rounds):
+            start = time.perf_counter()
+            count = len(func())
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            'first_ms': timings[0] * 1000,
+            'best_ms': min(timings) * 1000,
+            'avg_ms': sum(timings) / len(timings) * 1000,
+            'connections': count,
+        }
+
+    try:
+        import psutil
+        timed('psutil.net_connections', lambda: psutil.net_connections(kind='tcp'))
+    except ImportError:
+        print("  ⚠️ psutil not installed - skipping psutil benchmark")
+    except psutil.AccessDenied:
+        print("  ⚠️ psutil.net_connections needs more privileges - skipping")
+
+    proc_backend = ProcNetBackend()
+    timed('/proc/net + inode cache', lambda: proc_backend.connections(states))
+
+    if query_sock_diag(states) is not None:
+        diag_backend = ProcNetBackend(use_sock_diag=True)
+        timed('sock_diag + inode cache', lambda: diag_backend.connections(states))
+    else:
+        print("  ⚠️ NETLINK_SOCK_DIAG not available - skipping sock_diag benchmark")
+
+    print("\n" + "=" * 80)
+    print(f"  CONNECTION BACKEND BENCHMARK ({rounds} rounds)")
+    print("=" * 80)
+    print(f"  {'Backend':<28}{'First (ms)':>12}{'Best (ms)':>12}{'Avg (ms)':>12}{'Conns':>10}")
+    print("-" * 80)
+    for name, r in results.items():
+        print(f"  {name:<28}{r['first_ms']:>12.2f}{r['best_ms']:>12.2f}{r['avg_ms']:>12.2f}{r['connections']:>10}")
+    print("=" * 80)
+
+    return results
+
+
+if __name__ == "__main__":
+    if not is_supported():
+        print("This backend needs Linux (/proc/net/tcp not found).")
+    else:
+        rounds = input("Benchmark rounds (default 5): ").strip()
+        benchmark_backends(int(rounds) if rounds.isdigit() else 5)
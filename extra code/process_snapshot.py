@@ -0,0 +1,163 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: One shared view of the process table for cmdline_monitor and security_scanner.
+# The table is walked once per tick, each process's static details (name, exe, command line,
+# parent) are read once with oneshot(), and later ticks only read processes that are new.
+
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+import psutil
+
+# Static details of one process. cmdline is None when it couldn't be read; exe is ''.
+ProcessRecord = namedtuple('ProcessRecord', ['pid', 'ppid', 'name', 'exe', 'create_time', 'cmdline'])
+
+
+def read_record(proc):
+    """Read a psutil.Process's static details in one oneshot() pass."""
+    with proc.oneshot():
+        name = proc.name()
+        create_time = proc.create_time()
+        ppid = proc.ppid()
+        try:
+            exe = proc.exe() or ''
+        except psutil.AccessDenied:
+            exe = ''
+        try:
+            cmdline = tuple(proc.cmdline())
+        except psutil.AccessDenied:
+            cmdline = None
+    return ProcessRecord(proc.pid, ppid, name, exe, create_time, cmdline)
+
+
+class ProcessSnapshot:
+    """An immutable view of the process table at one moment."""
+
+    def __init__(self, records, taken_at, stats):
+        self.records = MappingProxyType(records)  # pid -> ProcessRecord
+        self.taken_at = taken_at
+        self.stats = MappingProxyType(stats)
+
+    def get(self, pid):
+        return self.records.get(pid)
+
+    def parent(self, record):
+        """The parent's record, or None if it has exited (or the PID was reused since)."""
+        parent = self.records.get(record.ppid)
+        if parent is None or parent.pid == record.pid or parent.create_time > record.create_time:
+            return None
+        return parent
+
+    def with_names(self, names):
+        """Records whose lowercased name is in `names`."""
+        return [r for r in self.records.values() if r.name.lower() in names]
+
+    def __iter__(self):
+        return iter(self.records.values())
+
+    def __len__(self):
+        return len(self.records)
+
+
+class SnapshotService:
+    """
+    Publishes ProcessSnapshots, refreshing at most once every `max_age` seconds.
+
+    Every detector that asks within the same tick gets the same snapshot. A refresh
+    lists the PIDs, drops ones that are gone, re-checks survivors' create times (so a
+    reused PID is caught) and only does a full read for new processes. The psutil
+    Process objects are kept too, for detectors that need live data like open files.
+    """
+
+    def __init__(self, max_age=1.0):
+        self.max_age = max_age
+        self.current = None
+        self.procs = {}    # pid -> psutil.Process
+        self.records = {}  # pid -> ProcessRecord
+
+    def _read(self, pid):
+        proc = psutil.Process(pid)
+        record = read_record(proc)
+        self.procs[pid] = proc
+        self.records[pid] = record
+        return record
+
+    def refresh(self):
+        """Walk the process table now and publish a new snapshot."""
+        start = time.perf_counter()
+        stats = {'new': 0, 'reused': 0, 'exited': 0}
+        live = set(psutil.pids())
+
+        for pid in [p for p in self.records if p not in live]:
+            del self.records[pid]
+            self.procs.pop(pid, None)
+            stats['exited'] += 1
+
+        for pid in live:
+            record = self.records.get(pid)
+            try:
+                if record is not None:
+                    if psutil.Process(pid).create_time() == record.create_time:
+                        continue
+                    stats['reused'] += 1  # Same PID, different process
+                self._read(pid)
+                stats['new'] += 1
+            except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+                self.records.pop(pid, None)
+                self.procs.pop(pid, None)
+
+        stats['refresh_ms'] = (time.perf_counter() - start) * 1000
+        self.current = ProcessSnapshot(dict(self.records), time.monotonic(), stats)
+        return self.current
+
+    def snapshot(self):
+        """The current snapshot, refreshed first if it's older than max_age."""
+        if self.current is None or time.monotonic() - self.current.taken_at > self.max_age:
+            return self.refresh()
+        return self.current
+
+    def record(self, pid):
+        """
+        A process's record, even if it started after the current snapshot was taken.
+        Returns None if the process no longer exists.
+        """
+        record = self.snapshot().get(pid) or self.records.get(pid)
+        if record is not None:
+            return record
+        try:
+            return self._read(pid)  # Also picked up by the next refresh without a re-read
+        except (psutil.NoSuchProcess, psutil.ZombieProcess, psutil.AccessDenied):
+            return None
+
+    def process(self, pid):
+        """The cached psutil.Process for a PID (for live data like io_counters or open_files)."""
+        proc = self.procs.get(pid)
+        if proc is None:
+            return psutil.Process(pid)
+        return proc
+
+
+_shared_service = None
+
+
+def get_snapshot_service():
+    """The process-wide service, so every detector running here shares one walk per tick."""
+    global _shared_service
+    if _shared_service is None:
+        _shared_service = SnapshotService()
+    return _shared_service
+
+
+if __name__ == "__main__":
+    service = SnapshotService()
+    for tick in range(3):
+        snap = service.refresh()
+        print(f"Tick {tick + 1}: {len(snap)} processes in {snap.stats['refresh_ms']:.1f} ms "
+              f"({snap.stats['new']} read, {snap.stats['exited']} exited, {snap.stats['reused']} reused PIDs)")
+        time.sleep(1)
+
+    start = time.perf_counter()
+    count = sum(1 for _ in psutil.process_iter(['pid', 'name', 'exe', 'create_time', 'cmdline', 'ppid']))
+    print(f"For comparison, a full psutil.process_iter() walk: {count} processes in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
@@ -0,0 +1,196 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Direct registry reads for camera_monitor's CapabilityAccessManager checks.
+# WinRegistry reads the live registry through winreg (microseconds instead of a PowerShell
+# round trip) and FixtureRegistry is an in-memory registry, so the same logic runs and
+# can be benchmarked on Linux.
+
+import time
+from collections import namedtuple
+from datetime import datetime
+
+try:
+    import winreg
+    WINREG_AVAILABLE = True
+except ImportError:
+    WINREG_AVAILABLE = False
+
+CONSENT_STORE = r'SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore'
+
+# FILETIME counts 100ns ticks since 1601-01-01; this many ticks separate it from the Unix epoch
+FILETIME_UNIX_EPOCH = 116444736000000000
+
+
+def filetime_to_datetime(filetime):
+    """Convert a FILETIME integer to a local datetime (None for 0/missing/invalid)."""
+    if not filetime or filetime <= 0:
+        return None
+    try:
+        return datetime.fromtimestamp((filetime - FILETIME_UNIX_EPOCH) / 10_000_000)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def datetime_to_filetime(dt):
+    """The reverse of filetime_to_datetime (handy for building fixtures)."""
+    return int(dt.timestamp() * 10_000_000) + FILETIME_UNIX_EPOCH
+
+
+class WinRegistry:
+    """Reads the real Windows registry. Missing keys read as empty rather than raising."""
+
+    HIVES = {
+        'HKCU': 'HKEY_CURRENT_USER',
+        'HKLM': 'HKEY_LOCAL_MACHINE',
+    }
+
+    def _open(self, hive, path):
+        return winreg.OpenKey(getattr(winreg, self.HIVES[hive]), path, 0, winreg.KEY_READ)
+
+    def subkeys(self, hive, path):
+        try:
+            with self._open(hive, path) as key:
+                count = winreg.QueryInfoKey(key)[0]
+                return [winreg.EnumKey(key, i) for i in range(count)]
+        except OSError:
+            return []
+
+    def values(self, hive, path):
+        try:
+            with self._open(hive, path) as key:
+                count = winreg.QueryInfoKey(key)[1]
+                return {name: data for name, data, _ in
+                        (winreg.EnumValue(key, i) for i in range(count))}
+        except OSError:
+            return {}
+
+
+class FixtureRegistry:
+    """
+    An in-memory registry with the same interface as WinRegistry.
+
+    Keys are case-insensitive like the real thing. Build one with set():
+        reg = FixtureRegistry()
+        reg.set('HKCU', CONSENT_STORE + r'\\webcam', Value='Allow')
+    """
+
+    def __init__(self):
+        self.keys = {}  # (hive, lowercased path) -> {'values': {}, 'children': {lower: name}}
+
+    def _key(self, hive, path, create=False):
+        parts = [p for p in path.split('\\') if p]
+        lookup = (hive, '\\'.join(parts).lower())
+        if lookup in self.keys or not create:
+            return self.keys.get(lookup)
+        # Create every missing key along the way so subkeys() sees them
+        for depth in range(len(parts) + 1):
+            here = (hive, '\\'.join(parts[:depth]).lower())
+            if here not in self.keys:
+                self.keys[here] = {'values': {}, 'children': {}}
+                if depth:
+                    parent = (hive, '\\'.join(parts[:depth - 1]).lower())
+                    self.keys[parent]['children'][parts[depth - 1].lower()] = parts[depth - 1]
+        return self.keys[lookup]
+
+    def set(self, hive, path, **values):
+        """Create a key (and its parents) and set values on it."""
+        self._key(hive, path, create=True)['values'].update(values)
+
+    def subkeys(self, hive, path):
+        key = self._key(hive, path)
+        return list(key['children'].values()) if key else []
+
+    def values(self, hive, path):
+        key = self._key(hive, path)
+        return dict(key['values']) if key else {}
+
+
+def get_default_registry():
+    """The live registry on Windows, an empty fixture everywhere else."""
+    return WinRegistry() if WINREG_AVAILABLE else FixtureRegistry()
+
+
+# One app's entry in a capability's consent store
+ConsentEntry = namedtuple('ConsentEntry', [
+    'app',           # Executable path (desktop apps) or package family name (Store apps)
+    'type',          # 'Desktop App' or 'Store App'
+    'permission',    # 'Allow', 'Deny' or None
+    'last_used_start', 'last_used_stop',  # datetimes or None
+    'in_use',        # Started but not stopped yet
+])
+
+
+def _consent_entry(app, app_type, values):
+    start = values.get('LastUsedTimeStart') or 0
+    stop = values.get('LastUsedTimeStop') or 0
+    return ConsentEntry(
+        app, app_type, values.get('Value'),
+        filetime_to_datetime(start), filetime_to_datetime(stop),
+        start > 0 and stop == 0
+    )
+
+
+def read_consent_store(registry, capability='webcam', hive='HKCU'):
+    """
+    Read every app's entry for a capability ('webcam', 'microphone', 'location', ...)
+    in one pass over the Store-app keys and the NonPackaged (desktop app) keys.
+    """
+    root = f"{CONSENT_STORE}\\{capability}"
+    entries = []
+    for name in registry.subkeys(hive, root):
+        if name.lower() == 'nonpackagedapps':
+            nonpackaged = f"{root}\\{name}"
+            for app in registry.subkeys(hive, nonpackaged):
+                values = registry.values(hive, f"{nonpackaged}\\{app}")
+                # Desktop apps are stored with '#' in place of '\'
+                entries.append(_consent_entry(app.replace('#', '\\'), 'Desktop App', values))
+        else:
+            entries.append(_consent_entry(name, 'Store App', registry.values(hive, f"{root}\\{name}")))
+    return entries
+
+
+def read_capability_settings(registry, capability='webcam'):
+    """The system-wide (HKLM) and per-user (HKCU) switches for a capability."""
+    path = f"{CONSENT_STORE}\\{capability}"
+    return {
+        'GlobalAccess': registry.values('HKLM', path).get('Value'),
+        'UserAccess': registry.values('HKCU', path).get('Value'),
+    }
+
+
+def build_fixture(apps=200, in_use=2, seed_time=None):
+    """A FixtureRegistry shaped like a real webcam consent store, for tests and benchmarks."""
+    now = seed_time or datetime.now()
+    reg = FixtureRegistry()
+    root = f"{CONSENT_STORE}\\webcam"
+    reg.set('HKLM', root, Value='Allow')
+    reg.set('HKCU', root, Value='Allow')
+    base = datetime_to_filetime(now)
+    hour = 36_000_000_000
+    for i in range(apps):
+        start = base - (i + 1) * hour
+        stop = 0 if i < in_use else start + hour // 4
+        values = {'Value': 'Deny' if i % 7 == 0 else 'Allow',
+                  'LastUsedTimeStart': start, 'LastUsedTimeStop': stop}
+        if i % 3 == 0:
+            reg.set('HKCU', f"{root}\\Microsoft.App{i}_8wekyb3d8bbwe", **values)
+        else:
+            reg.set('HKCU', f"{root}\\NonPackagedApps\\C:#Program Files#App{i}#app{i}.exe", **values)
+    return reg
+
+
+if __name__ == "__main__":
+    registry = get_default_registry() if WINREG_AVAILABLE else build_fixture()
+    print(f"Reading the webcam consent store from the {'live registry' if WINREG_AVAILABLE else 'fixture'}...")
+
+    rounds = 200
+    start = time.perf_counter()
+    for _ in range(rounds):
+        entries = read_consent_store(registry)
+    per_read = (time.perf_counter() - start) / rounds
+
+    print(f"  {len(entries)} apps in {per_read * 1000:.2f} ms per read "
+          f"({per_read * 1e6 / max(len(entries), 1):.1f} µs per app)")
+    for entry in [e for e in entries if e.in_use][:5]:
+        print(f"  🔴 In use: {entry.app} since {entry.last_used_start:%Y-%m-%d %H:%M:%S}")
+    print(f"  Settings: {read_capability_settings(registry)}")
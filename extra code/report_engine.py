@@ -0,0 +1,208 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Runs a report's data collectors side by side and hands back their results,
+# errors and timings, so the report can be rendered once at the end. A slow or hung
+# collector only costs its own timeout; it never holds up the others. Results can be
+# cached per collector for a time to live, and exported as JSON Lines or a static HTML page.
+
+import html
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import date, datetime
+
+# Outcome of one collector. value is None when error is set. collected_at is when the value
+# was collected; cached is True when it came from a ReportCache rather than this run.
+CollectorResult = namedtuple('CollectorResult', ['name', 'value', 'error', 'seconds', 'timed_out',
+                                                 'collected_at', 'cached'], defaults=(None, False))
+
+
+def _timed(func):
+    start = time.perf_counter()
+    try:
+        return func(), None, time.perf_counter() - start
+    except Exception as e:
+        return None, e, time.perf_counter() - start
+
+
+def run_collectors(collectors):
+    """
+    Run (name, func, timeout) collectors concurrently. Returns {name: CollectorResult}.
+
+    Every collector starts at once and gets `timeout` seconds from that moment. One
+    that runs over is reported as timed out and left to finish in the background.
+    """
+    if not collectors:
+        return {}
+    executor = ThreadPoolExecutor(max_workers=len(collectors), thread_name_prefix='collector')
+    start = time.monotonic()
+    collected_at = datetime.now()
+    futures = [(name, executor.submit(_timed, func), timeout) for name, func, timeout in collectors]
+
+    results = {}
+    for name, future, timeout in futures:
+        try:
+            value, error, seconds = future.result(timeout=max(0, start + timeout - time.monotonic()))
+        except FutureTimeout:
+            results[name] = CollectorResult(name, None, f"Timed out after {timeout}s",
+                                            time.monotonic() - start, True, collected_at)
+            continue
+        results[name] = CollectorResult(name, value, error, seconds, False, collected_at)
+
+    executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def print_timings(results, labels=None, wall_time=None):
+    """Print how long each collector took, and the total against running them one by one."""
+    labels = labels or {}
+    sequential = sum(r.seconds for r in results.values())
+    print("\n" + "-" * 70)
+    if wall_time is not None:
+        print(f"  ⏱️ Collected in {wall_time:.1f}s (one after another: ~{sequential:.1f}s)")
+    for name, result in results.items():
+        if result.cached:
+            age = (datetime.now() - result.collected_at).total_seconds()
+            print(f"     {labels.get(name, name):<38}{'cached':>8}  ({age:.0f}s old)")
+            continue
+        status = "⚠️ timed out" if result.timed_out else ("⚠️ failed" if result.error else "")
+        print(f"     {labels.get(name, name):<38}{result.seconds:>7.2f}s  {status}")
+
+
+class ReportCache:
+    """
+    Keeps each collector's last good result for its own time to live, so refreshing a
+    report only re-runs the collectors whose data may have changed. Errors and timeouts
+    are never cached.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.entries = {}  # name -> (CollectorResult, clock time collected)
+
+    def run(self, collectors, force=False):
+        """
+        Run (name, func, timeout, ttl) collectors, reusing results younger than their ttl
+        seconds. Returns {name: CollectorResult} in the order given; reused ones have cached=True.
+        """
+        now = self.clock()
+        stale = [(name, func, timeout) for name, func, timeout, ttl in collectors
+                 if force or name not in self.entries or now - self.entries[name][1] >= ttl]
+        fresh = run_collectors(stale)
+        for name, result in fresh.items():
+            if result.error is None:
+                self.entries[name] = (result, now)
+            else:
+                self.entries.pop(name, None)
+        return {name: fresh[name] if name in fresh else self.entries[name][0]._replace(cached=True)
+                for name, *_ in collectors}
+
+    def invalidate(self, name=None):
+        """Forget one collector's result, or all of them."""
+        if name is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(name, None)
+
+
+def to_plain(value):
+    """Records (namedtuples), lists, dicts and datetimes as plain JSON-ready values."""
+    if hasattr(value, '_asdict'):
+        return {key: to_plain(item) for key, item in value._asdict().items()}
+    if isinstance(value, dict):
+        return {str(key): to_plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat(sep=' ', timespec='seconds') if isinstance(value, datetime) else value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def iter_records(value):
+    """
+    The records in a collector's value as (kind, record) pairs. A list yields its items, a
+    record made of lists (e.g. a history with several kinds of entry) yields each list's items,
+    and anything else is one record. kind is the record's type name.
+    """
+    if isinstance(value, list):
+        for item in value:
+            yield type(item).__name__, item
+    elif hasattr(value, '_fields') and value and all(isinstance(item, list) for item in value):
+        for item in value:
+            yield from iter_records(item)
+    elif value is not None:
+        yield type(value).__name__, value
+
+
+def _write_atomic(path, text):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def _section_meta(result, titles):
+    return {'section': result.name, 'title': titles.get(result.name, result.name),
+            'collected_at': to_plain(result.collected_at), 'cached': result.cached,
+            'seconds': round(result.seconds, 3), 'error': str(result.error) if result.error else None}
+
+
+def export_jsonl(results, path, titles=None):
+    """
+    Write {name: CollectorResult} as JSON Lines. The file has a "report" line, then for each
+    section a "section" line with its status followed by one "record" line per record.
+    """
+    titles = titles or {}
+    lines = [{'type': 'report', 'generated': to_plain(datetime.now())}]
+    for result in results.values():
+        lines.append({'type': 'section', **_section_meta(result, titles)})
+        for kind, record in iter_records(result.value):
+            lines.append({'type': 'record', 'section': result.name, 'kind': kind, 'record': to_plain(record)})
+    _write_atomic(path, ''.join(json.dumps(line, ensure_ascii=False) + '\n' for line in lines))
+    return len(lines)
+
+
+def _cell(value):
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, ensure_ascii=False) if value else ''
+    return html.escape('' if value is None else str(value))
+
+
+def export_html(results, path, title, titles=None):
+    """Write {name: CollectorResult} as a self-contained HTML page with a table per kind of record."""
+    titles = titles or {}
+    parts = [
+        '<!DOCTYPE html>', '<html><head><meta charset="utf-8">', f'<title>{html.escape(title)}</title>',
+        '<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;margin:.5em 0 1.5em}'
+        'th,td{border:1px solid #ccc;padding:.25em .5em;text-align:left;vertical-align:top}'
+        'th{background:#f0f0f0}.meta{color:#666}.error{color:#b00}</style>',
+        '</head><body>', f'<h1>{html.escape(title)}</h1>',
+        f'<p class="meta">Generated {datetime.now():%Y-%m-%d %H:%M:%S}</p>',
+    ]
+    for result in results.values():
+        meta = _section_meta(result, titles)
+        parts.append(f'<h2>{html.escape(meta["title"])}</h2>')
+        source = 'cached' if result.cached else f'{meta["seconds"]:.2f}s'
+        parts.append(f'<p class="meta">Collected {html.escape(meta["collected_at"] or "?")} ({source})</p>')
+        if result.error:
+            parts.append(f'<p class="error">{html.escape(meta["error"])}</p>')
+            continue
+        tables = {}
+        for kind, record in iter_records(result.value):
+            tables.setdefault(kind, []).append(to_plain(record))
+        if not tables:
+            parts.append('<p>Nothing found</p>')
+        for kind, rows in tables.items():
+            columns = list(rows[0]) if isinstance(rows[0], dict) else ['value']
+            parts.append(f'<h3>{html.escape(kind)} ({len(rows)})</h3><table><tr>'
+                         + ''.join(f'<th>{html.escape(c)}</th>' for c in columns) + '</tr>')
+            for row in rows:
+                cells = [row.get(c) for c in columns] if isinstance(row, dict) else [row]
+                parts.append('<tr>' + ''.join(f'<td>{_cell(v)}</td>' for v in cells) + '</tr>')
+            parts.append('</table>')
+    parts.append('</body></html>')
+    _write_atomic(path, '\n'.join(parts) + '\n')
@@ -0,0 +1,242 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Alert and response engine for security_scanner. The scanner drops alerts
+# onto a queue and keeps scanning; a worker thread applies the response policy
+# (kill, suspend, notify, ignore or ask) and a separate thread handles the y/n prompts.
+
+import queue
+import threading
+import time
+from collections import deque
+
+import psutil
+
+# Actions a policy can choose
+KILL = 'kill'
+SUSPEND = 'suspend'
+NOTIFY = 'notify'
+IGNORE = 'ignore'
+ASK = 'ask'
+ACTIONS = {KILL, SUSPEND, NOTIFY, IGNORE, ASK}
+
+# Default policy: which action to take for each kind of alert.
+# The first matching rule wins, checked in this order.
+DEFAULT_POLICY = {
+    'blocklist_hit': ASK,
+    'bulk_upload': ASK,
+    'accessing_sensitive': ASK,
+    'default': ASK,
+}
+
+POLICY_ORDER = ['blocklist_hit', 'bulk_upload', 'accessing_sensitive']
+
+
+def choose_action(alert, policy):
+    """Pick the policy action for an alert (process_info dict from the scanner)."""
+    for reason in POLICY_ORDER:
+        if alert.get(reason) and reason in policy:
+            return policy[reason]
+    return policy.get('default', NOTIFY)
+
+
+def open_process(pid, create_time=None):
+    """
+    Open a PID, making sure it's still the process the alert was about. Prompts can be
+    answered minutes later, and by then the PID may belong to something else.
+    """
+    proc = psutil.Process(pid)
+    if create_time is not None and proc.create_time() != create_time:
+        raise psutil.NoSuchProcess(pid, msg='PID has been reused')
+    return proc
+
+
+def kill_process(pid, process_name, create_time=None):
+    """Terminate a process without asking."""
+    try:
+        proc = open_process(pid, create_time)
+        proc.terminate()
+        proc.wait(timeout=5)
+        print(f"✅ Process '{process_name}' (PID: {pid}) has been terminated.")
+        return True
+    except psutil.NoSuchProcess:
+        print(f"Process '{process_name}' (PID: {pid}) already exited.")
+        return True
+    except psutil.TimeoutExpired:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            print(f"Process '{process_name}' (PID: {pid}) already exited.")
+            return True
+        except psutil.AccessDenied:
+            print(f"❌ Access denied. Try running as Administrator.")
+            return False
+        print(f"✅ Process '{process_name}' (PID: {pid}) was force-killed.")
+        return True
+    except psutil.AccessDenied:
+        print(f"❌ Access denied. Try running as Administrator.")
+        return False
+    except Exception as e:
+        print(f"❌ Error terminating process: {e}")
+        return False
+
+
+def terminate_process(pid, process_name, create_time=None):
+    """Ask the user whether to kill (or suspend) a suspicious process."""
+    response = input(
+        f"\nDo you want to terminate '{process_name}' (PID: {pid})? (y/n, s = suspend): "
+    ).strip().lower()
+    if response == 'y':
+        return kill_process(pid, process_name, create_time)
+    if response == 's':
+        return suspend_process(pid, process_name, create_time)
+    print(f"Process '{process_name}' was NOT terminated.")
+    return False
+
+
+def suspend_process(pid, process_name, create_time=None):
+    """Suspend (freeze) a process so it can be inspected before deciding to kill it."""
+    try:
+        open_process(pid, create_time).suspend()
+        print(f"⏸️  Process '{process_name}' (PID: {pid}) has been suspended.")
+        return True
+    except psutil.NoSuchProcess:
+        print(f"Process '{process_name}' (PID: {pid}) already exited.")
+        return True
+    except psutil.AccessDenied:
+        print(f"❌ Access denied. Try running as Administrator.")
+        return False
+    except Exception as e:
+        print(f"❌ Error suspending process: {e}")
+        return False
+
+
+class ResponseEngine:
+    """
+    Consumes alerts off a queue so the scanner never waits on a person or on I/O.
+
+    submit() only puts the alert on a queue and returns immediately. A worker thread
+    renders each alert and applies the policy. Alerts that need a decision go onto a
+    second queue served by a prompt thread, so one unanswered question never holds up
+    other alerts. `render` shows an alert and `confirm` asks about it (it should return
+    True if it took action); both default to simple console versions. `report`, if
+    given, is called on the worker thread for every alert before the policy is applied,
+    for slow side work such as hashing the executable for a findings collector.
+    """
+
+    def __init__(self, policy=None, render=None, confirm=None, report=None):
+        self.policy = dict(DEFAULT_POLICY)
+        self.policy.update(policy or {})
+        for reason, action in self.policy.items():
+            if action not in ACTIONS:
+                raise ValueError(f"Unknown action '{action}' for '{reason}'")
+
+        self.render = render or (lambda alert: print(alert))
+        self.confirm = confirm or (
+            lambda alert: terminate_process(alert['pid'], alert['name'], alert.get('create_time'))
+        )
+        self.report = report
+        self.alerts = queue.Queue()
+        self.prompts = queue.Queue()
+        self.pending_prompts = set()  # PIDs already waiting on an answer
+        self.lock = threading.Lock()
+        self.history = deque(maxlen=1000)
+        self.threads = []
+        self.running = False
+
+    def start(self):
+        """Start the worker and prompt threads."""
+        if self.running:
+            return self
+        self.running = True
+        self.threads = [
+            threading.Thread(target=self._worker, name='response-worker', daemon=True),
+            threading.Thread(target=self._prompter, name='response-prompter', daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        """Ask the threads to stop. A prompt that's still waiting for input is abandoned."""
+        self.running = False
+        self.alerts.put(None)
+        self.prompts.put(None)
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def submit(self, alert):
+        """Queue an alert for handling. Never blocks."""
+        self.alerts.put_nowait(alert)
+
+    def wait_idle(self, timeout=None):
+        """Block until every queued alert (and prompt) has been handled. Used by one-shot scans."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for q in (self.alerts, self.prompts):
+            while q.unfinished_tasks:
+                if deadline is not None and time.monotonic() > deadline:
+                    return False
+                time.sleep(0.05)
+        return True
+
+    def _record(self, alert, action, result):
+        with self.lock:
+            self.history.append({
+                'time': time.time(), 'pid': alert['pid'], 'name': alert['name'],
+                'action': action, 'result': result
+            })
+
+    def _worker(self):
+        while self.running:
+            alert = self.alerts.get()
+            try:
+                if alert is None:
+                    continue
+                self.handle(alert)
+            except Exception as e:
+                print(f"❌ Error handling alert: {e}")
+            finally:
+                self.alerts.task_done()
+
+    def handle(self, alert):
+        """Apply the policy to one alert (runs on the worker thread)."""
+        if self.report is not None:
+            try:
+                self.report(alert)
+            except Exception as e:
+                print(f"❌ Error reporting alert: {e}")
+
+        action = choose_action(alert, self.policy)
+        if action == IGNORE:
+            self._record(alert, action, None)
+            return
+
+        with self.lock:
+            self.render(alert)
+
+        if action == KILL:
+            self._record(alert, action, kill_process(alert['pid'], alert['name'], alert.get('create_time')))
+        elif action == SUSPEND:
+            self._record(alert, action, suspend_process(alert['pid'], alert['name'], alert.get('create_time')))
+        elif action == ASK:
+            with self.lock:
+                if alert['pid'] in self.pending_prompts:
+                    return  # Already asking about this process
+                self.pending_prompts.add(alert['pid'])
+            self.prompts.put(alert)
+        else:
+            self._record(alert, action, None)
+
+    def _prompter(self):
+        while self.running:
+            alert = self.prompts.get()
+            try:
+                if alert is None:
+                    continue
+                self._record(alert, ASK, self.confirm(alert))
+            except Exception as e:
+                print(f"❌ Error asking about process: {e}")
+            finally:
+                with self.lock:
+                    if alert is not None:
+                        self.pending_prompts.discard(alert['pid'])
+                self.prompts.task_done()
@@ -0,0 +1,141 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Adaptive scheduling for security_scanner's continuous monitor. A cheap sample
+# (a fingerprint of the connection table) runs often; the expensive full scan only runs when
+# the sample changes, backs off exponentially while things stay the same, and is spaced out
+# so it stays inside a CPU budget.
+
+import time
+from collections import namedtuple
+
+# What one full scan cost and why it ran
+CycleReport = namedtuple(
+    'CycleReport', ['reason', 'wall_time', 'cpu_time', 'samples', 'sample_cpu', 'next_interval']
+)
+
+
+class AdaptiveScheduler:
+    """
+    Decides when to run a full scan.
+
+    `sample()` should be cheap and return something that changes when a full scan is
+    worth running (e.g. a hash of the connection table). `scan()` is the full scan.
+    A scan runs when the sample changes, or when `interval` seconds pass without a
+    change; each unchanged scan doubles `interval` (up to `max_interval`) and a change
+    resets it to `min_interval`. After a scan that took C CPU-seconds, the next one
+    waits at least C / cpu_budget seconds, so scanning averages no more than
+    `cpu_budget` of one core. Samples are charged to the same budget: they run every
+    `sample_interval` seconds, or less often if one costs more than
+    sample_interval * cpu_budget. The clocks and sleep are injectable for testing.
+    """
+
+    def __init__(self, sample, scan, min_interval=2.0, max_interval=30.0, sample_interval=1.0,
+                 cpu_budget=0.05, backoff=2.0, clock=time.monotonic,
+                 cpu_clock=time.process_time, sleep=time.sleep):
+        self.sample = sample
+        self.scan = scan
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.sample_interval = sample_interval
+        self.cpu_budget = cpu_budget
+        self.backoff = backoff
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+        self.sleep = sleep
+
+        self.interval = min_interval
+        self.fingerprint = None
+        self.last_scan = None      # clock() when the last full scan started
+        self.earliest_next = 0.0   # Budget/min-interval gate for the next full scan
+        self.changed = False       # Sample changed but the scan was held back by the gate
+        self.samples = 0
+        self.sample_cpu = 0.0
+        self.last_sample_cpu = 0.0
+
+    def _take_sample(self):
+        cpu_start = self.cpu_clock()
+        try:
+            fingerprint = self.sample()
+        finally:
+            self.last_sample_cpu = self.cpu_clock() - cpu_start
+            self.sample_cpu += self.last_sample_cpu
+            self.samples += 1
+        return fingerprint
+
+    def step(self):
+        """Sample once and run a full scan if one is due. Returns a CycleReport or None."""
+        now = self.clock()
+        fingerprint = self._take_sample()
+
+        if self.last_scan is None:
+            reason = 'startup'
+        else:
+            if fingerprint != self.fingerprint:
+                self.changed = True
+            if now < self.earliest_next:
+                return None
+            if self.changed:
+                reason = 'change'
+            elif now - self.last_scan >= self.interval:
+                reason = 'stable'
+            else:
+                return None
+
+        wall_start, cpu_start = self.clock(), self.cpu_clock()
+        self.scan()
+        wall_time = self.clock() - wall_start
+        cpu_time = self.cpu_clock() - cpu_start
+
+        if reason == 'stable':
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        else:
+            self.interval = self.min_interval
+
+        # Sampling since the last scan counts against the budget too
+        spent = cpu_time + self.sample_cpu
+        gap = max(self.min_interval, spent / self.cpu_budget if self.cpu_budget else 0)
+        self.earliest_next = wall_start + wall_time + gap
+        self.interval = max(self.interval, min(gap, self.max_interval))
+
+        report = CycleReport(reason, wall_time, cpu_time, self.samples, self.sample_cpu,
+                             self.interval)
+        self.fingerprint = fingerprint
+        self.last_scan = wall_start
+        self.changed = False
+        self.samples = 0
+        self.sample_cpu = 0.0
+        return report
+
+    def run(self, on_report=None, should_stop=lambda: False):
+        """Loop forever (or until should_stop()), calling on_report after each full scan."""
+        while not should_stop():
+            started = self.clock()
+            report = self.step()
+            if report is not None and on_report is not None:
+                on_report(report)
+            # A sample that cost c CPU-seconds is followed by at least c / cpu_budget seconds of rest
+            gap = max(self.sample_interval, self.last_sample_cpu / self.cpu_budget if self.cpu_budget else 0)
+            self.sleep(max(0.0, gap - (self.clock() - started)))
+
+
+if __name__ == "__main__":
+    # Simulate a quiet box that sees one burst of new connections
+    fake_now = [0.0]
+    table = [frozenset()]
+
+    def fake_sleep(seconds):
+        fake_now[0] += seconds
+        if 100 <= fake_now[0] < 101:
+            table[0] = frozenset({('1.2.3.4', 443)})
+
+    def fake_scan():
+        fake_now[0] += 0.1  # Pretend a full scan takes 100 ms
+
+    scheduler = AdaptiveScheduler(
+        sample=lambda: hash(table[0]), scan=fake_scan, max_interval=60,
+        clock=lambda: fake_now[0], cpu_clock=lambda: fake_now[0], sleep=fake_sleep
+    )
+    scheduler.run(
+        on_report=lambda r: print(f"t={fake_now[0]:6.1f}s  {r.reason:<8} next in {r.next_interval:.0f}s"),
+        should_stop=lambda: fake_now[0] > 300
+    )
@@ -0,0 +1,361 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Benchmark and regression check for security_scanner without needing a busy
+# host. Generates synthetic process and connection tables (mixed IPv4/IPv6, private,
+# allowlisted, external and threat-listed addresses), feeds them to the scanner through
+# its data-source layer, and reports scans/sec, per-stage time and allocations.
+#
+# Usage:
+#   python scanner_benchmark.py                        # 1k, 10k and 100k sockets
+#   python scanner_benchmark.py --sizes 1000 5000
+#   python scanner_benchmark.py --save-baseline        # record this machine's numbers
+#   python scanner_benchmark.py --threshold 0.2        # exit 1 if >20% slower than baseline
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+import psutil
+
+import security_scanner as scanner
+from path_index import OpenFilesCache
+from proc_net import Address, Connection
+from process_snapshot import ProcessRecord
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scanner_benchmark_baseline.json')
+
+# Networks the synthetic host treats as trusted, and how often connections land in them
+SYNTHETIC_ALLOWLIST = ['13.64.0.0/11', '20.33.0.0/16', '2603:1000::/24']
+
+IoCounters = namedtuple('IoCounters', ['read_bytes', 'write_bytes', 'write_chars'])
+OpenFile = namedtuple('OpenFile', ['path', 'fd'])
+
+
+class StageTimer:
+    """Collects time (and optionally peak allocations, via tracemalloc) per scan stage."""
+
+    def __init__(self, track_allocations=False):
+        self.track_allocations = track_allocations
+        self.times = {}
+        self.allocations = {}
+        self.reset()
+
+    def reset(self):
+        self.last = time.perf_counter()
+        if self.track_allocations:
+            self.base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.times[stage] = self.times.get(stage, 0.0) + now - self.last
+        if self.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            self.allocations[stage] = max(self.allocations.get(stage, 0), peak - self.base)
+            self.base = current
+            tracemalloc.reset_peak()
+        self.last = time.perf_counter()
+
+
+class FakeProcess:
+    """Just enough of psutil.Process for get_process_connections()'s live reads."""
+
+    def __init__(self, pid, name, exe, create_time, open_files, upload_rate=0, hidden_exe=False):
+        self.pid = pid
+        # Static details, served to the scanner as a ProcessRecord by record()
+        self.record = ProcessRecord(pid, 1, name, '' if hidden_exe else exe, create_time,
+                                    None if hidden_exe else (exe,))
+        self._open_files = [OpenFile(path, 3 + i) for i, path in enumerate(open_files)]
+        self._upload_rate = upload_rate
+
+    def io_counters(self):
+        written = int(time.monotonic() * self._upload_rate)
+        return IoCounters(0, written, written)
+
+    def num_fds(self):
+        return len(self._open_files) + 3
+
+    def open_files(self):
+        return list(self._open_files)
+
+
+class SyntheticDataSource:
+    """
+    A made-up host with `sockets` connections spread over roughly sockets/25 processes.
+
+    About `internal_ratio` of remote addresses are private/loopback, `allowlist_ratio`
+    fall in SYNTHETIC_ALLOWLIST, `blocklist_ratio` are on the synthetic threat list and
+    the rest are public. `ipv6_ratio` of sockets are IPv6 and `idle_ratio` are
+    listening/closing sockets with no remote end. Everything is seeded, so runs repeat.
+    """
+
+    def __init__(self, sockets, seed=1, ipv6_ratio=0.25, internal_ratio=0.55,
+                 allowlist_ratio=0.15, blocklist_ratio=0.002, idle_ratio=0.2):
+        rng = random.Random(seed)
+        self.rng = rng
+        self.blocklisted = [self._public_v4(rng) for _ in range(max(1, sockets // 500))]
+        self.processes = {}
+        home = os.path.expanduser('~')
+
+        for i in range(max(10, sockets // 25)):
+            pid = 1000 + i
+            kind = rng.random()
+            if kind < 0.3:
+                name = rng.choice(['firefox', 'chrome', 'msedge.exe', 'chrome.exe'])
+                exe = f"/usr/lib/{name}/{name}" if not name.endswith('.exe') else \
+                    f"C:\\Program Files\\{name[:-4]}\\{name}"
+            elif kind < 0.55:
+                name = rng.choice(['svchost.exe', 'explorer.exe', 'searchindexer.exe'])
+                exe = f"C:\\Windows\\System32\\{name}"
+            elif kind < 0.6:
+                name = 'chrome.exe'  # Impostor outside Program Files
+                exe = f"{home}\\Downloads\\{name}"
+            else:
+                name = f"app{i % 300}"
+                exe = f"/opt/app{i % 300}/bin/app{i % 300}"
+            files = [f"/var/lib/app{i}/db{n}.sqlite" for n in range(rng.randrange(1, 6))]
+            if rng.random() < 0.1:
+                files.append(f"{home}/Documents/report{i}.pdf")
+            self.processes[pid] = FakeProcess(
+                pid, name, exe, 1_700_000_000 + i, files,
+                upload_rate=rng.choice([0, 0, 0, 50_000, 5_000_000]),
+                hidden_exe=rng.random() < 0.05
+            )
+
+        pids = list(self.processes)
+        self.table = []
+        self.counters = {}
+        for n in range(sockets):
+            pid = rng.choice(pids)
+            inode = 100000 + n
+            v6 = rng.random() < ipv6_ratio
+            if rng.random() < idle_ratio:
+                local = Address('::' if v6 else '0.0.0.0', 1024 + n % 60000)
+                status = rng.choice(['LISTEN', 'TIME_WAIT', 'CLOSE_WAIT'])
+                self.table.append((pid, Connection(10 if v6 else 2, local, (), status, inode)))
+                continue
+            remote = Address(self._remote_ip(rng, v6, internal_ratio, allowlist_ratio,
+                                             blocklist_ratio), rng.choice([443, 443, 80, 8443, 22]))
+            local = Address('fd00::10' if v6 else '10.0.0.10', 30000 + n % 30000)
+            self.table.append((pid, Connection(10 if v6 else 2, local, remote, 'ESTABLISHED', inode)))
+            self.counters[inode] = (rng.randrange(1 << 30), rng.randrange(1 << 30))
+
+    @staticmethod
+    def _public_v4(rng):
+        return f"{rng.choice([23, 34, 45, 52, 77, 91, 104, 151, 185])}." \
+               f"{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+
+    def _remote_ip(self, rng, v6, internal_ratio, allowlist_ratio, blocklist_ratio):
+        roll = rng.random()
+        if roll < blocklist_ratio:
+            return rng.choice(self.blocklisted)
+        roll -= blocklist_ratio
+        if roll < internal_ratio:
+            if v6:
+                return rng.choice(['::1', f"fd00::{rng.randrange(1, 0xffff):x}",
+                                   f"fe80::{rng.randrange(1, 0xffff):x}"])
+            return rng.choice(['127.0.0.1', f"10.{rng.randrange(256)}.{rng.randrange(256)}.5",
+                               f"192.168.{rng.randrange(256)}.{rng.randrange(1, 255)}"])
+        roll -= internal_ratio
+        if roll < allowlist_ratio:
+            if v6:
+                return f"2603:10{rng.randrange(16):x}0::{rng.randrange(1, 0xffff):x}"
+            return f"13.{rng.randrange(64, 96)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+        if v6:
+            return f"2a0{rng.randrange(10)}:{rng.randrange(0xffff):x}::{rng.randrange(1, 0xffff):x}"
+        return self._public_v4(rng)
+
+    def remote_ips(self):
+        return [conn.raddr.ip for _, conn in self.table if conn.raddr]
+
+    def write_blocklist(self, path):
+        with open(path, 'w') as f:
+            f.write("# synthetic threat list\n")
+            for ip in self.blocklisted:
+                f.write(f"{ip}\n")
+            rng = random.Random(0)
+            for _ in range(20000):  # Realistic list size; mostly unrelated ranges
+                f.write(f"{self._public_v4(rng).rsplit('.', 1)[0]}.0/24\n")
+
+    # Data-source interface used by security_scanner.get_process_connections()
+    def connections(self):
+        return self.table
+
+    def socket_counters(self):
+        return self.counters
+
+    def record(self, pid):
+        proc = self.processes.get(pid)
+        return proc.record if proc is not None else None
+
+    def process(self, pid):
+        proc = self.processes.get(pid)
+        if proc is None:
+            raise psutil.NoSuchProcess(pid)
+        return proc
+
+
+# Scanner globals the benchmark replaces, saved and put back around each run
+SCANNER_STATE = ['IP_ALLOWLIST', 'IP_DENYLIST', 'BLOCKLIST_FILES', 'EXE_ALLOWLIST_FILE', 'HASH_CACHE_FILE',
+                 '_ip_classifier', '_blocklists', '_throughput', '_exe_allowlist', '_open_files_cache']
+
+
+def restore_scanner(saved):
+    """Put back the globals returned by reset_scanner()."""
+    for name, value in saved.items():
+        setattr(scanner, name, value)
+
+
+def reset_scanner(blocklist_path):
+    """
+    Point the scanner's lazily built state at the synthetic configuration. Returns the
+    previous values for restore_scanner().
+    """
+    saved = {name: getattr(scanner, name) for name in SCANNER_STATE}
+    scanner.IP_ALLOWLIST = list(SYNTHETIC_ALLOWLIST)
+    scanner.IP_DENYLIST = []
+    scanner.BLOCKLIST_FILES = [blocklist_path]
+    scanner.EXE_ALLOWLIST_FILE = None
+    scanner.HASH_CACHE_FILE = None
+    scanner._ip_classifier = None
+    scanner._blocklists = None
+    scanner._throughput = None
+    scanner._exe_allowlist = None
+    scanner._open_files_cache = OpenFilesCache()
+    return saved
+
+
+def bench_size(sockets, min_time=2.0, seed=1):
+    """Benchmark one table size. Returns a dict of metrics."""
+    source = SyntheticDataSource(sockets, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        blocklist_path = os.path.join(tmp, 'threats.txt')
+        source.write_blocklist(blocklist_path)
+        saved = reset_scanner(blocklist_path)
+        previous = scanner.set_data_source(source)
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                found = len(scanner.get_process_connections())  # Warm-up: builds caches
+
+            timer = StageTimer()
+            scans = 0
+            start = time.perf_counter()
+            while scans < 3 or time.perf_counter() - start < min_time:
+                timer.reset()
+                scanner.get_process_connections(timer)
+                scans += 1
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            alloc_timer = StageTimer(track_allocations=True)
+            scanner.get_process_connections(alloc_timer)
+            tracemalloc.stop()
+
+            ips = source.remote_ips()
+            classifier = scanner.get_ip_classifier()
+            t0 = time.perf_counter()
+            classifier.is_external_many(ips)
+            batch_rate = len(ips) / (time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            for ip in ips:
+                scanner.is_external_ip(ip)
+            single_rate = len(ips) / (time.perf_counter() - t0)
+        finally:
+            scanner.set_data_source(previous)
+            restore_scanner(saved)
+
+    return {
+        'sockets': sockets,
+        'processes': len(source.processes),
+        'suspicious': found,
+        'scans_per_sec': scans / elapsed,
+        'stage_ms': {stage: total / scans * 1000 for stage, total in timer.times.items()},
+        'stage_alloc_kb': {stage: size / 1024 for stage, size in alloc_timer.allocations.items()},
+        'is_external_many_per_sec': batch_rate,
+        'is_external_per_sec': single_rate,
+    }
+
+
+def print_result(result):
+    print(f"\n  {result['sockets']:,} sockets / {result['processes']:,} processes "
+          f"({result['suspicious']} suspicious)")
+    print(f"    {result['scans_per_sec']:,.1f} scans/sec "
+          f"({1000 / result['scans_per_sec']:.1f} ms per scan)")
+    print(f"    {'stage':<18}{'ms/scan':>10}{'peak alloc KB':>16}")
+    for stage, ms in result['stage_ms'].items():
+        print(f"    {stage:<18}{ms:>10.2f}{result['stage_alloc_kb'].get(stage, 0):>16,.0f}")
+    print(f"    is_external_ip: {result['is_external_per_sec']:,.0f} addr/s one at a time, "
+          f"{result['is_external_many_per_sec']:,.0f} addr/s batched")
+
+
+# Metrics compared against the baseline (higher is better for all of them)
+REGRESSION_METRICS = ['scans_per_sec', 'is_external_many_per_sec', 'is_external_per_sec']
+
+
+def check_regressions(results, baseline, threshold):
+    """Return a list of (sockets, metric, baseline, current) that dropped by more than threshold."""
+    regressions = []
+    for result in results:
+        previous = baseline.get(str(result['sockets']))
+        if not previous:
+            continue
+        for metric in REGRESSION_METRICS:
+            if metric in previous and result[metric] < previous[metric] * (1 - threshold):
+                regressions.append((result['sockets'], metric, previous[metric], result[metric]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Synthetic benchmark for security_scanner")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="connection table sizes to test")
+    parser.add_argument('--min-time', type=float, default=2.0, help="seconds to run each size")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--save-baseline', action='store_true', help="save results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="fail if a metric is this fraction slower than the baseline")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("       SECURITY SCANNER BENCHMARK")
+    print("=" * 60)
+
+    results = []
+    for size in args.sizes:
+        result = bench_size(size, args.min_time)
+        print_result(result)
+        results.append(result)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({str(r['sockets']): {m: r[m] for m in REGRESSION_METRICS} for r in results},
+                      f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nℹ️ No baseline yet - run with --save-baseline to record one.")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = check_regressions(results, baseline, args.threshold)
+    if not regressions:
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} of the baseline.")
+        return 0
+    print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+    for sockets, metric, before, now in regressions:
+        print(f"    {sockets:,} sockets {metric}: {before:,.1f} -> {now:,.1f} ({now / before - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
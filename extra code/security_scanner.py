@@ -7,8 +7,29 @@ import psutil
 import socket
 import time
 import os
+import sys
 from datetime import datetime
 
+import proc_net
+from ip_classifier import IpClassifier
+from ip_blocklist import BlocklistSet
+from throughput_tracker import ThroughputTracker, format_rate
+from path_index import PathIndex, OpenFilesCache
+from response_engine import ResponseEngine, kill_process, suspend_process
+from alert_tracker import AlertTracker
+from ip_enrichment import AsnDatabase, Enricher
+from exe_allowlist import ExecutableAllowlist
+from scan_scheduler import AdaptiveScheduler
+from findings_collector import Agent, scanner_finding
+from process_snapshot import get_snapshot_service
+
+# Where the connection table comes from:
+#   'auto'     - /proc/net on Linux, psutil everywhere else
+#   'psutil'   - psutil.net_connections()
+#   'procnet'  - parse /proc/net/tcp{,6} directly (Linux only)
+#   'sockdiag' - query the kernel over NETLINK_SOCK_DIAG, falling back to /proc/net
+CONNECTION_BACKEND = 'auto'
+
 # Known safe browsers (add more as needed)
 KNOWN_BROWSERS = {
     'chrome.exe', 'firefox.exe', 'msedge.exe', 'opera.exe', 'brave.exe',
@@ -41,71 +62,422 @@ SENSITIVE_DIRECTORIES = [
     os.path.expanduser('~\\AppData'),
 ]
 
+# Extra glob patterns for sensitive locations, matched per path component.
+# '*' matches within one folder name, '**' matches any number of folders.
+# e.g. '~\\AppData\\Roaming\\*\\wallet*' or 'C:\\**\\.ssh'
+SENSITIVE_PATTERNS = []
+
+# Networks to always trust (never treated as external) or always treat as external.
+# Entries can be CIDRs ('203.0.113.0/24') or paths to files with one CIDR per line.
+IP_ALLOWLIST = []
+IP_DENYLIST = []
+
+# Threat-intel files of known-bad IPs/CIDRs (one per line). Any connection to a listed
+# address raises a high-severity alert, even for browsers and safe processes.
+BLOCKLIST_FILES = []
+
+# Flag a process as a possible bulk upload when it keeps sending faster than
+# UPLOAD_ALERT_RATE bytes/sec for at least UPLOAD_SUSTAIN_SECONDS
+UPLOAD_ALERT_RATE = 1024 * 1024  # 1 MB/s
+UPLOAD_SUSTAIN_SECONDS = 60
+
+# What to do about each kind of alert: 'kill', 'suspend', 'notify', 'ignore' or 'ask'.
+# 'ask' prompts on a separate thread, so scanning carries on while the question is open.
+RESPONSE_POLICY = {
+    'blocklist_hit': 'ask',
+    'bulk_upload': 'ask',
+    'accessing_sensitive': 'ask',
+    'default': 'ask',
+}
+
+# How long "acknowledge" silences a process, and where acknowledgements are saved
+ACKNOWLEDGE_HOURS = 24
+SUPPRESSION_FILE = os.path.expanduser('~/.security_scanner_suppressions.json')
+
+# Optional local ASN/country database (CSV or TSV: range_start, range_end, asn, country, org),
+# e.g. the ip2asn-combined.tsv dump from iptoasn.com. Reverse DNS is always attempted.
+ASN_DATABASE_CSV = None
+
+# Programs trusted by identity (SHA-256 and/or code-signing signer, optionally pinned to a
+# path) - see exe_allowlist.py for the rule format. Answering 't' to an alert adds one.
+# Hashes are cached in HASH_CACHE_FILE and only recomputed when the file changes.
+EXE_ALLOWLIST_FILE = os.path.expanduser('~/.security_scanner_allowlist.json')
+HASH_CACHE_FILE = os.path.expanduser('~/.security_scanner_hash_cache.json')
+
+# KNOWN_BROWSERS and SAFE_PROCESSES only match by name, which any program can fake.
+# A name match is only trusted when the executable lives under one of these locations
+# (or its path can't be read at all, which is normal for protected system processes).
+TRUSTED_INSTALL_DIRECTORIES = [
+    'C:\\Windows\\System32', 'C:\\Windows\\SysWOW64', 'C:\\Windows\\SystemApps',
+    'C:\\Windows\\explorer.exe', 'C:\\Program Files', 'C:\\Program Files (x86)',
+    '/usr/bin', '/usr/sbin', '/usr/lib', '/usr/libexec', '/bin', '/sbin', '/opt', '/snap',
+    '/Applications', '/System',
+]
+
+# Continuous monitoring is adaptive: the connection table is sampled every SAMPLE_INTERVAL
+# seconds and a full scan runs as soon as it changes (but at most every MIN_SCAN_INTERVAL
+# seconds). While nothing changes, the gap between full scans doubles up to the monitor's
+# interval. Full scans are also spaced out to use at most SCAN_CPU_BUDGET of one CPU.
+SAMPLE_INTERVAL = 1.0
+MIN_SCAN_INTERVAL = 2.0
+SCAN_CPU_BUDGET = 0.05
+
+# Send findings to a central collector (see findings_collector.py) as well as the console.
+# 'host:port' for TCP or 'unix:/path/to.sock'. None keeps everything local.
+COLLECTOR_ADDRESS = None
+
+_ip_classifier = None
+_response_engine = None
+_enricher = None
+_alert_tracker = None
+_blocklists = None
+_throughput = None
+_path_index = None
+_trusted_dirs = None
+_exe_allowlist = None
+_collector_agent = None
+_open_files_cache = OpenFilesCache()
+
+def get_ip_classifier():
+    """Build the IP classifier once and reuse it for every scan."""
+    global _ip_classifier
+    if _ip_classifier is None:
+        _ip_classifier = IpClassifier(allowlist=IP_ALLOWLIST, denylist=IP_DENYLIST)
+    return _ip_classifier
+
+def get_blocklists():
+    """Load the threat lists once, then reload any that changed on disk."""
+    global _blocklists
+    if _blocklists is None:
+        _blocklists = BlocklistSet(BLOCKLIST_FILES)
+    for name in _blocklists.refresh():
+        print(f"🔄 Loaded threat list: {name}")
+    return _blocklists
+
+def get_throughput_tracker():
+    """Create the upload-rate tracker once so its history survives between scans."""
+    global _throughput
+    if _throughput is None:
+        _throughput = ThroughputTracker(
+            threshold=UPLOAD_ALERT_RATE, sustain_seconds=UPLOAD_SUSTAIN_SECONDS
+        )
+    return _throughput
+
+def get_path_index():
+    """Compile SENSITIVE_DIRECTORIES and SENSITIVE_PATTERNS into a path trie once."""
+    global _path_index
+    if _path_index is None:
+        _path_index = PathIndex(SENSITIVE_DIRECTORIES + SENSITIVE_PATTERNS)
+    return _path_index
+
+def get_exe_allowlist():
+    """Load the executable allowlist and its hash cache once."""
+    global _exe_allowlist
+    if _exe_allowlist is None:
+        _exe_allowlist = ExecutableAllowlist(EXE_ALLOWLIST_FILE, HASH_CACHE_FILE)
+    return _exe_allowlist
+
+def is_trusted_process(proc_name, proc_exe):
+    """Decide whether a process is trusted by what its executable is, not just its name."""
+    global _trusted_dirs
+    if proc_exe and get_exe_allowlist().match(proc_exe):
+        return True
+    if proc_name not in KNOWN_BROWSERS and proc_name not in SAFE_PROCESSES:
+        return False
+    if not proc_exe:
+        return True  # Path hidden from us; the name is all there is to go on
+    if _trusted_dirs is None:
+        _trusted_dirs = PathIndex(TRUSTED_INSTALL_DIRECTORIES)
+    # A 'chrome.exe' running out of Downloads or AppData\Temp is not Chrome
+    return os.path.basename(proc_exe.replace('\\', '/')).lower() == proc_name \
+        and _trusted_dirs.match(proc_exe) is not None
+
+def get_enricher():
+    """Load the ASN database (if configured) and start the reverse DNS resolver once."""
+    global _enricher
+    if _enricher is None:
+        asn_db = None
+        if ASN_DATABASE_CSV:
+            asn_db = AsnDatabase()
+            try:
+                count = asn_db.import_csv(ASN_DATABASE_CSV)
+                print(f"🌐 Loaded {count:,} ASN ranges from {ASN_DATABASE_CSV}")
+            except OSError as e:
+                print(f"⚠️ Could not load ASN database: {e}")
+                asn_db = None
+        _enricher = Enricher(asn_db)
+    return _enricher
+
+def get_collector_agent():
+    """Start the collector agent on first use, or return None if no collector is configured."""
+    global _collector_agent
+    if _collector_agent is None and COLLECTOR_ADDRESS:
+        _collector_agent = Agent(COLLECTOR_ADDRESS).start()
+    return _collector_agent
+
+def report_to_collector(process_info):
+    """
+    Queue a finding for the collector, tagged with the executable's hash where readable.
+    Runs on the response worker: a new executable means a full hash (and a signature
+    check on Windows), which the scan loop shouldn't wait for.
+    """
+    agent = get_collector_agent()
+    if agent is None:
+        return
+    hash_cache = get_exe_allowlist().cache
+    identity = hash_cache.identity(process_info['exe']) if process_info.get('exe') else None
+    if identity is None:
+        agent.send(scanner_finding(process_info))
+        return
+    # Signatures are only checked on Windows; elsewhere "signed" is unknown
+    signed = bool(identity['signer']) if sys.platform == 'win32' else None
+    agent.send(scanner_finding(process_info, identity['sha256'], signed))
+    hash_cache.save()
+
+def describe_remote(process_info):
+    """Format the remote end of a connection with whatever enrichment is available."""
+    remote = f"{process_info['remote_ip']}:{process_info['remote_port']}"
+    if process_info.get('hostname'):
+        remote += f" ({process_info['hostname']})"
+    if process_info.get('asn'):
+        remote += f" - AS{process_info['asn']} {process_info['org']}, {process_info['country']}"
+    return remote
+
 def is_external_ip(ip):
     """Check if an IP address is external (not local/private)."""
+    return get_ip_classifier().is_external(ip)
+
+_proc_net_backend = None
+
+def get_connection_table():
+    """Get every inet connection on the system as (pid, connection) pairs."""
+    global _proc_net_backend
+    
+    backend = CONNECTION_BACKEND
+    if backend == 'auto':
+        backend = 'procnet' if proc_net.is_supported() else 'psutil'
+    
+    if backend in ('procnet', 'sockdiag'):
+        # Keep one backend around so its inode -> PID cache survives between scans
+        if _proc_net_backend is None:
+            _proc_net_backend = proc_net.ProcNetBackend(use_sock_diag=(backend == 'sockdiag'))
+        return _proc_net_backend.connections()
+    
+    return get_psutil_connections()
+
+def get_psutil_connections():
+    """
+    Every inet connection psutil can see as (pid, connection) pairs. The system-wide call
+    needs root on macOS, so when it's denied fall back to asking each process in turn and
+    skip the ones we aren't allowed to read.
+    """
     try:
-        if ip.startswith('127.') or ip.startswith('0.'):
-            return False
-        if ip.startswith('192.168.') or ip.startswith('10.'):
-            return False
-        if ip.startswith('172.'):
-            second_octet = int(ip.split('.')[1])
-            if 16 <= second_octet <= 31:
-                return False
-        if ip == '::1' or ip.startswith('fe80:') or ip.startswith('fd'):
-            return False
-        return True
-    except:
-        return False
+        return [(conn.pid, conn) for conn in psutil.net_connections(kind='inet')]
+    except psutil.AccessDenied:
+        pass
+
+    table = []
+    for proc in psutil.process_iter(['pid']):
+        try:
+            table.extend((proc.pid, conn) for conn in proc.net_connections(kind='inet'))
+        except (psutil.AccessDenied, psutil.NoSuchProcess, psutil.ZombieProcess):
+            continue
+    return table
+
+def connection_fingerprint():
+    """Cheap summary of the established connections, used to decide when a full scan is needed."""
+    source = get_data_source()
+    if hasattr(source, 'fingerprint'):
+        return source.fingerprint()
+    return hash(frozenset(
+        (pid, conn.raddr[0], conn.raddr[1])
+        for pid, conn in source.connections()
+        if conn.status == 'ESTABLISHED' and conn.raddr
+    ))
+
+def get_socket_counters():
+    """Get per-socket (bytes_sent, bytes_received) by inode where the platform exposes them."""
+    if _proc_net_backend is None:
+        return {}  # psutil doesn't expose per-socket counters
+    return _proc_net_backend.socket_counters(('ESTABLISHED',)) or {}
+
+def get_process_bytes_sent(proc):
+    """Get a process's cumulative bytes written, the closest per-process upload counter."""
+    try:
+        io = proc.io_counters()
+    except (psutil.AccessDenied, AttributeError, NotImplementedError):
+        return None
+    # Linux: write_chars counts every write()/send() including sockets.
+    # Windows: network sends show up as "other" I/O next to file writes.
+    if hasattr(io, 'write_chars'):
+        return io.write_chars
+    return io.write_bytes + getattr(io, 'other_bytes', 0)
+
+class SystemDataSource:
+    """
+    Where get_process_connections() gets its data: the live connection table, socket
+    counters, and process details from the snapshot service shared with cmdline_monitor.
+    scanner_benchmark.py swaps in a synthetic source with set_data_source() to measure
+    scans without a busy host.
+    """
 
-def get_process_connections():
-    """Get all processes with active network connections."""
+    def connections(self):
+        return get_connection_table()
+
+    def fingerprint(self):
+        """The sample for the adaptive scheduler: the raw /proc/net rows where there are any."""
+        if proc_net.is_supported():
+            return proc_net.established_fingerprint()
+        return hash(frozenset(
+            (conn.laddr, conn.raddr)
+            for _, conn in get_psutil_connections()
+            if conn.status == 'ESTABLISHED' and conn.raddr
+        ))
+
+    def socket_counters(self):
+        return get_socket_counters()
+
+    def record(self, pid):
+        return get_snapshot_service().record(pid)
+
+    def process(self, pid):
+        return get_snapshot_service().process(pid)
+
+_data_source = SystemDataSource()
+
+def get_data_source():
+    return _data_source
+
+def set_data_source(source):
+    """Replace the data source (None restores the live system). Returns the previous one."""
+    global _data_source
+    previous = _data_source
+    _data_source = source if source is not None else SystemDataSource()
+    return previous
+
+class _NoTimer:
+    def mark(self, stage):
+        pass
+
+def get_process_connections(timer=_NoTimer()):
+    """Get all processes with active network connections. `timer.mark(stage)` is called as
+    each stage finishes (see scanner_benchmark.StageTimer)."""
     suspicious_processes = []
+    checked_pids = set()
+    source = get_data_source()
+    
+    established = [
+        (pid, conn) for pid, conn in source.connections()
+        if pid is not None and conn.status == 'ESTABLISHED' and conn.raddr
+    ]
+    timer.mark('connection_table')
+    
+    # Classify and check the whole table in one batch instead of one address at a time
+    remote_ips = [conn.raddr.ip for _, conn in established]
+    external = get_ip_classifier().is_external_many(remote_ips)
+    timer.mark('classify')
+    blocklisted = get_blocklists().match_many(remote_ips)
+    timer.mark('blocklist')
+    
+    # Threat-list hits go first so they win the "one entry per process" slot
+    candidates = sorted(
+        zip(established, external, blocklisted),
+        key=lambda item: item[2] is None
+    )
+    
+    # Track upload rates per external connection where per-socket counters exist
+    throughput = get_throughput_tracker()
+    path_index = get_path_index()
+    live_processes = set()
+    active_flows = set()
+    pid_flows = {}
+    socket_counters = source.socket_counters()
+    external_endpoints = {}
+    for (pid, conn), is_external, blocklist_hit in candidates:
+        if is_external or blocklist_hit:
+            endpoints = external_endpoints.setdefault(pid, [])
+            if (conn.raddr.ip, conn.raddr.port) not in endpoints:
+                endpoints.append((conn.raddr.ip, conn.raddr.port))
+        counters = socket_counters.get(getattr(conn, 'inode', None))
+        if is_external and counters:
+            flow_key = ('conn', pid, conn.laddr, conn.raddr)
+            throughput.update(flow_key, counters[0])
+            active_flows.add(flow_key)
+            pid_flows.setdefault(pid, []).append(flow_key)
+    timer.mark('flows')
     
-    for proc in psutil.process_iter(['pid', 'name', 'exe']):
+    for (pid, conn), is_external, blocklist_hit in candidates:
+        if not (is_external or blocklist_hit) or pid in checked_pids:
+            continue
+        
+        remote_ip = conn.raddr.ip
+        remote_port = conn.raddr.port
+        
+        checked_pids.add(pid)  # One entry per process
+        
         try:
-            proc_name = proc.info['name'].lower() if proc.info['name'] else ''
-            proc_exe = proc.info['exe'] or ''
+            # Static details come from the shared process snapshot; only live counters are read here
+            record = source.record(pid)
+            if record is None:
+                continue
+            proc_name = record.name.lower()
+            proc_exe = record.exe
+            create_time = record.create_time
             
-            # Skip browsers and known safe processes
-            if proc_name in KNOWN_BROWSERS or proc_name in SAFE_PROCESSES:
+            # Skip allowlisted programs, and browsers and safe processes running from their
+            # usual install locations (unless they're talking to a listed IP)
+            if not blocklist_hit and is_trusted_process(proc_name, proc_exe):
                 continue
             
-            # Get network connections for this process
-            connections = proc.net_connections(kind='inet')
+            # Live counters are only read for processes that weren't skipped
+            proc = source.process(pid)
+            bytes_sent = get_process_bytes_sent(proc)
             
-            for conn in connections:
-                if conn.status == 'ESTABLISHED' and conn.raddr:
-                    remote_ip = conn.raddr.ip
-                    remote_port = conn.raddr.port
-                    
-                    if is_external_ip(remote_ip):
-                        # Check if process is accessing sensitive files
-                        open_files = []
-                        try:
-                            open_files = [f.path for f in proc.open_files()]
-                        except (psutil.AccessDenied, psutil.NoSuchProcess):
-                            pass
-                        
-                        # Check if accessing sensitive directories
-                        accessing_sensitive = any(
-                            any(sens_dir.lower() in f.lower() for sens_dir in SENSITIVE_DIRECTORIES)
-                            for f in open_files
-                        )
-                        
-                        suspicious_processes.append({
-                            'pid': proc.info['pid'],
-                            'name': proc_name,
-                            'exe': proc_exe,
-                            'remote_ip': remote_ip,
-                            'remote_port': remote_port,
-                            'open_files': open_files[:5],  # Limit to 5 files
-                            'accessing_sensitive': accessing_sensitive
-                        })
-                        break  # One entry per process
+            # Upload rate: per-process counters plus any per-connection counters
+            flow_keys = pid_flows.get(pid, [])
+            if bytes_sent is not None:
+                proc_key = ('proc', pid, create_time)
+                throughput.update(proc_key, bytes_sent)
+                active_flows.add(proc_key)
+                flow_keys = flow_keys + [proc_key]
+            upload_rate = max((throughput.rate(k) for k in flow_keys), default=0.0)
+            bulk_upload = any(throughput.is_sustained(k) for k in flow_keys)
+            
+            # Check if process is accessing sensitive files
+            open_files = []
+            live_processes.add((pid, create_time))
+            try:
+                open_files = _open_files_cache.get(proc, create_time)
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                pass
+            
+            # Check if accessing sensitive directories
+            accessing_sensitive = path_index.match_any(open_files) is not None
+            
+            suspicious_processes.append({
+                'pid': pid,
+                'name': proc_name,
+                'exe': proc_exe,
+                'create_time': create_time,
+                'remote_ip': remote_ip,
+                'remote_port': remote_port,
+                'connections': external_endpoints.get(pid, []),
+                'open_files': open_files[:5],  # Limit to 5 files
+                'accessing_sensitive': accessing_sensitive,
+                'blocklist_hit': blocklist_hit,
+                'upload_rate': upload_rate,
+                'bulk_upload': bulk_upload
+            })
                         
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             continue
+    timer.mark('processes')
+    
+    # Drop history for connections and processes that have gone away
+    throughput.expire(active_flows)
+    _open_files_cache.expire(live_processes)
+    get_exe_allowlist().cache.save()  # No-op unless a new executable was hashed
+    timer.mark('cleanup')
     
     return suspicious_processes
 
@@ -117,7 +489,9 @@ def alert_user(process_info):
     print(f"Process Name: {process_info['name']}")
     print(f"PID: {process_info['pid']}")
     print(f"Executable: {process_info['exe']}")
-    print(f"Connected to: {process_info['remote_ip']}:{process_info['remote_port']}")
+    print(f"Connected to: {describe_remote(process_info)}")
+    if process_info['upload_rate']:
+        print(f"Upload Rate: {format_rate(process_info['upload_rate'])}")
     
     if process_info['open_files']:
         print(f"Open Files: ")
@@ -127,59 +501,143 @@ def alert_user(process_info):
     if process_info['accessing_sensitive']:
         print("🔴 WARNING: This process is accessing sensitive directories!")
     
+    if process_info['bulk_upload']:
+        print(f"🔴 WARNING: Sustained upload above {format_rate(UPLOAD_ALERT_RATE)} "
+              f"for {UPLOAD_SUSTAIN_SECONDS}s+ - possible data exfiltration!")
+    
     print("=" * 60)
 
-def terminate_process(pid, process_name):
-    """Terminate a suspicious process after user confirmation."""
-    try:
-        response = input(f"\nDo you want to terminate '{process_name}' (PID: {pid})? (y/n): ").strip().lower()
-        if response == 'y':
-            proc = psutil.Process(pid)
-            proc.terminate()
-            proc.wait(timeout=5)
-            print(f"✅ Process '{process_name}' (PID: {pid}) has been terminated.")
-            return True
-        else:
-            print(f"Process '{process_name}' was NOT terminated.")
-            return False
-    except psutil.NoSuchProcess:
-        print(f"Process already terminated.")
-        return True
-    except psutil.AccessDenied:
-        print(f"❌ Access denied. Try running as Administrator.")
+def alert_blocklist_hit(process_info):
+    """Raise a high-severity alert for a connection to a known-bad IP."""
+    print("\n" + "🚨" * 30)
+    print("🚨  HIGH SEVERITY: CONNECTION TO KNOWN MALICIOUS IP!")
+    print("🚨" * 30)
+    print(f"Threat List: {process_info['blocklist_hit']}")
+    print(f"Process Name: {process_info['name']}")
+    print(f"PID: {process_info['pid']}")
+    print(f"Executable: {process_info['exe']}")
+    print(f"Connected to: {describe_remote(process_info)}")
+    
+    if process_info['open_files']:
+        print(f"Open Files: ")
+        for f in process_info['open_files']:
+            print(f"  - {f}")
+    
+    if process_info['accessing_sensitive']:
+        print("🔴 WARNING: This process is accessing sensitive directories!")
+    
+    print("🚨" * 30)
+
+def render_alert(process_info):
+    """Show the right alert for a suspicious process."""
+    # Runs on the response engine's thread, so a short wait for reverse DNS is fine here
+    get_enricher().enrich(process_info, timeout=1.0)
+    if process_info['blocklist_hit']:
+        alert_blocklist_hit(process_info)
+    else:
+        alert_user(process_info)
+
+def get_alert_tracker():
+    """Load the alert tracker (and saved acknowledgements) on first use."""
+    global _alert_tracker
+    if _alert_tracker is None:
+        _alert_tracker = AlertTracker(SUPPRESSION_FILE)
+    return _alert_tracker
+
+def confirm_alert(process_info):
+    """Ask the user what to do about a suspicious process."""
+    pid, name = process_info['pid'], process_info['name']
+    create_time = process_info.get('create_time')
+    response = input(
+        f"\nDo you want to terminate '{name}' (PID: {pid})? "
+        f"(y/n, s = suspend, a = acknowledge for {ACKNOWLEDGE_HOURS}h, t = trust this program): "
+    ).strip().lower()
+    
+    if response == 'y':
+        return kill_process(pid, name, create_time)
+    if response == 's':
+        return suspend_process(pid, name, create_time)
+    if response == 'a':
+        get_alert_tracker().suppress(process_info, ACKNOWLEDGE_HOURS)
+        print(f"🔕 '{name}' acknowledged - no alerts for {ACKNOWLEDGE_HOURS} hours.")
         return False
-    except Exception as e:
-        print(f"❌ Error terminating process: {e}")
+    if response == 't':
+        if not process_info.get('exe'):
+            print(f"❌ Can't trust '{name}': its executable path couldn't be read.")
+            return False
+        try:
+            rule = get_exe_allowlist().trust(process_info['exe'], name)
+            print(f"✅ Trusted '{name}' ({rule['sha256'][:12]}...) - it won't be flagged unless it changes.")
+        except OSError as e:
+            print(f"❌ Could not trust '{name}': {e}")
         return False
+    print(f"Process '{name}' was NOT terminated.")
+    return False
+
+def get_response_engine():
+    """Start the response engine on first use."""
+    global _response_engine
+    if _response_engine is None:
+        _response_engine = ResponseEngine(
+            RESPONSE_POLICY, render=render_alert, confirm=confirm_alert, report=report_to_collector
+        ).start()
+    return _response_engine
 
 def scan_once():
-    """Perform a single scan for suspicious processes."""
+    """Perform a single scan for suspicious processes. Alerts are handed to the
+    response engine, so this never waits on the user or on hashing for the collector."""
     print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scanning for suspicious processes...")
     
     suspicious = get_process_connections()
     
     if not suspicious:
+        get_alert_tracker().filter([])  # Forget flows that have closed
         print("✅ No suspicious processes detected.")
         return
     
-    for proc_info in suspicious:
-        alert_user(proc_info)
-        terminate_process(proc_info['pid'], proc_info['name'])
+    # Only alert on new connections or ones whose state changed since the last scan
+    new_alerts = get_alert_tracker().filter(suspicious)
+    if not new_alerts:
+        print(f"ℹ️ {len(suspicious)} previously reported process(es) still active - no new alerts.")
+        return
+    
+    # Start reverse DNS now so the answers are usually ready by the time alerts render
+    get_enricher().prefetch(p['remote_ip'] for p in new_alerts)
+    
+    engine = get_response_engine()
+    for proc_info in new_alerts:
+        engine.submit(proc_info)
+
+def report_scan_cost(report):
+    """Print what the last full scan cost and when the next one is due at the latest."""
+    print(f"⏱️ Scan ({report.reason}): {report.wall_time * 1000:.0f} ms wall, "
+          f"{report.cpu_time * 1000:.0f} ms CPU; {report.samples} sample(s) used "
+          f"{report.sample_cpu * 1000:.0f} ms CPU. Next full scan within {report.next_interval:.0f}s.")
 
 def continuous_monitor(interval=30):
-    """Continuously monitor for suspicious processes."""
+    """Continuously monitor for suspicious processes. `interval` is the longest gap between
+    full scans; they run sooner whenever the connection table changes."""
     print("=" * 60)
     print("🔒 SECURITY MONITOR STARTED")
-    print(f"   Scanning every {interval} seconds...")
+    print(f"   Checking connections every {SAMPLE_INTERVAL:g}s, full scan on change "
+          f"or at least every {interval} seconds...")
     print("   Press Ctrl+C to stop")
     print("=" * 60)
     
+    scheduler = AdaptiveScheduler(
+        sample=connection_fingerprint, scan=scan_once,
+        min_interval=min(MIN_SCAN_INTERVAL, interval), max_interval=interval,
+        sample_interval=SAMPLE_INTERVAL, cpu_budget=SCAN_CPU_BUDGET
+    )
     try:
-        while True:
-            scan_once()
-            time.sleep(interval)
+        scheduler.run(on_report=report_scan_cost)
     except KeyboardInterrupt:
         print("\n\n🛑 Security monitor stopped by user.")
+    finally:
+        if _response_engine is not None:
+            _response_engine.stop()
+        if _collector_agent is not None:
+            _collector_agent.stop()
 
 if __name__ == "__main__":
     print("\n" + "=" * 60)
@@ -194,8 +652,13 @@ if __name__ == "__main__":
     
     if choice == '1':
         scan_once()
+        if _response_engine is not None:
+            _response_engine.wait_idle()  # Let any open prompts finish before exiting
+            _response_engine.stop()
+        if _collector_agent is not None:
+            _collector_agent.stop()
     elif choice == '2':
-        interval = input("Enter scan interval in seconds (default 30): ").strip()
+        interval = input("Enter the longest gap between full scans in seconds (default 30): ").strip()
         interval = int(interval) if interval.isdigit() else 30
         continuous_monitor(interval)
     else:
@@ -1,9 +1,213 @@
 # Author: Jack Lidster
 # Date: 2025-12-07
 # Description: A simple subnet calculator GUI application using tkinter.
+# The subnet list is virtual: only the rows on screen exist, so splitting a /8 into
+# /30s (4 million subnets) or an IPv6 /32 into /64s is as quick as a /24 into /25s.
+# Exporting every subnet to a file runs on a worker thread with progress and a Cancel button.
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import tkinter.font as tkfont
 import ipaddress
+import os
+import queue
+import socket
+import threading
+import time
+
+class VirtualList(ttk.Frame):
+    """
+    A scrolling list of `count` rows that only builds the rows on screen. Each row's text
+    comes from row_text(index) when it scrolls into view, so count can be in the billions.
+    Positions are kept as Python ints, so even rows past what a float can index are reachable
+    with the arrow keys and wheel; dragging the scrollbar is as fine-grained as a float allows.
+    """
+    
+    def __init__(self, parent, row_text=str, on_select=None, **listbox_options):
+        super().__init__(parent)
+        self.row_text = row_text
+        self.on_select = on_select
+        self.count = 0
+        self.top = 0
+        self.rows = 1
+        self.selected = None
+        
+        self.scrollbar = ttk.Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side="right", fill="y")
+        self.listbox = tk.Listbox(self, exportselection=False, activestyle="none", **listbox_options)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        
+        font = tkfont.Font(font=self.listbox.cget("font"))
+        self.line_height = font.metrics("linespace") + 2 * int(self.listbox.cget("selectborderwidth"))
+        self.padding = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+        
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self._on_click)
+        self.listbox.bind("<MouseWheel>", self._on_wheel)
+        self.listbox.bind("<Button-4>", lambda event: self._scroll_by(-3))
+        self.listbox.bind("<Button-5>", lambda event: self._scroll_by(3))
+        for key, move in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                          ("<Home>", "home"), ("<End>", "end")):
+            self.listbox.bind(key, lambda event, move=move: self._move_selection(move))
+    
+    def set_count(self, count):
+        """Show `count` rows from the top, with nothing selected."""
+        self.count = count
+        self.top = 0
+        self.selected = None
+        self._render()
+    
+    def refresh(self):
+        """Rebuild the visible rows (e.g. after row_text's data changed)."""
+        self._render()
+    
+    def yview(self, *args):
+        """The scrollbar's command: ('moveto', fraction) or ('scroll', n, 'units' or 'pages')."""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.count)
+        elif args[0] == "scroll":
+            self.top += int(args[1]) * (self.rows if args[2] == "pages" else 1)
+        self._render()
+    
+    def _scroll_by(self, rows):
+        self.top += rows
+        self._render()
+        return "break"
+    
+    def _on_wheel(self, event):
+        steps = -event.delta // 120 if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1)
+        return self._scroll_by(steps * 3)
+    
+    def _on_resize(self, event):
+        rows = max(1, (event.height - self.padding) // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self._render()
+    
+    def _on_click(self, event=None):
+        selection = self.listbox.curselection()
+        if selection:
+            self._select(self.top + selection[0])
+    
+    def _move_selection(self, move):
+        if not self.count:
+            return "break"
+        current = self.selected if self.selected is not None else self.top
+        if move == "home":
+            target = 0
+        elif move == "end":
+            target = self.count - 1
+        elif move in ("page", "-page"):
+            target = current + (self.rows if move == "page" else -self.rows)
+        else:
+            target = current + move
+        target = max(0, min(self.count - 1, target))
+        # Scroll just enough to bring the new selection on screen
+        if target < self.top:
+            self.top = target
+        elif target >= self.top + self.rows:
+            self.top = target - self.rows + 1
+        self._select(target)
+        return "break"
+    
+    def _select(self, index):
+        self.selected = index
+        self._render()
+        if self.on_select:
+            self.on_select(index)
+    
+    def _render(self):
+        self.top = max(0, min(self.top, self.count - self.rows))
+        end = min(self.count, self.top + self.rows)
+        self.listbox.delete(0, tk.END)
+        if end > self.top:
+            self.listbox.insert(0, *(self.row_text(i) for i in range(self.top, end)))
+        if self.selected is not None and self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        if self.count:
+            self.scrollbar.set(self.top / self.count, end / self.count)
+        else:
+            self.scrollbar.set(0, 1)
+
+def subnet_at(network, new_prefix, index):
+    """The index-th /new_prefix subnet of network, by integer arithmetic."""
+    size = 1 << (network.max_prefixlen - new_prefix)
+    return type(network)((int(network.network_address) + index * size, new_prefix))
+
+def host_range(size):
+    """
+    (first, last, count) of the usable hosts in a subnet of `size` addresses, as offsets from
+    its network address. A /31 (or IPv6 /127) uses both addresses (RFC 3021 / RFC 6164), and
+    a /32 (/128) is its one host.
+    """
+    if size <= 2:
+        return 0, size - 1, size
+    return 1, size - 2, size - 2
+
+class SubnetExport:
+    """
+    Writes every /new_prefix subnet of network to a CSV file on a worker thread. Progress
+    goes onto `messages` as ('progress', done, total) after each batch, then one final
+    ('done', total), ('cancelled', done) or ('error', message). cancel() stops it after the
+    current batch and removes the partial file.
+    """
+    
+    BATCH = 65536
+    
+    def __init__(self, network, new_prefix, path):
+        self.network = network
+        self.new_prefix = new_prefix
+        self.path = path
+        self.total = 1 << (new_prefix - network.prefixlen)
+        self.messages = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True, name="subnet-export")
+    
+    def start(self):
+        self.thread.start()
+        return self
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def run(self):
+        if self.network.version == 4:
+            address = lambda value: socket.inet_ntoa(value.to_bytes(4, "big"))  # ~10x faster than IPv4Address
+        else:
+            address = ipaddress.IPv6Address
+        size = 1 << (self.network.max_prefixlen - self.new_prefix)
+        netmask = type(self.network)((0, self.new_prefix)).netmask
+        first_host, last_host, usable = host_range(size)
+        base = int(self.network.network_address)
+        done = 0
+        written = False  # Only a file this export created or truncated is ours to remove
+        try:
+            with open(self.path, "w", encoding="utf-8", newline="") as f:
+                written = True
+                f.write("Network,Subnet Mask,First Host,Last Host,Broadcast Address,Usable Hosts\n")
+                while done < self.total:
+                    if self.cancelled.is_set():
+                        break
+                    end = min(self.total, done + self.BATCH)
+                    lines = []
+                    for start in range(base + done * size, base + end * size, size):
+                        lines.append(f"{address(start)}/{self.new_prefix},{netmask},{address(start + first_host)},"
+                                     f"{address(start + last_host)},{address(start + size - 1)},{usable}\n")
+                    f.write("".join(lines))
+                    done = end
+                    self.messages.put(("progress", done, self.total))
+            if self.cancelled.is_set() and done < self.total:
+                os.remove(self.path)
+                self.messages.put(("cancelled", done))
+            else:
+                self.messages.put(("done", self.total))
+        except Exception as e:
+            # Anything at all must end in a message, or the window keeps polling for one
+            if written:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+            self.messages.put(("error", str(e) or type(e).__name__))
 
 class SubnetCalculator:
     def __init__(self, root):
@@ -11,6 +215,9 @@ class SubnetCalculator:
         self.root.title("Subnet Calculator")
         self.root.geometry("900x700")
         self.current_network = None
+        self.new_prefix = None
+        self.export = None
+        self.export_started = 0.0
         
         # Input Frame
         input_frame = ttk.LabelFrame(root, text="Input", padding="10")
@@ -27,18 +234,16 @@ class SubnetCalculator:
         self.prefix_entry.insert(0, "25")
         
         ttk.Button(input_frame, text="Calculate", command=self.calculate_subnets).pack(side="left", padx=5)
+        self.export_button = ttk.Button(input_frame, text="Export...", command=self.export_subnets)
+        self.export_button.pack(side="left", padx=5)
         
         # Networks Frame
-        networks_label = ttk.LabelFrame(root, text="Subnets", padding="10")
-        networks_label.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
-        
-        scrollbar = ttk.Scrollbar(networks_label)
-        scrollbar.pack(side="right", fill="y")
+        self.networks_label = ttk.LabelFrame(root, text="Subnets", padding="10")
+        self.networks_label.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
         
-        self.networks_listbox = tk.Listbox(networks_label, yscrollcommand=scrollbar.set, height=20, width=40)
-        self.networks_listbox.pack(side="left", fill="both", expand=True)
-        self.networks_listbox.bind('<<ListboxSelect>>', self.on_network_select)
-        scrollbar.config(command=self.networks_listbox.yview)
+        self.networks_list = VirtualList(self.networks_label, row_text=self.subnet_text,
+                                         on_select=self.on_network_select, height=20, width=40)
+        self.networks_list.pack(fill="both", expand=True)
         
         # Details Frame
         details_label = ttk.LabelFrame(root, text="Network Details", padding="10")
@@ -47,31 +252,118 @@ class SubnetCalculator:
         self.details_text = tk.Text(details_label, width=40, height=20, font=("Courier", 10))
         self.details_text.pack(fill="both", expand=True)
         
+        # Export progress
+        progress_frame = ttk.Frame(root, padding="10 0 10 10")
+        progress_frame.grid(row=2, column=0, columnspan=2, sticky="ew")
+        self.progress = ttk.Progressbar(progress_frame, maximum=1000)
+        self.progress.pack(side="left", fill="x", expand=True, padx=5)
+        self.status_label = ttk.Label(progress_frame, text="", width=48)
+        self.status_label.pack(side="left", padx=5)
+        self.cancel_button = ttk.Button(progress_frame, text="Cancel", command=self.cancel_export, state="disabled")
+        self.cancel_button.pack(side="left", padx=5)
+        
         root.grid_rowconfigure(1, weight=1)
         root.grid_columnconfigure(0, weight=1)
         root.grid_columnconfigure(1, weight=1)
+        root.protocol("WM_DELETE_WINDOW", self.on_close)
     
     def calculate_subnets(self):
         try:
             network = ipaddress.ip_network(self.cidr_entry.get(), strict=False)
             new_prefix = int(self.prefix_entry.get())
-            
-            self.networks_listbox.delete(0, tk.END)
-            self.details_text.delete(1.0, tk.END)
-            self.current_network = network
-            
-            for subnet in network.subnets(new_prefix=new_prefix):
-                self.networks_listbox.insert(tk.END, str(subnet))
+            next(network.subnets(new_prefix=new_prefix))  # Same checks (and messages) as listing them
         except ValueError as e:
             messagebox.showerror("Error", f"Invalid input: {e}")
+            return
+        
+        self.details_text.delete(1.0, tk.END)
+        self.current_network = network
+        self.new_prefix = new_prefix
+        
+        # No subnets are made here: the list asks for each one as it scrolls into view
+        count = 1 << (new_prefix - network.prefixlen)
+        self.networks_label.config(text=f"Subnets ({count:,})")
+        self.networks_list.set_count(count)
     
-    def on_network_select(self, event=None):
-        selection = self.networks_listbox.curselection()
-        if not selection:
+    def export_subnets(self):
+        if self.current_network is None:
+            self.calculate_subnets()
+            if self.current_network is None:
+                return
+        network, new_prefix = self.current_network, self.new_prefix
+        count = 1 << (new_prefix - network.prefixlen)
+        if count > 1_000_000:
+            row_bytes = 90 if network.version == 4 else 200
+            if not messagebox.askyesno("Large export", f"This writes {count:,} subnets "
+                                       f"(about {count * row_bytes / 1e9:,.1f} GB). Continue?"):
+                return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", initialfile=f"subnets_{new_prefix}.csv",
+                                            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
             return
         
-        subnet_str = self.networks_listbox.get(selection[0])
-        subnet = ipaddress.ip_network(subnet_str, strict=False)
+        self.export = SubnetExport(network, new_prefix, path).start()
+        self.export_started = time.monotonic()
+        self.export_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.progress.config(value=0)
+        self.status_label.config(text=f"Exporting {count:,} subnets...")
+        self.root.after(16, self.poll_export)
+    
+    def poll_export(self):
+        """Apply whatever the export has reported since the last poll (~60 times a second)."""
+        export = self.export
+        if export is None:
+            return
+        latest = None
+        try:
+            while True:
+                latest = export.messages.get_nowait()
+                if latest[0] != "progress":
+                    break
+        except queue.Empty:
+            pass
+        
+        if latest is None or latest[0] == "progress":
+            if latest:
+                _, done, total = latest
+                rate = done / max(time.monotonic() - self.export_started, 1e-6)
+                self.progress.config(value=1000 * done / total)
+                self.status_label.config(text=f"{done:,} of {total:,} subnets ({done / total:.0%}, {rate:,.0f}/s)")
+            self.root.after(16, self.poll_export)
+            return
+        
+        kind, detail = latest
+        if kind == "done":
+            self.progress.config(value=1000)
+            self.status_label.config(text=f"Exported {detail:,} subnets to {os.path.basename(export.path)}")
+        elif kind == "cancelled":
+            self.progress.config(value=0)
+            self.status_label.config(text=f"Export cancelled after {detail:,} subnets")
+        else:
+            self.status_label.config(text="Export failed")
+            messagebox.showerror("Error", f"Could not export: {detail}")
+        self.export = None
+        self.export_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+    
+    def cancel_export(self):
+        if self.export is not None:
+            self.export.cancel()
+            self.cancel_button.config(state="disabled")
+            self.status_label.config(text="Cancelling...")
+    
+    def on_close(self):
+        if self.export is not None:
+            self.export.cancel()
+            self.export.thread.join(timeout=2)  # Let it remove its partial file
+        self.root.destroy()
+    
+    def subnet_text(self, index):
+        return str(subnet_at(self.current_network, self.new_prefix, index))
+    
+    def on_network_select(self, index):
+        subnet = subnet_at(self.current_network, self.new_prefix, index)
         
         self.details_text.delete(1.0, tk.END)
         
@@ -79,9 +371,10 @@ class SubnetCalculator:
         info += f"Subnet Mask: {subnet.netmask}\n"
         info += f"Network Address: {subnet.network_address}\n"
         info += f"Broadcast Address: {subnet.broadcast_address}\n"
-        info += f"Usable Hosts: {max(0, subnet.num_addresses - 2)}\n"
-        info += f"First Host: {subnet.network_address + 1}\n"
-        info += f"Last Host: {subnet.broadcast_address - 1}\n"
+        first_host, last_host, usable = host_range(subnet.num_addresses)
+        info += f"Usable Hosts: {usable}\n"
+        info += f"First Host: {subnet.network_address + first_host}\n"
+        info += f"Last Host: {subnet.network_address + last_host}\n"
         
         self.details_text.insert(1.0, info)
 
@@ -0,0 +1,178 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: Rolling upload-rate tracking for security_scanner. Keeps a small fixed-size
+# ring buffer of (time, bytes sent) samples per process and per connection, spaced out in
+# time so it covers the sustain window however often the scanner runs, and flags flows that
+# keep uploading above a threshold (possible bulk exfiltration).
+
+import time
+from array import array
+from collections import OrderedDict
+
+
+def format_rate(bytes_per_sec):
+    """Format a byte rate like '1.5 MB/s'."""
+    for unit in ('B/s', 'KB/s', 'MB/s', 'GB/s'):
+        if bytes_per_sec < 1024 or unit == 'GB/s':
+            return f"{bytes_per_sec:.1f} {unit}"
+        bytes_per_sec /= 1024
+
+
+class FlowRing:
+    """Fixed-size ring buffer of (timestamp, cumulative bytes) samples for one flow."""
+
+    __slots__ = ('times', 'totals', 'next', 'count')
+
+    def __init__(self, size):
+        self.times = array('d', bytes(8 * size))
+        self.totals = array('d', bytes(8 * size))
+        self.next = 0
+        self.count = 0
+
+    def add(self, timestamp, total, spacing=0.0):
+        """
+        Append a sample. While the newest sample is still less than `spacing` seconds after
+        the one before it, it is replaced instead, so a fast scan rate can't squeeze the ring
+        into a few seconds of history.
+        """
+        size = len(self.times)
+
+        # Counters only go up; a drop means the counter was reset (new socket / PID reuse)
+        if self.count and total < self.totals[(self.next - 1) % size]:
+            self.count = 0
+
+        if self.count >= 2 and self.times[(self.next - 1) % size] - self.times[(self.next - 2) % size] < spacing:
+            self.next = (self.next - 1) % size
+            self.count -= 1
+
+        self.times[self.next] = timestamp
+        self.totals[self.next] = total
+        self.next = (self.next + 1) % size
+        self.count = min(self.count + 1, size)
+
+    def span(self):
+        """Return (seconds, bytes) between the oldest and newest samples."""
+        if self.count < 2:
+            return 0.0, 0.0
+        size = len(self.times)
+        newest = (self.next - 1) % size
+        oldest = (self.next - self.count) % size
+        return (self.times[newest] - self.times[oldest],
+                self.totals[newest] - self.totals[oldest])
+
+    def latest_rate(self):
+        """Rate between the last two samples."""
+        if self.count < 2:
+            return 0.0
+        size = len(self.times)
+        newest = (self.next - 1) % size
+        previous = (self.next - 2) % size
+        seconds = self.times[newest] - self.times[previous]
+        return (self.totals[newest] - self.totals[previous]) / seconds if seconds > 0 else 0.0
+
+    def min_rate(self):
+        """Slowest rate between any two consecutive samples (how 'sustained' the upload is)."""
+        if self.count < 2:
+            return 0.0
+        size = len(self.times)
+        rates = []
+        for i in range(self.count - 1):
+            older = (self.next - self.count + i) % size
+            newer = (older + 1) % size
+            seconds = self.times[newer] - self.times[older]
+            if seconds > 0:
+                rates.append((self.totals[newer] - self.totals[older]) / seconds)
+        return min(rates) if rates else 0.0
+
+
+class ThroughputTracker:
+    """
+    Tracks upload rates for many flows with bounded memory.
+
+    Each flow is a FlowRing of `samples` entries (two arrays of doubles), and at most
+    `max_flows` flows are kept - the least recently updated ones are dropped first.
+    A flow counts as a sustained upload when it has covered at least `sustain_seconds`
+    and never dropped below `threshold` bytes/sec between samples in that time.
+
+    Samples are kept at least `spacing` seconds apart. The newest slot is always the one
+    being refreshed, so the other samples - 2 gaps have to cover the sustain window on
+    their own once the ring is full.
+    """
+
+    def __init__(self, threshold=1024 * 1024, sustain_seconds=60, samples=8, max_flows=10000):
+        if samples < 3:
+            raise ValueError("samples must be at least 3")
+        self.threshold = threshold
+        self.sustain_seconds = sustain_seconds
+        self.samples = samples
+        self.spacing = sustain_seconds / (samples - 2)
+        self.max_flows = max_flows
+        self.flows = OrderedDict()
+
+    def update(self, key, total_bytes, timestamp=None):
+        """Record the cumulative bytes sent by a flow and return its latest rate."""
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        ring = self.flows.get(key)
+        if ring is None:
+            ring = self.flows[key] = FlowRing(self.samples)
+            while len(self.flows) > self.max_flows:
+                self.flows.popitem(last=False)
+        else:
+            self.flows.move_to_end(key)
+
+        ring.add(timestamp, total_bytes, self.spacing)
+        return ring.latest_rate()
+
+    def rate(self, key):
+        """Average upload rate over the whole ring for a flow (0 if unknown)."""
+        ring = self.flows.get(key)
+        if ring is None:
+            return 0.0
+        seconds, sent = ring.span()
+        return sent / seconds if seconds > 0 else 0.0
+
+    def is_sustained(self, key):
+        """Check if a flow has been uploading above the threshold for sustain_seconds."""
+        ring = self.flows.get(key)
+        if ring is None:
+            return False
+        seconds, _ = ring.span()
+        return seconds >= self.sustain_seconds and ring.min_rate() >= self.threshold
+
+    def expire(self, active_keys):
+        """Forget flows that weren't seen in the latest scan."""
+        for key in [k for k in self.flows if k not in active_keys]:
+            del self.flows[key]
+
+    def __len__(self):
+        return len(self.flows)
+
+
+if __name__ == "__main__":
+    # A steady 2 MB/s upload for 90 seconds should be flagged by the 60 second mark
+    # whatever the scan interval, and an upload that stalls partway should not be.
+    print("\n📈 Sustained upload check (2 MB/s, 60 s window)")
+    for interval in (0.5, 2.0, 5.0, 10.0, 30.0):
+        tracker = ThroughputTracker()
+        flagged_at = None
+        for step in range(int(90 / interval) + 1):
+            now = step * interval
+            tracker.update('upload', now * 2 * 1024 * 1024, timestamp=now)
+            if flagged_at is None and tracker.is_sustained('upload'):
+                flagged_at = now
+        ok = flagged_at is not None and flagged_at <= 60 + interval
+        when = f"flagged at {flagged_at:.0f}s" if flagged_at is not None else "never flagged"
+        print(f"  {'✅' if ok else '❌'} every {interval:>4.1f}s: {when}")
+
+    tracker = ThroughputTracker()
+    sent = 0
+    for step in range(46):
+        now = step * 2.0
+        if not 40 <= now < 50:
+            sent += 4 * 1024 * 1024  # 2 MB/s apart from a 10 second stall
+        tracker.update('stalled', sent, timestamp=now)
+    stalled = tracker.is_sustained('stalled')
+    print(f"  {'✅' if not stalled else '❌'} upload that stalled for 10s: "
+          f"{'flagged' if stalled else 'not flagged'}")
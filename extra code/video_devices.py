@@ -0,0 +1,334 @@
+# Author: Jack Lidster
+# Date: 2026-10-19
+# Description: "Is the camera in use, and by whom?" for Linux. Lists the V4L2 device nodes
+# (/dev/video*, subdevices, ...) from sysfs and finds which processes hold them open by
+# walking /proc/*/fd. The walk is skipped while every camera is runtime-suspended (a
+# streaming USB camera is always powered up), so an idle camera costs a couple of sysfs
+# reads. What's known about each process (name, exe, start time, or that it's a kernel
+# thread / unreadable) is cached by PID and only read again when the PID is reused.
+
+import os
+import time
+from collections import namedtuple
+from datetime import datetime
+
+# One V4L2 device node
+VideoDevice = namedtuple('VideoDevice', [
+    'path',     # '/dev/video0'
+    'name',     # Driver-reported name, e.g. 'Integrated Camera: Integrated C'
+    'index',    # 0 for a camera's main capture node, 1+ for its metadata nodes
+    'aliases',  # /dev/v4l/by-id and by-path links pointing at it
+    'power',    # sysfs power/ folder of the hardware behind it, or None
+])
+
+# A process holding at least one video device open
+VideoHolder = namedtuple('VideoHolder', [
+    'pid', 'name', 'exe', 'cmdline',
+    'start_time',  # Process start (local datetime)
+    'devices',     # Device paths it has open
+    'first_seen',  # When a scan first saw it holding a device (local datetime)
+])
+
+V4L_CLASS = '/sys/class/video4linux'
+PF_KTHREAD = 0x00200000
+
+
+def _read_text(path):
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def list_video_devices(dev_root='/dev', sys_root=V4L_CLASS):
+    """Every V4L2 node sysfs knows about, plus any /dev/video* it doesn't, sorted by path."""
+    devices = {}
+    try:
+        entries = os.listdir(sys_root)
+    except OSError:
+        entries = []
+    for entry in entries:
+        index = _read_text(os.path.join(sys_root, entry, 'index'))
+        devices[os.path.join(dev_root, entry)] = {
+            'name': _read_text(os.path.join(sys_root, entry, 'name')) or entry,
+            'index': int(index) if index and index.isdigit() else None,
+            'aliases': [],
+            'power': _power_folder(os.path.join(sys_root, entry, 'device')),
+        }
+    try:
+        for entry in os.listdir(dev_root):
+            if entry.startswith('video') and os.path.join(dev_root, entry) not in devices:
+                devices[os.path.join(dev_root, entry)] = {'name': entry, 'index': None, 'aliases': [], 'power': None}
+    except OSError:
+        pass
+
+    for folder in ('by-id', 'by-path'):
+        links = os.path.join(dev_root, 'v4l', folder)
+        try:
+            names = os.listdir(links)
+        except OSError:
+            continue
+        for name in names:
+            link = os.path.join(links, name)
+            target = os.path.normpath(os.path.join(links, os.readlink(link))) if os.path.islink(link) else None
+            if target in devices:
+                devices[target]['aliases'].append(link)
+
+    return [VideoDevice(path, info['name'], info['index'], sorted(info['aliases']), info['power'])
+            for path, info in sorted(devices.items())]
+
+
+def _power_folder(device_link):
+    """
+    The power/ folder that shows whether a camera is powered up. For a USB camera the
+    video node hangs off an interface, and it's the USB device above it that suspends.
+    """
+    if not os.path.exists(device_link):
+        return None
+    here = os.path.realpath(device_link)
+    for folder in (here, os.path.dirname(here)):
+        if os.path.isfile(os.path.join(folder, 'power', 'runtime_status')):
+            return os.path.join(folder, 'power')
+    return None
+
+
+def may_be_in_use(device):
+    """
+    False only when the device is runtime-suspended, which means nothing is streaming from
+    it. True when it's powered up or when that can't be told (no runtime PM, or autosuspend
+    turned off with power/control = 'on').
+    """
+    if device.power is None or _read_text(os.path.join(device.power, 'control')) != 'auto':
+        return True
+    return _read_text(os.path.join(device.power, 'runtime_status')) != 'suspended'
+
+
+class _ProcInfo:
+    __slots__ = ('inode', 'start_ticks', 'name', 'exe', 'cmdline', 'skip')
+
+
+class HolderScanner:
+    """
+    Finds which processes hold video devices open, in one pass over /proc.
+
+    Each pass lists /proc, and for each process lists its fd folder and reads the links.
+    What doesn't change for a process's lifetime is cached by PID: its name, exe and
+    command line, and whether it's a kernel thread or one we aren't allowed to inspect
+    (both skipped outright). A reused PID is spotted from /proc/<pid>'s inode number, which
+    the listing returns for free, confirmed by the start time in /proc/<pid>/stat.
+    """
+
+    def __init__(self, proc_root='/proc'):
+        self.proc_root = proc_root
+        self.cache = {}       # pid -> _ProcInfo
+        self.first_seen = {}  # (pid, start_ticks) -> datetime it was first seen holding a device
+        self.stats = {}
+        self.clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.boot_time = self._boot_time()
+
+    def _boot_time(self):
+        try:
+            with open(os.path.join(self.proc_root, 'stat'), 'r') as f:
+                for line in f:
+                    if line.startswith('btime '):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return 0
+
+    def _read_stat(self, pid):
+        """(name, flags, start_ticks) from /proc/<pid>/stat."""
+        with open(f'{self.proc_root}/{pid}/stat', 'rb') as f:
+            data = f.read()
+        close = data.rindex(b')')
+        fields = data[close + 2:].split()
+        return data[data.index(b'(') + 1:close].decode(errors='replace'), int(fields[6]), int(fields[19])
+
+    def _info(self, pid, inode):
+        """The cached info for a PID, (re)read when the PID is new or reused."""
+        info = self.cache.get(pid)
+        if info is not None and info.inode == inode:
+            self.stats['cached'] += 1
+            return info
+        name, flags, start_ticks = self._read_stat(pid)
+        if info is not None and info.start_ticks == start_ticks:
+            info.inode = inode  # Same process; the kernel just handed out a new inode
+            self.stats['cached'] += 1
+            return info
+        info = _ProcInfo()
+        info.inode, info.start_ticks, info.name = inode, start_ticks, name
+        info.skip = bool(flags & PF_KTHREAD)
+        info.exe = info.cmdline = None
+        self.cache[pid] = info
+        self.stats['read'] += 1
+        return info
+
+    def _details(self, pid, info):
+        """exe and command line, read the first time a process is seen holding a device."""
+        if info.exe is None:
+            try:
+                info.exe = os.readlink(f'{self.proc_root}/{pid}/exe')
+            except OSError:
+                info.exe = ''
+            raw = _read_text(f'{self.proc_root}/{pid}/cmdline') or ''
+            info.cmdline = raw.replace('\0', ' ').strip()
+        return info
+
+    def start_time(self, info):
+        return datetime.fromtimestamp(self.boot_time + info.start_ticks / self.clock_ticks)
+
+    def scan(self, devices, force=False):
+        """
+        Return a VideoHolder for every process with one of `devices` open. Devices that are
+        suspended are left out (see may_be_in_use) unless `force` is set.
+        """
+        start = time.perf_counter()
+        self.stats = {'processes': 0, 'cached': 0, 'read': 0, 'skipped': 0, 'fds': 0, 'walked': False}
+        wanted = {device.path for device in devices if force or may_be_in_use(device)}
+        holders = []
+        seen = set()
+        if not wanted:
+            self.first_seen.clear()
+            self.stats['scan_ms'] = (time.perf_counter() - start) * 1000
+            return holders
+        self.stats['walked'] = True
+
+        with os.scandir(self.proc_root) as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                pid = int(entry.name)
+                seen.add(pid)
+                self.stats['processes'] += 1
+                try:
+                    info = self._info(pid, entry.inode())
+                    if info.skip:
+                        self.stats['skipped'] += 1
+                        continue
+                    open_devices = self._open_devices(pid, wanted)
+                except PermissionError:
+                    info = self.cache.get(pid)
+                    if info is not None:
+                        info.skip = True  # Not ours to look at, and that won't change
+                    continue
+                except (OSError, ValueError, IndexError):
+                    continue  # Exited mid-scan
+                if open_devices:
+                    self._details(pid, info)
+                    key = (pid, info.start_ticks)
+                    first_seen = self.first_seen.setdefault(key, datetime.now())
+                    holders.append(VideoHolder(pid, info.name, info.exe, info.cmdline,
+                                               self.start_time(info), sorted(open_devices), first_seen))
+
+        for pid in [p for p in self.cache if p not in seen]:
+            del self.cache[pid]
+        held = {(h.pid, self.cache[h.pid].start_ticks) for h in holders}
+        for key in [k for k in self.first_seen if k not in held]:
+            del self.first_seen[key]
+        self.stats['scan_ms'] = (time.perf_counter() - start) * 1000
+        return holders
+
+    def _open_devices(self, pid, wanted):
+        """Which of `wanted` a process has open, reading its fd links relative to one open dir."""
+        dir_fd = os.open(f'{self.proc_root}/{pid}/fd', os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            found = set()
+            names = os.listdir(dir_fd)
+            self.stats['fds'] += len(names)
+            for name in names:
+                try:
+                    target = os.readlink(name, dir_fd=dir_fd)
+                except OSError:
+                    continue  # Closed since the listing
+                if target in wanted:
+                    found.add(target)
+            return found
+        finally:
+            os.close(dir_fd)
+
+
+_holder_scanner = None
+
+
+def get_holder_scanner():
+    """The process-wide scanner, so its PID cache carries over between checks."""
+    global _holder_scanner
+    if _holder_scanner is None:
+        _holder_scanner = HolderScanner()
+    return _holder_scanner
+
+
+def build_fixture(folder, processes=2000, fds_per_process=20, holders=(1234,)):
+    """
+    Lay out fake /proc, /dev and /sys/class/video4linux trees with one camera (video0 plus
+    its metadata node video1) on a USB camera held open by the `holders` PIDs (the camera is
+    powered up when there are any). Returns (proc, dev, sys) roots.
+    """
+    proc_root, dev_root, sys_root = (os.path.join(folder, name) for name in ('proc', 'dev', 'video4linux'))
+    for name, index in (('video0', 0), ('video1', 1)):
+        os.makedirs(os.path.join(sys_root, name), exist_ok=True)
+        with open(os.path.join(sys_root, name, 'name'), 'w') as f:
+            f.write('Integrated Camera: Integrated C\n')
+        with open(os.path.join(sys_root, name, 'index'), 'w') as f:
+            f.write(f'{index}\n')
+        os.makedirs(dev_root, exist_ok=True)
+        open(os.path.join(dev_root, name), 'w').close()
+    usb = os.path.join(folder, 'devices', 'usb1', '1-1')
+    os.makedirs(os.path.join(usb, 'power'))
+    os.makedirs(os.path.join(usb, '1-1:1.0'))
+    for name, value in (('control', 'auto'), ('runtime_status', 'active' if holders else 'suspended')):
+        with open(os.path.join(usb, 'power', name), 'w') as f:
+            f.write(value + '\n')
+    for name in ('video0', 'video1'):
+        os.symlink(os.path.join(usb, '1-1:1.0'), os.path.join(sys_root, name, 'device'))
+    by_id = os.path.join(dev_root, 'v4l', 'by-id')
+    os.makedirs(by_id, exist_ok=True)
+    os.symlink('../../video0', os.path.join(by_id, 'usb-Chicony_Integrated_Camera-video-index0'))
+
+    os.makedirs(proc_root, exist_ok=True)
+    with open(os.path.join(proc_root, 'stat'), 'w') as f:
+        f.write(f'cpu 0 0 0 0\nbtime {int(time.time()) - 86400}\n')
+    pids = list(range(100, 100 + processes)) + [pid for pid in holders if pid >= 100 + processes or pid < 100]
+    for pid in pids:
+        kernel = pid % 10 == 0 and pid not in holders
+        base = os.path.join(proc_root, str(pid))
+        os.makedirs(os.path.join(base, 'fd'), exist_ok=True)
+        name = 'zoom' if pid in holders else f'proc{pid}'
+        with open(os.path.join(base, 'stat'), 'w') as f:
+            f.write(f'{pid} ({name}) S 1 {pid} {pid} 0 -1 {PF_KTHREAD if kernel else 4194304} '
+                    f'0 0 0 0 0 0 0 0 20 0 1 0 {pid * 10} 0 0\n')
+        with open(os.path.join(base, 'cmdline'), 'w') as f:
+            f.write(f'/usr/bin/{name}\0--flag\0')
+        os.symlink(f'/usr/bin/{name}', os.path.join(base, 'exe'))
+        if kernel:
+            continue
+        for fd in range(fds_per_process):
+            target = f'socket:[{pid * 100 + fd}]' if fd % 2 else f'/usr/lib/lib{fd}.so'
+            if pid in holders and fd == fds_per_process - 1:
+                target = os.path.join(dev_root, 'video0')
+            os.symlink(target, os.path.join(base, 'fd', str(fd)))
+    return proc_root, dev_root, sys_root
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    devices = list_video_devices()
+    print(f"Video devices: {[(d.path, d.name) for d in devices] or 'none'}")
+    scanner = HolderScanner()
+    holders = scanner.scan(devices or [VideoDevice('/dev/video0', 'video0', 0, [], None)])
+    print(f"  Live scan: {scanner.stats['processes']} processes, {scanner.stats['fds']} fds in "
+          f"{scanner.stats['scan_ms']:.2f} ms; holders: {[(h.pid, h.name) for h in holders]}")
+
+    for label, holder_pids in (("Camera in use", (1234,)), ("Camera idle", ())):
+        with tempfile.TemporaryDirectory() as folder:
+            proc_root, dev_root, sys_root = build_fixture(folder, holders=holder_pids)
+            devices = list_video_devices(dev_root, sys_root)
+            scanner = HolderScanner(proc_root)
+            for tick in range(2):
+                holders = scanner.scan(devices)
+                print(f"  {label}, scan {tick + 1}: {scanner.stats['processes']} processes, "
+                      f"{scanner.stats['fds']} fds in {scanner.stats['scan_ms']:.2f} ms "
+                      f"({scanner.stats['read']} read, {scanner.stats['skipped']} skipped); "
+                      f"holders: {[(h.pid, h.name) for h in holders]}")